@@ -0,0 +1,107 @@
+import json
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from rest_framework import exceptions
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from bboom_test.authentication import CachedJWTAuthentication, user_cache
+from users.models import User
+
+
+# ----------------------------------------------------------------
+async def aauthenticate(request: HttpRequest) -> Optional[User]:
+    """
+    Function to authenticate request by JWT access token with async ORM, same rules and user cache as
+    CachedJWTAuthentication
+
+    Params:
+        - request: defines current request
+
+    Returns:
+        - user or None if request has no token
+
+    Raises:
+        - InvalidToken (in case of token is not valid or has no user id)
+        - AuthenticationFailed (in case of user not found or not active)
+    """
+    authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+    header: Optional[bytes] = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token: Optional[bytes] = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    validated_token: Any = authentication.get_validated_token(raw_token)
+    user: Optional[User] = await authentication.aget_cached_user(validated_token)
+    if user is not None:
+        return user
+
+    user_id: Any = validated_token[jwt_settings.USER_ID_CLAIM]
+    version: int = await sync_to_async(user_cache.get_version)(user_id)
+    user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None:
+        raise exceptions.AuthenticationFailed('User not found', code='user_not_found')
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed('User is inactive', code='user_inactive')
+    user_cache.set(user_id, user, version)
+    return user
+
+
+# ----------------------------------------------------------------
+def parse_json(request: HttpRequest) -> Any:
+    """
+    Function to parse JSON body of request
+
+    Params:
+        - request: defines current request
+
+    Returns:
+        - parsed data
+
+    Raises:
+        - ParseError (in case of malformed body)
+    """
+    try:
+        return json.loads(request.body or b'null')
+    except ValueError as exc:
+        raise exceptions.ParseError(f'JSON parse error - {exc}')
+
+
+# ----------------------------------------------------------------
+def async_api_view(methods: list[str]) -> Callable:
+    """
+    Decorator for native async API views (no thread per request under ASGI). Checks method,
+    authenticates request by JWT and renders DRF API exceptions the same way as DRF views do
+
+    Params:
+        - methods: list of allowed HTTP methods
+
+    Returns:
+        - view decorator
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args: tuple, **kwargs: dict) -> Any:
+            try:
+                if request.method not in methods:
+                    raise exceptions.MethodNotAllowed(request.method)
+                user: Optional[User] = await aauthenticate(request)
+                if user is None:
+                    raise exceptions.NotAuthenticated
+                request.user = user
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                data: Any = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+                response: JsonResponse = JsonResponse(data, status=exc.status_code, safe=False)
+                if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                    response['WWW-Authenticate'] = CachedJWTAuthentication().authenticate_header(request)
+                return response
+
+        # authentication is done by JWT header, not by session cookie
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
@@ -0,0 +1,213 @@
+import copy
+from typing import Any, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.functional import cached_property
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from bboom_test.cache import LocMemLRUBackend, VersionedCache
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# claim with username added to access tokens by users.serializers.UserTokenObtainPairSerializer
+USERNAME_CLAIM: str = 'username'
+
+
+# ----------------------------------------------------------------
+class UserCache:
+    """
+    Process local cache of authenticated users with bounded size (LRU), configured by JWT_USER_CACHE setting.
+    Every entry keeps version of user from versioned cache (VERSIONED_CACHE), which is bumped on every save
+    and delete of user (users.signals), and is used only while the version is current. With CACHE_URL versions are
+    kept in Redis, so change of user made by any process is seen by all processes on the next request. Without it
+    versions are process local and never query database, changes made by other processes are seen after TIMEOUT.
+    Copy of cached user is returned, so requests never share one instance
+
+    Attrs:
+        - versions: defines versions of users
+    """
+    def __init__(self) -> None:
+        self.versions: VersionedCache = VersionedCache(namespace='auth_user')
+
+    @cached_property
+    def backend(self) -> LocMemLRUBackend:
+        return LocMemLRUBackend(settings.JWT_USER_CACHE)
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return f'user:{user_id}'
+
+    def get_version(self, user_id: Any) -> int:
+        """
+        Method to get current version of user, must be read before user is loaded to be cached
+
+        Params:
+            - user_id: value of user id claim
+
+        Returns:
+            - version number
+        """
+        return self.versions.get_version(user_id)
+
+    def get(self, user_id: Any) -> Optional[User]:
+        """
+        Method to get cached user
+
+        Params:
+            - user_id: value of user id claim
+
+        Returns:
+            - copy of cached user or None if user is not cached or was changed after caching
+        """
+        entry: Optional[tuple[int, User]] = self.backend.get(self._key(user_id))
+        if entry is None:
+            return None
+        version, user = entry
+        if version != self.get_version(user_id):
+            return None
+        return copy.copy(user)
+
+    async def aget(self, user_id: Any) -> Optional[User]:
+        """
+        Method to get cached user from async code, versioned cache may do blocking IO
+
+        Params:
+            - user_id: value of user id claim
+
+        Returns:
+            - copy of cached user or None if user is not cached or was changed after caching
+        """
+        return await sync_to_async(self.get)(user_id)
+
+    def set(self, user_id: Any, user: User, version: int) -> None:
+        """
+        Method to cache user
+
+        Params:
+            - user_id: value of user id claim
+            - user: loaded user
+            - version: version of user read before user was loaded
+        """
+        self.backend.set(self._key(user_id), (version, copy.copy(user)), settings.JWT_USER_CACHE['TIMEOUT'])
+
+    def delete(self, user_id: Any) -> None:
+        """
+        Method to drop cached user in all processes
+
+        Params:
+            - user_id: value of user id claim
+        """
+        self.backend.delete(self._key(user_id))
+        self.versions.bump(user_id)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+user_cache: UserCache = UserCache()
+
+
+# ----------------------------------------------------------------
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication which takes user from process local cache (UserCache) instead of querying database
+    on every request.
+
+    With JWT_USER_CACHE['STATELESS'] setting user is built from token claims (id and username) without any lookup,
+    such user is an unsaved User instance usable as foreign key value. Stateless mode does not notice deactivation or
+    deletion of user until access token expires (ACCESS_TOKEN_LIFETIME), tokens without username claim are
+    authenticated with cache
+    """
+    def get_user(self, validated_token: Any) -> User:
+        """
+        Redefined method to get user from cache or from token claims
+
+        Params:
+            - validated_token: validated access token
+
+        Returns:
+            - user
+
+        Raises:
+            - InvalidToken (in case of token has no user id)
+            - AuthenticationFailed (in case of user not found or not active)
+        """
+        user: Optional[User] = self.get_cached_user(validated_token)
+        if user is None:
+            user_id: Any = validated_token[jwt_settings.USER_ID_CLAIM]
+            version: int = user_cache.get_version(user_id)
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, version)
+        return user
+
+    @classmethod
+    def get_cached_user(cls, validated_token: Any) -> Optional[User]:
+        """
+        Method to get user without database query: from token claims in stateless mode or from cache
+
+        Params:
+            - validated_token: validated access token
+
+        Returns:
+            - user or None if user must be loaded from database
+
+        Raises:
+            - InvalidToken (in case of token has no user id)
+        """
+        user: Optional[User] = cls.get_stateless_user(validated_token)
+        if user is not None:
+            return user
+        return user_cache.get(validated_token[jwt_settings.USER_ID_CLAIM])
+
+    @classmethod
+    async def aget_cached_user(cls, validated_token: Any) -> Optional[User]:
+        """
+        Method to get user without database query from async code, see get_cached_user
+
+        Params:
+            - validated_token: validated access token
+
+        Returns:
+            - user or None if user must be loaded from database
+
+        Raises:
+            - InvalidToken (in case of token has no user id)
+        """
+        user: Optional[User] = cls.get_stateless_user(validated_token)
+        if user is not None:
+            return user
+        return await user_cache.aget(validated_token[jwt_settings.USER_ID_CLAIM])
+
+    @staticmethod
+    def get_stateless_user(validated_token: Any) -> Optional[User]:
+        """
+        Method to build user from token claims in stateless mode
+
+        Params:
+            - validated_token: validated access token
+
+        Returns:
+            - user or None if stateless mode is off or token has no username
+
+        Raises:
+            - InvalidToken (in case of token has no user id)
+        """
+        try:
+            user_id: Any = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        if settings.JWT_USER_CACHE['STATELESS'] and USERNAME_CLAIM in validated_token:
+            return User(**{jwt_settings.USER_ID_FIELD: user_id, 'username': validated_token[USERNAME_CLAIM]})
+        return None
+
+
+# ----------------------------------------------------------------
+class CachedJWTScheme(SimpleJWTScheme):
+    """OpenAPI security scheme of CachedJWTAuthentication, the same as of simplejwt JWTAuthentication"""
+    target_class: str = 'bboom_test.authentication.CachedJWTAuthentication'
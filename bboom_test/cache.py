@@ -0,0 +1,422 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import BaseDatabaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+from django.views.decorators.http import condition
+
+
+# ----------------------------------------------------------------
+# entries of versioned caches read during current view, set by versioned_condition: ETag, Last-Modified,
+# replica routing and the view share entries read by one get_many instead of reading them from backend again
+read_entries: ContextVar[Optional[dict]] = ContextVar('read_entries', default=None)
+
+
+# ----------------------------------------------------------------
+# backends
+class LocMemLRUBackend:
+    """
+    Process local cache backend with LRU eviction bounded by number of entries.
+    Implements the subset of django cache API used by VersionedCache
+
+    Attrs:
+        - max_entries: defines maximum number of stored entries, least recently used entries are evicted first
+    """
+    def __init__(self, options: dict) -> None:
+        self.max_entries: int = options.get('MAX_ENTRIES', 10000)
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_alive(self, key: str) -> Any:
+        """
+        Method to get entry without lock, expired entry is removed. Lock must be held by caller
+
+        Params:
+            - key: cache key
+
+        Returns:
+            - tuple (value, expires_at) or None
+        """
+        entry: Optional[tuple] = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _set(self, key: str, value: Any, timeout: Optional[int]) -> None:
+        expires_at: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry: Optional[tuple] = self._get_alive(key)
+        return entry[0] if entry is not None else default
+
+    def get_many(self, keys: Iterable[str]) -> dict:
+        with self._lock:
+            entries: dict = {key: self._get_alive(key) for key in keys}
+        return {key: entry[0] for key, entry in entries.items() if entry is not None}
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        with self._lock:
+            self._set(key, value, timeout)
+
+    def set_many(self, data: dict, timeout: Optional[int] = None) -> None:
+        with self._lock:
+            for key, value in data.items():
+                self._set(key, value, timeout)
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        with self._lock:
+            if self._get_alive(key) is not None:
+                return False
+            self._set(key, value, timeout)
+            return True
+
+    def incr(self, key: str, delta: int = 1) -> int:
+        with self._lock:
+            entry: Optional[tuple] = self._get_alive(key)
+            if entry is None:
+                raise ValueError(f'Key {key} not found')
+            self._data[key] = (entry[0] + delta, entry[1])
+            return entry[0] + delta
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ----------------------------------------------------------------
+class DjangoCacheBackend:
+    """
+    Backend delegating to django cache framework, shared between worker processes if cache is shared (Redis).
+    Database cache is refused: every cache hit would query database, more than cached values save
+
+    Attrs:
+        - alias: defines django cache by ALIAS option
+
+    Raises:
+        - ImproperlyConfigured (in case of django cache is database cache)
+    """
+    def __init__(self, options: dict) -> None:
+        self.alias: str = options.get('ALIAS', 'default')
+        if isinstance(self.cache, BaseDatabaseCache):
+            raise ImproperlyConfigured(f'Versioned cache can not use database cache {self.alias}, set CACHE_URL')
+
+    @property
+    def cache(self) -> Any:
+        """Django cache of current thread, looked up on every use so changes of CACHES setting are applied"""
+        return caches[self.alias]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.cache.get(key, default)
+
+    def get_many(self, keys: Iterable[str]) -> dict:
+        return self.cache.get_many(keys)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        self.cache.set(key, value, timeout)
+
+    def set_many(self, data: dict, timeout: Optional[int] = None) -> None:
+        self.cache.set_many(data, timeout)
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        return self.cache.add(key, value, timeout)
+
+    def incr(self, key: str, delta: int = 1) -> int:
+        return self.cache.incr(key, delta)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+# ----------------------------------------------------------------
+class VersionedCache:
+    """
+    Cache of computed values grouped by scope (e.g. user). Every scope has a version counter, value is saved
+    together with version it was computed for and is used only while the version is current, so bumping the version
+    invalidates all values of the scope at once. Stale values are never read again and are evicted by backend.
+
+    Version counter is seeded with current time in nanoseconds, so a counter lost by eviction or restart
+    never returns to a value used before. Together with time of last write the version is a cheap change marker
+    of the scope used for conditional requests (ETag / Last-Modified) and replica routing (bboom_test.routers).
+
+    Version, time of last write and values of scope are kept in one backend and are read by one get_many,
+    inside versioned_condition entries read once are reused for the rest of the request.
+
+    Cache with MAX_AGE (VERSIONED_CACHE setting, by namespace) serves data changed without bump, e.g. counters:
+    its values and ETags are renewed every MAX_AGE seconds, so such changes are seen after MAX_AGE at most
+
+    Attrs:
+        - namespace: defines prefix of all keys of this cache
+    """
+    def __init__(self, namespace: str) -> None:
+        self.namespace: str = namespace
+
+    @cached_property
+    def backend(self) -> Any:
+        """Backend defined by VERSIONED_CACHE setting"""
+        backend_class: Any = import_string(settings.VERSIONED_CACHE['BACKEND'])
+        return backend_class(settings.VERSIONED_CACHE.get('OPTIONS', {}))
+
+    @property
+    def timeout(self) -> Optional[int]:
+        return settings.VERSIONED_CACHE.get('TIMEOUT')
+
+    @property
+    def max_age(self) -> Optional[int]:
+        return settings.VERSIONED_CACHE.get('MAX_AGE', {}).get(self.namespace)
+
+    def _get_period(self) -> int:
+        """Method to get number of current period of MAX_AGE seconds since epoch, 0 for cache without MAX_AGE"""
+        return int(time.time() // self.max_age) if self.max_age else 0
+
+    def _version_key(self, scope: Any) -> str:
+        return f'{self.namespace}:version:{scope}'
+
+    def _modified_key(self, scope: Any) -> str:
+        return f'{self.namespace}:modified:{scope}'
+
+    def _value_key(self, scope: Any, suffix: str) -> str:
+        digest: str = hashlib.md5(suffix.encode()).hexdigest()
+        return f'{self.namespace}:{scope}:{digest}'
+
+    def _get_entries(self, keys: list[str]) -> dict:
+        """
+        Method to read entries by one get_many, entries read before in current request are not read again
+
+        Params:
+            - keys: keys of entries
+
+        Returns:
+            - dict of entries by key, None for missing ones. Inside versioned_condition it is shared by the request
+        """
+        entries: Optional[dict] = read_entries.get()
+        read: dict = entries.setdefault(self, {}) if entries is not None else {}
+        missing: list[str] = [key for key in keys if key not in read]
+        if missing:
+            found: dict = self.backend.get_many(missing)
+            read.update({key: found.get(key) for key in missing})
+        return read
+
+    def _read(self, scope: Any, suffixes: Iterable[str] = ()) -> dict:
+        """
+        Method to read version, time of last write and values of scope by one get_many. Missing version
+        and time of last write are created
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+            - suffixes: identifiers of values inside scope
+
+        Returns:
+            - dict of entries by key
+        """
+        version_key: str = self._version_key(scope)
+        modified_key: str = self._modified_key(scope)
+        entries: dict = self._get_entries(
+            [version_key, modified_key, *(self._value_key(scope, suffix) for suffix in suffixes)]
+        )
+        if entries[version_key] is None or entries[modified_key] is None:
+            self.backend.add(version_key, time.time_ns())
+            self.backend.add(modified_key, time.time())
+            found: dict = self.backend.get_many([version_key, modified_key])
+            entries[version_key] = found.get(version_key, time.time_ns())
+            entries[modified_key] = found.get(modified_key, time.time())
+        return entries
+
+    def prefetch(self, scope: Any, suffixes: Iterable[str]) -> None:
+        """
+        Method to read version, time of last write and values of scope by one get_many, so the rest of current
+        request does not read backend. Has effect only inside versioned_condition
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+            - suffixes: identifiers of values inside scope the view will get
+        """
+        self._read(scope, suffixes)
+
+    def get_version(self, scope: Any) -> int:
+        """
+        Method to get current version of scope, version is created if not exists
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+
+        Returns:
+            - version number
+        """
+        return self._read(scope)[self._version_key(scope)]
+
+    def bump(self, scope: Any) -> None:
+        """
+        Method to invalidate all values of scope. Must be called after every write affecting the scope
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+        """
+        key: str = self._version_key(scope)
+        try:
+            self.backend.incr(key)
+        except ValueError:
+            self.backend.add(key, time.time_ns())
+        self.backend.set(self._modified_key(scope), time.time())
+        entries: Optional[dict] = read_entries.get()
+        if entries is not None:
+            entries.pop(self, None)
+
+    async def abump(self, scope: Any) -> None:
+        """
+        Method to invalidate all values of scope from async code, backend may do blocking IO
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+        """
+        await sync_to_async(self.bump)(scope)
+
+    def get_modified(self, scope: Any) -> datetime:
+        """
+        Method to get time of last write to scope. If it is unknown (evicted or never written in this cache)
+        current time is saved and returned, so clients are never told that changed data is not modified
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+
+        Returns:
+            - aware datetime of last write
+        """
+        return datetime.fromtimestamp(self._read(scope)[self._modified_key(scope)], tz=timezone.utc)
+
+    def get_last_modified(self, scope: Any) -> datetime:
+        """
+        Method to get time of last change of values of scope: time of last write or, for cache with MAX_AGE,
+        start of current period if it is later
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+
+        Returns:
+            - aware datetime of last change
+        """
+        modified: datetime = self.get_modified(scope)
+        if not self.max_age:
+            return modified
+        return max(modified, datetime.fromtimestamp(self._get_period() * self.max_age, tz=timezone.utc))
+
+    def get_etag(self, scope: Any, suffix: str) -> str:
+        """
+        Method to build strong entity tag of value inside scope, it changes on every bump of the scope
+        and for cache with MAX_AGE every MAX_AGE seconds
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+            - suffix: identifier of representation inside scope, e.g. request path and Accept header
+
+        Returns:
+            - entity tag without quotes
+        """
+        tag: str = f'{self.namespace}:{scope}:{self.get_version(scope)}:{self._get_period()}:{suffix}'
+        return hashlib.md5(tag.encode()).hexdigest()
+
+    def get_or_set(self, scope: Any, suffix: str, default: Callable[[], Any]) -> Any:
+        """
+        Method to get value from cache or compute it and save in cache.
+        Version is read before computing, so value computed concurrently with a write is saved under old version.
+        Value of cache with MAX_AGE is computed again in every period of MAX_AGE seconds
+
+        Params:
+            - scope: scope identifier, e.g. user's pk
+            - suffix: identifier of value inside scope, e.g. request path
+            - default: callable to compute value in case of cache miss
+
+        Returns:
+            - value
+        """
+        key: str = self._value_key(scope, suffix)
+        entries: dict = self._read(scope, [suffix])
+        version: tuple[int, int] = (entries[self._version_key(scope)], self._get_period())
+        if entries[key] is not None and entries[key][0] == version:
+            return entries[key][1]
+        value: Any = default()
+        entries[key] = (version, value)
+        self.backend.set(key, entries[key], self.timeout)
+        return value
+
+    def clear(self) -> None:
+        """Method to drop all entries of backend"""
+        self.backend.clear()
+
+
+# ----------------------------------------------------------------
+def versioned_condition(
+        cache: VersionedCache, get_scope: Callable[..., Any], get_suffixes: Optional[Callable[..., Iterable[str]]] = None
+) -> Callable:
+    """
+    Decorator factory for views serving values of VersionedCache scope. Emits strong ETag and Last-Modified
+    derived from version of the scope and answers If-None-Match / If-Modified-Since with 304 before view is called.
+    ETag varies by URL, Accept header and requesting user. Last-Modified has whole seconds, so time of last write
+    is rounded up and is not sent until its second is over: a write made later always gets greater Last-Modified.
+
+    Version, time of last write and values the view will get (get_suffixes) are read by one get_many,
+    replica routing and the view reuse them
+
+    Params:
+        - cache: VersionedCache instance
+        - get_scope: callable taking view arguments (request, *args, **kwargs) and returning scope identifier
+        - get_suffixes: callable taking view arguments and returning suffixes of values got by the view
+
+    Returns:
+        - view decorator
+    """
+    def etag_func(request: Any, *args: tuple, **kwargs: dict) -> str:
+        scope: Any = get_scope(request, *args, **kwargs)
+        cache.prefetch(scope, get_suffixes(request, *args, **kwargs) if get_suffixes is not None else ())
+        representation: str = f"{request.build_absolute_uri()}:{request.META.get('HTTP_ACCEPT', '')}:{request.user.pk}"
+        return cache.get_etag(scope, representation)
+
+    def last_modified_func(request: Any, *args: tuple, **kwargs: dict) -> Optional[datetime]:
+        modified: int = math.ceil(cache.get_last_modified(get_scope(request, *args, **kwargs)).timestamp())
+        if modified > time.time():
+            # a later write in the same second would get the same value, only ETag is sent until the second is over
+            return None
+        return datetime.fromtimestamp(modified, tz=timezone.utc)
+
+    def decorator(view: Callable) -> Callable:
+        conditional_view: Callable = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @wraps(view)
+        def wrapper(request: Any, *args: tuple, **kwargs: dict) -> Any:
+            token: Any = read_entries.set({})
+            try:
+                return conditional_view(request, *args, **kwargs)
+            finally:
+                read_entries.reset(token)
+        return wrapper
+    return decorator
@@ -0,0 +1,112 @@
+from functools import partial
+from typing import Any
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.base import Database, IsolationLevel
+
+from bboom_test.db.pool import ConnectionPool, get_pool, PoolTimeout
+from bboom_test.db.backends.postgresql_pool.creation import DatabaseCreation
+
+
+# ----------------------------------------------------------------
+# transaction status of connection without open transaction, the same value in psycopg2 and psycopg 3
+TRANSACTION_STATUS_IDLE: int = 0
+
+# default POOL options of database settings
+DEFAULT_POOL_OPTIONS: dict[str, float] = {
+    'MIN_SIZE': 1,
+    'MAX_SIZE': 10,
+    'TIMEOUT': 10.0,
+    'MAX_IDLE': 300.0,
+    'CHECK_AFTER': 30.0,
+}
+
+
+# ----------------------------------------------------------------
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend borrowing connections from per process pool (bboom_test.db.pool) instead of opening them.
+
+    Closing of connection (at the end of every request with CONN_MAX_AGE 0) returns it to pool, open transaction is
+    rolled back. Connection closed inside atomic block or failing rollback is closed for real. Borrowed connection
+    is checked without query if it was used recently, and by SELECT 1 if it was idle for CHECK_AFTER seconds.
+    Pool is configured by POOL options of database settings: MIN_SIZE, MAX_SIZE, TIMEOUT, MAX_IDLE, CHECK_AFTER
+    """
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self) -> ConnectionPool:
+        options: dict[str, float] = {**DEFAULT_POOL_OPTIONS, **self.settings_dict.get('POOL', {})}
+        # test database and database of _nodb_cursor have other params, so they have own pools
+        key: tuple = (self.alias, repr(sorted(self.get_connection_params().items())))
+        return get_pool(key, lambda: ConnectionPool(
+            name=self.alias,
+            check=partial(check_connection, check_after=options['CHECK_AFTER']),
+            min_size=int(options['MIN_SIZE']),
+            max_size=int(options['MAX_SIZE']),
+            timeout=options['TIMEOUT'],
+            max_idle=options['MAX_IDLE'],
+        ))
+
+    def get_new_connection(self, conn_params: dict) -> Any:
+        """
+        Redefined method to borrow connection from pool, new connection is opened by parent method
+
+        Params:
+            - conn_params: connection params
+
+        Returns:
+            - connection
+
+        Raises:
+            - OperationalError (in case of no connection became free in pool TIMEOUT)
+        """
+        try:
+            connection: Any = self.pool.acquire(partial(super().get_new_connection, conn_params))
+        except PoolTimeout as exc:
+            raise Database.OperationalError(str(exc)) from exc
+        # parent method sets isolation level of wrapper for new connections only
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self) -> None:
+        """Redefined method to return connection to pool instead of closing it"""
+        if self.connection is None:
+            return
+        reusable: bool = not self.in_atomic_block
+        if reusable:
+            try:
+                if self.connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    self.connection.rollback()
+                reusable = not self.connection.closed and (not self.errors_occurred or self.is_usable())
+            except Database.Error:
+                reusable = False
+        with self.wrap_database_errors:
+            self.pool.release(self.connection, reusable)
+
+
+# ----------------------------------------------------------------
+def check_connection(connection: Any, idle_for: float, check_after: float) -> bool:
+    """
+    Function to check borrowed connection
+
+    Params:
+        - connection: psycopg connection
+        - idle_for: seconds connection was idle
+        - check_after: seconds of idleness after which connection is checked by query
+
+    Returns:
+        - True if connection can be used
+    """
+    if connection.closed or connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        return False
+    if idle_for < check_after:
+        return True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Database.Error:
+        return False
+    return True
@@ -0,0 +1,11 @@
+from django.db.backends.postgresql import creation
+
+from bboom_test.db.pool import close_pools
+
+
+# ----------------------------------------------------------------
+class DatabaseCreation(creation.DatabaseCreation):
+    """Creation of test database, idle pooled connections are closed before test database is dropped"""
+    def _destroy_test_db(self, test_database_name: str, verbosity: int) -> None:
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
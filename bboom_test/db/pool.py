@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from bboom_test.metrics import registry
+
+
+# ----------------------------------------------------------------
+class PoolTimeout(Exception):
+    """No connection became free in time"""
+
+
+# ----------------------------------------------------------------
+class ConnectionPool:
+    """
+    Thread safe pool of database connections of one process.
+
+    Connection is checked when borrowed: connection failing check is closed and another one is borrowed.
+    Idle connections unused for more than max_idle seconds are closed, but min_size connections are always kept.
+    When max_size connections are in use, borrower waits for a free connection up to timeout seconds.
+    Most recently returned connection is borrowed first, so rarely used connections become idle and are closed
+
+    Attrs:
+        - name: defines pool name used in metrics, e.g. database alias
+        - check: defines callable (connection, seconds idle) returning False for connection which must not be used
+        - min_size: defines number of idle connections never closed by idle eviction
+        - max_size: defines maximum number of open connections
+        - timeout: defines seconds to wait for free connection
+        - max_idle: defines seconds after which idle connection is closed
+    """
+    def __init__(
+            self, name: str, check: Callable[[Any, float], bool], min_size: int = 1, max_size: int = 10,
+            timeout: float = 10.0, max_idle: float = 300.0
+    ) -> None:
+        self.name: str = name
+        self.check: Callable[[Any, float], bool] = check
+        self.min_size: int = min_size
+        self.max_size: int = max_size
+        self.timeout: float = timeout
+        self.max_idle: float = max_idle
+        self._condition = threading.Condition()
+        self._idle: list[tuple[Any, float]] = []
+        self._size: int = 0
+        self._stats: dict[str, float] = dict.fromkeys(
+            ('waits', 'wait_seconds', 'timeouts', 'created', 'closed', 'failed_checks'), 0
+        )
+
+    def acquire(self, connect: Callable[[], Any]) -> Any:
+        """
+        Method to borrow connection, new connection is opened if there is no idle one and pool is not full
+
+        Params:
+            - connect: callable opening new connection
+
+        Returns:
+            - connection
+
+        Raises:
+            - PoolTimeout (in case of no connection became free in time)
+        """
+        while True:
+            connection, idle_since = self._borrow()
+            if connection is None:
+                return self._connect(connect)
+            if self.check(connection, time.monotonic() - idle_since):
+                return connection
+            self._discard(connection, 'failed_checks')
+
+    def release(self, connection: Any, reusable: bool = True) -> None:
+        """
+        Method to return borrowed connection
+
+        Params:
+            - connection: borrowed connection
+            - reusable: False if connection is broken or has unknown state and must be closed
+        """
+        if not reusable:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._evict_idle()
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Method to close all idle connections, borrowed connections are closed when returned"""
+        with self._condition:
+            idle: list[tuple[Any, float]] = self._idle
+            self._idle = []
+            self._size -= len(idle)
+            self._stats['closed'] += len(idle)
+        for connection, _ in idle:
+            _close_quietly(connection)
+
+    def reset_after_fork(self) -> None:
+        """Method to forget connections inherited from parent process without closing them, they belong to parent"""
+        self._condition = threading.Condition()
+        self._idle = []
+        self._size = 0
+
+    def get_stats(self) -> dict[str, float]:
+        """
+        Method to get pool statistics
+
+        Returns:
+            - dict with numbers of connections in use and idle, waits, wait time, timeouts,
+              created and closed connections and failed checks
+        """
+        with self._condition:
+            return {'in_use': self._size - len(self._idle), 'idle': len(self._idle), **self._stats}
+
+    def _borrow(self) -> tuple[Optional[Any], float]:
+        """
+        Method to take idle connection or reserve place for new one, waits if pool is full
+
+        Returns:
+            - tuple (connection, time it became idle), connection is None if new one must be opened
+        """
+        started: Optional[float] = None
+        with self._condition:
+            try:
+                while True:
+                    self._evict_idle()
+                    if self._idle:
+                        return self._idle.pop()
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, 0.0
+                    if started is None:
+                        started = time.monotonic()
+                        self._stats['waits'] += 1
+                    remaining: float = self.timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(f'No free connection in pool {self.name} in {self.timeout} s')
+                    self._condition.wait(remaining)
+            finally:
+                if started is not None:
+                    self._stats['wait_seconds'] += time.monotonic() - started
+
+    def _connect(self, connect: Callable[[], Any]) -> Any:
+        """Method to open connection in place reserved by _borrow, place is freed on error"""
+        try:
+            connection: Any = connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._stats['created'] += 1
+        return connection
+
+    def _discard(self, connection: Any, reason: Optional[str] = None) -> None:
+        """Method to close borrowed connection and free its place"""
+        _close_quietly(connection)
+        with self._condition:
+            self._size -= 1
+            self._stats['closed'] += 1
+            if reason:
+                self._stats[reason] += 1
+            self._condition.notify()
+
+    def _evict_idle(self) -> None:
+        """Method to close connections idle for more than max_idle seconds above min_size. Lock must be held"""
+        deadline: float = time.monotonic() - self.max_idle
+        # idle list is ordered by time of return, the oldest connections are first
+        while len(self._idle) > self.min_size and self._idle[0][1] <= deadline:
+            connection, _ = self._idle.pop(0)
+            self._size -= 1
+            self._stats['closed'] += 1
+            _close_quietly(connection)
+
+
+# ----------------------------------------------------------------
+def _close_quietly(connection: Any) -> None:
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+# ----------------------------------------------------------------
+# pools of current process by key (alias and connection params)
+pools: dict[Any, ConnectionPool] = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(key: Any, factory: Callable[[], ConnectionPool]) -> ConnectionPool:
+    """
+    Function to get pool by key, pool is created by factory on first use
+
+    Params:
+        - key: hashable pool key
+        - factory: callable creating pool
+
+    Returns:
+        - pool
+    """
+    pool: Optional[ConnectionPool] = pools.get(key)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(key)
+            if pool is None:
+                pool = pools[key] = factory()
+    return pool
+
+
+def close_pools() -> None:
+    """Function to close idle connections of all pools, e.g. before test database is dropped"""
+    for pool in list(pools.values()):
+        pool.close()
+
+
+def collect_pool_metrics() -> dict:
+    """
+    Function to collect statistics of all pools for /metrics
+
+    Returns:
+        - dict of metric values in format of bboom_test.metrics registry
+    """
+    metrics: dict = {}
+    for pool in list(pools.values()):
+        stats: dict[str, float] = pool.get_stats()
+        alias: tuple = ('alias', pool.name)
+        values: dict[tuple, float] = {
+            ('db_pool_connections', (alias, ('state', 'in_use'))): stats['in_use'],
+            ('db_pool_connections', (alias, ('state', 'idle'))): stats['idle'],
+            ('db_pool_waits_total', (alias,)): stats['waits'],
+            ('db_pool_wait_seconds_total', (alias,)): stats['wait_seconds'],
+            ('db_pool_timeouts_total', (alias,)): stats['timeouts'],
+            ('db_pool_connections_created_total', (alias,)): stats['created'],
+            ('db_pool_connections_closed_total', (alias,)): stats['closed'],
+            ('db_pool_failed_checks_total', (alias,)): stats['failed_checks'],
+        }
+        for key, value in values.items():
+            metrics[key] = [metrics.get(key, [0])[0] + value]
+    return metrics
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in pools.values():
+        pool.reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+registry.register_collector(collect_pool_metrics)
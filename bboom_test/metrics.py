@@ -0,0 +1,452 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+
+# ----------------------------------------------------------------
+# metrics definitions
+LATENCY_BUCKETS: tuple = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS: tuple = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS: tuple = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name: (help, buckets)
+HISTOGRAMS: dict[str, tuple[str, tuple]] = {
+    'http_request_duration_seconds': ('Request latency by view', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('Response body size by view, streaming responses are not observed', SIZE_BUCKETS),
+    'db_queries_per_request': ('Number of database queries per request by view', QUERY_BUCKETS),
+}
+
+# name: help
+COUNTERS: dict[str, str] = {
+    'http_requests_total': 'Number of requests by view, method and status code',
+    'db_query_duration_seconds_total': 'Time spent in database queries by view',
+    'db_pool_waits_total': 'Number of connection borrows which waited for free pooled connection',
+    'db_pool_wait_seconds_total': 'Time spent waiting for free pooled connection',
+    'db_pool_timeouts_total': 'Number of connection borrows which timed out',
+    'db_pool_connections_created_total': 'Number of opened pooled connections',
+    'db_pool_connections_closed_total': 'Number of closed pooled connections',
+    'db_pool_failed_checks_total': 'Number of pooled connections which failed health check',
+}
+
+# name: help
+GAUGES: dict[str, str] = {
+    'db_pool_connections': 'Open pooled database connections by state (in_use, idle)',
+}
+
+UNRESOLVED_VIEW: str = 'unresolved'
+
+
+# ----------------------------------------------------------------
+class MetricsRegistry:
+    """
+    Registry of request metrics aggregated per process.
+
+    Hot path is lock free: every thread writes to its own shard (dict of metric values), lock is taken only
+    when thread writes for the first time, on scrape and on flush. Shards of finished threads are folded into
+    one shard, so short living threads (e.g. thread sensitive executors under ASGI) do not leak memory.
+
+    With METRICS_MULTIPROCESS_DIR setting every process periodically dumps its totals into own file in the directory
+    (atomic replace), and scrape merges files of all processes. Files of stopped processes are kept, so counters
+    stay monotonic, the directory should be emptied on deploy.
+
+    Values are lists: histogram is [count per bucket..., count of +Inf bucket, sum, count], counter and gauge are
+    [value]. Collectors (register_collector) add values which are not recorded per request, e.g. pool statistics.
+    Gauges are taken only from files updated within last three flush intervals, so stopped processes are not reported
+
+    Attrs:
+        - flush_interval: defines minimum number of seconds between dumps in multiprocess mode
+    """
+    def __init__(self) -> None:
+        self._collectors: list[Callable[[], dict]] = []
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+
+    def _reset(self) -> None:
+        """Method to drop all values, also called in forked process which must not report values of parent"""
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._file_id: str = f'{os.getpid()}-{time.time_ns()}'
+        self._next_flush: float = 0.0
+
+    @property
+    def directory(self) -> Optional[str]:
+        return getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+
+    @property
+    def flush_interval(self) -> float:
+        return getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0)
+
+    def _shard(self) -> dict:
+        """
+        Method to get shard of current thread, shard is created on first use
+
+        Returns:
+            - dict of metric values written only by current thread
+        """
+        shard: Optional[dict] = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._fold_finished()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+        return shard
+
+    def _fold_finished(self) -> None:
+        """Method to merge shards of finished threads into retired shard. Lock must be held by caller"""
+        alive: list[tuple[threading.Thread, dict]] = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                merge(self._retired, shard)
+        self._shards = alive
+
+    def register_collector(self, collector: Callable[[], dict]) -> None:
+        """
+        Method to add callable returning dict of metric values of current process, called on every collect
+
+        Params:
+            - collector: callable returning dict of counter and gauge values
+        """
+        self._collectors.append(collector)
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        """
+        Method to add observation to histogram
+
+        Params:
+            - name: histogram name from HISTOGRAMS
+            - labels: tuple of (label, value) pairs
+            - value: observed value
+        """
+        shard: dict = self._shard()
+        buckets: tuple = HISTOGRAMS[name][1]
+        values: Optional[list] = shard.get((name, labels))
+        if values is None:
+            values = shard[(name, labels)] = [0] * (len(buckets) + 3)
+        values[bisect_left(buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def inc(self, name: str, labels: tuple, amount: float = 1) -> None:
+        """
+        Method to increment counter
+
+        Params:
+            - name: counter name from COUNTERS
+            - labels: tuple of (label, value) pairs
+            - amount: increment
+        """
+        shard: dict = self._shard()
+        values: Optional[list] = shard.get((name, labels))
+        if values is None:
+            values = shard[(name, labels)] = [0]
+        values[0] += amount
+
+    def record(
+            self, view: str, method: str, status: int, duration: float, size: Optional[int], queries: int,
+            query_duration: float
+    ) -> None:
+        """
+        Method to record metrics of one request
+
+        Params:
+            - view: resolved view name
+            - method: request method
+            - status: response status code
+            - duration: request latency in seconds
+            - size: response body size in bytes, None for streaming responses
+            - queries: number of database queries
+            - query_duration: time spent in database queries in seconds
+        """
+        labels: tuple = (('view', view),)
+        self.observe('http_request_duration_seconds', labels, duration)
+        if size is not None:
+            self.observe('http_response_size_bytes', labels, size)
+        self.observe('db_queries_per_request', labels, queries)
+        self.inc('db_query_duration_seconds_total', labels, query_duration)
+        self.inc('http_requests_total', (('view', view), ('method', method), ('status', str(status))))
+        if self.directory and time.monotonic() >= self._next_flush:
+            self.flush(blocking=False)
+
+    def collect_local(self) -> dict:
+        """
+        Method to merge shards of current process
+
+        Returns:
+            - dict of metric values
+        """
+        with self._lock:
+            self._fold_finished()
+            result: dict = merge({}, self._retired)
+            for _, shard in self._shards:
+                # dict.copy is atomic under GIL, so owner thread may keep writing to shard
+                merge(result, shard.copy())
+        for collector in self._collectors:
+            merge(result, collector())
+        return result
+
+    def flush(self, blocking: bool = True) -> None:
+        """
+        Method to dump totals of current process into its file in multiprocess mode
+
+        Params:
+            - blocking: wait for concurrent flush or skip flushing
+        """
+        if not self.directory or not self._flush_lock.acquire(blocking=blocking):
+            return
+        try:
+            self._next_flush = time.monotonic() + self.flush_interval
+            data: list = [[name, labels, values] for (name, labels), values in self.collect_local().items()]
+            path: Path = Path(self.directory) / f'metrics-{self._file_id}.json'
+            tmp_path: Path = path.with_suffix('.tmp')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, path)
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> dict:
+        """
+        Method to collect metrics of current process or, in multiprocess mode, of all processes
+
+        Returns:
+            - dict of metric values
+        """
+        if not self.directory:
+            return self.collect_local()
+        self.flush()
+        result: dict = {}
+        stale_before: float = time.time() - 3 * self.flush_interval
+        for path in Path(self.directory).glob('metrics-*.json'):
+            try:
+                stale: bool = path.stat().st_mtime < stale_before
+                data: list = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            merge(result, {
+                (name, tuple(map(tuple, labels))): values for name, labels, values in data
+                if not (stale and name in GAUGES)
+            })
+        return result
+
+    def render(self) -> str:
+        """
+        Method to render collected metrics in Prometheus text exposition format
+
+        Returns:
+            - text of exposition
+        """
+        collected: dict = self.collect()
+        lines: list[str] = []
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for labels, values in sorted((key[1], value) for key, value in collected.items() if key[0] == name):
+                cumulative: int = 0
+                for bound, count in zip([*buckets, '+Inf'], values[:-2]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{format_labels((*labels, ("le", str(bound))))} {cumulative}')
+                lines.append(f'{name}_sum{format_labels(labels)} {values[-2]}')
+                lines.append(f'{name}_count{format_labels(labels)} {values[-1]}')
+        for name, help_text in COUNTERS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for labels, values in sorted((key[1], value) for key, value in collected.items() if key[0] == name):
+                lines.append(f'{name}{format_labels(labels)} {values[0]}')
+        for name, help_text in GAUGES.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+            for labels, values in sorted((key[1], value) for key, value in collected.items() if key[0] == name):
+                lines.append(f'{name}{format_labels(labels)} {values[0]}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self) -> None:
+        """Method to drop all values of current process"""
+        with self._lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired.clear()
+
+
+# ----------------------------------------------------------------
+def merge(target: dict, source: dict) -> dict:
+    """
+    Function to add metric values of source to target
+
+    Params:
+        - target: dict of metric values to update
+        - source: dict of metric values
+
+    Returns:
+        - target
+    """
+    for key, values in source.items():
+        current: Optional[list] = target.get(key)
+        if current is None:
+            target[key] = list(values)
+        else:
+            for index, value in enumerate(values):
+                current[index] += value
+    return target
+
+
+def format_labels(labels: tuple) -> str:
+    """
+    Function to format labels in exposition format with escaped values
+
+    Params:
+        - labels: tuple of (label, value) pairs
+
+    Returns:
+        - labels string, e.g. {view="users.views.UserListView"}
+    """
+    escaped: list[str] = [
+        '{}="{}"'.format(label, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for label, value in labels
+    ]
+    return '{' + ','.join(escaped) + '}' if escaped else ''
+
+
+registry: MetricsRegistry = MetricsRegistry()
+
+
+# ----------------------------------------------------------------
+class QueryStats:
+    """
+    Counter of queries and time spent in them
+
+    Attrs:
+        - count: number of executed queries
+        - duration: total time of queries in seconds
+    """
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.duration: float = 0.0
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+# stats of current request. Context is copied to threads of sync_to_async, so queries of sync code called
+# from async views and middlewares are counted too
+request_query_stats: ContextVar[Optional[QueryStats]] = ContextVar('request_query_stats', default=None)
+
+
+def count_query(execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+    """Database execute wrapper passing query to stats of current request, if any"""
+    stats: Optional[QueryStats] = request_query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_counter(connection: Any, **kwargs: dict) -> None:
+    """
+    connection_created receiver to add count_query to execute wrappers of connection
+
+    Params:
+        - connection: database connection wrapper
+    """
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+# ----------------------------------------------------------------
+class MetricsMiddleware:
+    """
+    Middleware to record latency, response size, status code and database queries of every request
+    per resolved view name. Must be the first middleware, so latency includes all other middlewares.
+    Time of streaming responses covers only building of response, not streaming of content.
+    Works in mode of the rest of chain, so ASGI requests are not passed through a thread
+    """
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response: Callable = get_response
+        self.is_async: bool = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # connections opened later (e.g. in threads of sync_to_async) get counter on connect
+        connection_created.connect(install_query_counter, dispatch_uid='bboom_test.metrics.install_query_counter')
+
+    def __call__(self, request: HttpRequest) -> Union[HttpResponse, Awaitable[HttpResponse]]:
+        if self.is_async:
+            return self.__acall__(request)
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection)
+        stats: QueryStats = QueryStats()
+        token: Any = request_query_stats.set(stats)
+        started: float = time.perf_counter()
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            request_query_stats.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats: QueryStats = QueryStats()
+        token: Any = request_query_stats.set(stats)
+        started: float = time.perf_counter()
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            request_query_stats.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def record(self, request: HttpRequest, response: HttpResponse, duration: float, stats: QueryStats) -> None:
+        """
+        Method to record metrics of finished request
+
+        Params:
+            - request: defines current request
+            - response: defines response of request
+            - duration: seconds spent by the rest of chain
+            - stats: queries of request
+        """
+        resolver_match: Any = getattr(request, 'resolver_match', None)
+        registry.record(
+            view=resolver_match.view_name if resolver_match else UNRESOLVED_VIEW,
+            method=request.method,
+            status=response.status_code,
+            duration=duration,
+            size=None if response.streaming else len(response.content),
+            queries=stats.count,
+            query_duration=stats.duration,
+        )
+
+
+# ----------------------------------------------------------------
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    View to expose collected metrics in Prometheus text exposition format
+
+    Params:
+        - request: defines current request
+
+    Returns:
+        - text response
+    """
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,159 @@
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+
+# ----------------------------------------------------------------
+def adapt_method_mode(is_async: bool, method: Callable, method_is_async: Optional[bool] = None) -> Callable:
+    """
+    Function to adapt method to sync or async mode, like django handler does it
+
+    Params:
+        - is_async: defines required mode
+        - method: sync or async callable
+        - method_is_async: defines mode of method, detected if not given
+
+    Returns:
+        - callable of required mode
+    """
+    if method_is_async is None:
+        method_is_async = iscoroutinefunction(method)
+    if is_async and not method_is_async:
+        return sync_to_async(method, thread_sensitive=True)
+    if not is_async and method_is_async:
+        return async_to_sync(method)
+    return method
+
+
+# ----------------------------------------------------------------
+class MiddlewareChain:
+    """
+    Chain of middlewares built the same way as django handler builds MIDDLEWARE setting: every middleware works
+    in mode of the chain if it supports it, handlers and hooks are adapted only where modes differ
+
+    Attrs:
+        - handler: callable passing request through all middlewares of chain, coroutine function in async mode
+        - view_middleware: process_view methods in order of chain
+        - template_response_middleware: process_template_response methods in reverse order of chain
+        - exception_middleware: process_exception methods in reverse order of chain, always sync
+    """
+    def __init__(self, middleware_paths: list[str], get_response: Callable, is_async: bool = False) -> None:
+        self.view_middleware: list[Callable] = []
+        self.template_response_middleware: list[Callable] = []
+        self.exception_middleware: list[Callable] = []
+
+        handler: Callable = get_response
+        handler_is_async: bool = is_async
+        for middleware_path in reversed(middleware_paths):
+            middleware: Any = import_string(middleware_path)
+            middleware_can_sync: bool = getattr(middleware, 'sync_capable', True)
+            middleware_can_async: bool = getattr(middleware, 'async_capable', False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise ImproperlyConfigured(f'Middleware {middleware_path} must be sync or async capable')
+            middleware_is_async: bool = middleware_can_async if handler_is_async or not middleware_can_sync else False
+            try:
+                adapted_handler: Callable = adapt_method_mode(middleware_is_async, handler, handler_is_async)
+                instance: Any = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(instance, 'process_view'):
+                self.view_middleware.insert(0, adapt_method_mode(is_async, instance.process_view))
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_middleware.append(
+                    adapt_method_mode(is_async, instance.process_template_response)
+                )
+            if hasattr(instance, 'process_exception'):
+                self.exception_middleware.append(adapt_method_mode(False, instance.process_exception))
+            handler = convert_exception_to_response(instance)
+            handler_is_async = middleware_is_async
+        self.handler: Callable = adapt_method_mode(is_async, handler, handler_is_async)
+
+
+# ----------------------------------------------------------------
+class PrefixMiddlewareDispatcher:
+    """
+    Middleware passing request through one of middleware chains chosen by path prefix (MIDDLEWARE_CHAINS setting),
+    first chain with matching prefix is used, requests not matching any prefix skip all chains. It lets JWT-only API
+    requests skip session, CSRF, authentication and messages middlewares which are needed only by UI and admin.
+    Hooks of middlewares inside chains (process_view, process_template_response, process_exception) are called
+    by dispatcher hooks at the place of dispatcher in MIDDLEWARE. Chains and hooks are built in mode of get_response,
+    so under ASGI requests are not passed through a thread by dispatcher
+    """
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.is_async: bool = iscoroutinefunction(get_response)
+        self.chains: list[tuple[str, MiddlewareChain]] = [
+            (prefix, MiddlewareChain(middleware_paths, get_response, self.is_async))
+            for prefix, middleware_paths in settings.MIDDLEWARE_CHAINS
+        ]
+        self.passthrough: MiddlewareChain = MiddlewareChain([], get_response, self.is_async)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # handler adapts hooks to its mode, async ones are used as they are
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def get_chain(self, request: HttpRequest) -> MiddlewareChain:
+        """
+        Method to get chain of request
+
+        Params:
+            - request: defines current request
+
+        Returns:
+            - chain with the first matching prefix
+        """
+        for prefix, chain in self.chains:
+            if request.path_info.startswith(prefix):
+                return chain
+        return self.passthrough
+
+    def __call__(self, request: HttpRequest) -> Union[HttpResponse, Awaitable[HttpResponse]]:
+        if self.is_async:
+            return self.__acall__(request)
+        return self.get_chain(request).handler(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        return await self.get_chain(request).handler(request)
+
+    def process_view(
+            self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict
+    ) -> Optional[HttpResponse]:
+        for process_view in self.get_chain(request).view_middleware:
+            response: Optional[HttpResponse] = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        for process_template_response in self.get_chain(request).template_response_middleware:
+            response = process_template_response(request, response)
+        return response
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> Optional[HttpResponse]:
+        for process_exception in self.get_chain(request).exception_middleware:
+            response: Optional[HttpResponse] = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
+
+    async def aprocess_view(
+            self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict
+    ) -> Optional[HttpResponse]:
+        for process_view in self.get_chain(request).view_middleware:
+            response: Optional[HttpResponse] = await process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    async def aprocess_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        for process_template_response in self.get_chain(request).template_response_middleware:
+            response = await process_template_response(request, response)
+        return response
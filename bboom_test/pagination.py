@@ -0,0 +1,155 @@
+from typing import Any, Optional
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+from rest_framework.request import Request
+
+
+# ----------------------------------------------------------------
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination ordered by primary key
+
+    Every page is fetched with `WHERE id > <position> ORDER BY id LIMIT <page_size + 1>`, so the cost of a page
+    does not depend on how deep the client pages, unlike OFFSET pagination. Cursors are opaque base64 tokens.
+    Page is fetched either synchronously (paginate_queryset) or with async ORM (apaginate_queryset),
+    both produce the same cursors
+
+    Attrs:
+        - ordering: defines ordering field, must be unique and indexed
+        - page_size: defines default number of items per page
+        - page_size_query_param: defines query param to override page size
+        - max_page_size: defines upper bound for page size requested by client
+    """
+    ordering: str = 'id'
+    page_size: int = 50
+    page_size_query_param: str = 'page_size'
+    max_page_size: int = 500
+
+    def paginate_queryset(self, queryset: Any, request: Request, view: Any = None) -> Optional[list]:
+        page_queryset: Any = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset: Any, request: Request, view: Any = None) -> Optional[list]:
+        """
+        Method to paginate queryset with async ORM
+
+        Params:
+            - queryset: queryset to paginate
+            - request: DRF request wrapping current request
+            - view: current view
+
+        Returns:
+            - list of items of current page
+        """
+        page_queryset: Any = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page([item async for item in page_queryset])
+
+    def get_page_queryset(self, queryset: Any, request: Request, view: Any = None) -> Any:
+        """
+        Method to decode cursor and build queryset of current page plus one item to detect following page.
+        Logic is the same as in CursorPagination.paginate_queryset
+
+        Params:
+            - queryset: queryset to paginate
+            - request: DRF request
+            - view: current view
+
+        Returns:
+            - sliced queryset, not evaluated
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (self.offset, self.reverse, self.current_position) = (0, False, None)
+        else:
+            (self.offset, self.reverse, self.current_position) = self.cursor
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            order: str = self.ordering[0]
+            order_attr: str = order.lstrip('-')
+            lookup: str = '__lt' if self.cursor.reverse != order.startswith('-') else '__gt'
+            queryset = queryset.filter(**{order_attr + lookup: self.current_position})
+
+        return queryset[self.offset:self.offset + self.page_size + 1]
+
+    def set_page(self, results: list) -> list:
+        """
+        Method to save fetched page and positions used to build next and previous links
+
+        Params:
+            - results: fetched items of page plus one item of following page if exists
+
+        Returns:
+            - list of items of current page
+        """
+        self.page = list(results[:self.page_size])
+        has_following_position: bool = len(results) > len(self.page)
+        following_position: Optional[str] = (
+            self._get_position_from_instance(results[-1], self.ordering) if has_following_position else None
+        )
+        has_current_position: bool = self.current_position is not None or self.offset > 0
+
+        if self.reverse:
+            self.page = list(reversed(self.page))
+            self.has_next, self.has_previous = has_current_position, has_following_position
+            self.next_position, self.previous_position = self.current_position, following_position
+        else:
+            self.has_next, self.has_previous = has_following_position, has_current_position
+            self.next_position, self.previous_position = following_position, self.current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_paginated_data(self, data: list) -> dict:
+        """
+        Method to build paginated payload, same as body of get_paginated_response
+
+        Params:
+            - data: serialized items of current page
+
+        Returns:
+            - dict with next and previous links and results
+        """
+        return {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+
+
+# ----------------------------------------------------------------
+class NewestFirstCursorPagination(IdCursorPagination):
+    """
+    Keyset (cursor) pagination ordered by primary key descending, newest items first
+
+    Attrs:
+        - ordering: defines ordering field, must be unique and indexed
+    """
+    ordering: str = '-id'
+
+
+# ----------------------------------------------------------------
+class RankedPagination(PageNumberPagination):
+    """
+    Page number pagination for results ordered by relevance, where keyset pagination is not applicable
+
+    Attrs:
+        - page_size: defines default number of items per page
+        - page_size_query_param: defines query param to override page size
+        - max_page_size: defines upper bound for page size requested by client
+    """
+    page_size: int = 20
+    page_size_query_param: str = 'page_size'
+    max_page_size: int = 100
@@ -0,0 +1,40 @@
+from typing import Any, IO, Optional
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# ----------------------------------------------------------------
+class FastJSONParser(JSONParser):
+    """
+    JSON parser decoding request body by orjson. Falls back to DRF JSONParser if orjson is not installed
+    or if request body is not UTF-8
+    """
+    def parse(self, stream: IO, media_type: Optional[str] = None, parser_context: Optional[dict] = None) -> Any:
+        """
+        Redefined method to parse request body
+
+        Params:
+            - stream: request body stream
+            - media_type: media type of request
+            - parser_context: context of parser, may contain request encoding
+
+        Returns:
+            - parsed data
+
+        Raises:
+            - ParseError (in case of malformed body)
+        """
+        encoding: str = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
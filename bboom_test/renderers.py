@@ -0,0 +1,34 @@
+from typing import Any, Optional
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# ----------------------------------------------------------------
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding data straight to bytes by orjson. Output is the same as of DRF JSONRenderer with default
+    settings (compact, UTF-8), except U+2028 and U+2029 are not escaped: they are valid JSON and escaping them costs
+    more than encoding, API responses are not embedded into javascript. Types unknown to orjson (Decimal,
+    lazy strings, querysets, etc.) are converted by DRF encoder. Falls back to DRF JSONRenderer if orjson is not
+    installed, if indented output is requested (browsable API, indent media type parameter) or if orjson fails
+    """
+    options: int = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def render(
+            self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[dict] = None
+    ) -> bytes:
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+        except orjson.JSONEncodeError:
+            # e.g. integers out of 64 bit range, which stdlib json supports
+            return super().render(data, accepted_media_type, renderer_context)
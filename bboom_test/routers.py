@@ -0,0 +1,74 @@
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from bboom_test.cache import VersionedCache
+
+
+# ----------------------------------------------------------------
+# database alias of reads of current view, set by read_from_replica
+read_db: ContextVar[Optional[str]] = ContextVar('read_db', default=None)
+
+
+# ----------------------------------------------------------------
+class ReplicaRouter:
+    """
+    Database router sending reads of views decorated by read_from_replica to replica, all other reads and all writes
+    go to default database. Replicas (REPLICA_DATABASES setting) are never migrated, they get schema from primary
+    """
+    def db_for_read(self, model: Any, **hints: Any) -> Optional[str]:
+        return read_db.get()
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        # instances read from replica must be saved to primary too
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> Optional[bool]:
+        databases: set[str] = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> Optional[bool]:
+        return False if db in settings.REPLICA_DATABASES else None
+
+
+# ----------------------------------------------------------------
+def read_from_replica(cache: VersionedCache, get_scope: Callable[..., Any]) -> Callable:
+    """
+    Decorator factory for views reading values of VersionedCache scope to read them from replica.
+
+    Reads go to primary while the scope was written within REPLICA_LAG_WINDOW seconds (time of last bump of scope
+    kept by versioned cache, seen by all processes with CACHE_URL), so author sees own writes, e.g. new post right after
+    PostCreateView or add_post, and values read from lagging replica are not cached under new version of scope.
+    Window must be longer than replication lag. Session and user of request are read from primary
+
+    Params:
+        - cache: VersionedCache instance bumped by every write to scope
+        - get_scope: callable taking view arguments (request, *args, **kwargs) and returning scope identifier
+
+    Returns:
+        - view decorator
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(request: Any, *args: tuple, **kwargs: dict) -> Any:
+            if not settings.REPLICA_DATABASES or read_db.get() is not None:
+                return view(request, *args, **kwargs)
+            # lazy user of session authentication is loaded before reads are routed
+            getattr(getattr(request, 'user', None), 'pk', None)
+            written_at: float = cache.get_modified(get_scope(request, *args, **kwargs)).timestamp()
+            if written_at > time.time() - settings.REPLICA_LAG_WINDOW:
+                return view(request, *args, **kwargs)
+            token: Any = read_db.set(random.choice(settings.REPLICA_DATABASES))
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                read_db.reset(token)
+        return wrapper
+    return decorator
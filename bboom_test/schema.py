@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import re
+from typing import Any, Optional
+
+from django.http import HttpRequest, HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from drf_spectacular.views import SpectacularAPIView
+
+from bboom_test.cache import LocMemLRUBackend
+
+
+# ----------------------------------------------------------------
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+# ----------------------------------------------------------------
+class SchemaDocument:
+    """
+    Rendered schema with precomputed ETag and gzip compressed body
+
+    Attrs:
+        - content: rendered schema
+        - compressed: gzip compressed content
+        - etag: strong ETag of content
+        - content_type: defines Content-Type header
+        - headers: defines other headers of schema response, e.g. Content-Disposition
+    """
+    def __init__(self, content: bytes, content_type: str, headers: dict[str, str]) -> None:
+        self.content: bytes = content
+        self.compressed: bytes = gzip.compress(content, compresslevel=9, mtime=0)
+        self.etag: str = hashlib.sha256(content).hexdigest()[:32]
+        self.content_type: str = content_type
+        self.headers: dict[str, str] = headers
+
+    def get_response(self, request: HttpRequest) -> HttpResponse:
+        """
+        Method to build response, body is compressed if client accepts gzip, 304 is returned if client has it
+
+        Params:
+            - request: defines current request
+
+        Returns:
+            - response
+        """
+        compress: bool = bool(ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        # compressed body is another representation, so it has own ETag
+        etag: str = f'"{self.etag}-gzip"' if compress else f'"{self.etag}"'
+        response: Optional[HttpResponse] = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(self.compressed if compress else self.content, content_type=self.content_type)
+            for header, value in self.headers.items():
+                response[header] = value
+            if compress:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+# ----------------------------------------------------------------
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Schema view generating schema once per process for every format, version and language and serving it from memory.
+    Schema is public (SERVE_PUBLIC), so it does not depend on requesting user. Clients are expected to revalidate
+    it by ETag (Cache-Control: no-cache) and get 304 while process is alive, new deploy gives new ETag if schema changed
+    """
+    documents: LocMemLRUBackend = LocMemLRUBackend({'MAX_ENTRIES': 100})
+
+    def _get_schema_response(self, request: Any) -> HttpResponse:
+        """
+        Redefined method to serve rendered schema from memory, schema is generated and rendered on first request
+
+        Params:
+            - request: defines current request
+
+        Returns:
+            - response
+        """
+        renderer: Any = request.accepted_renderer
+        version: Optional[str] = self.api_version or request.version or self._get_version_parameter(request)
+        key: str = f'{renderer.format}:{renderer.media_type}:{version}:{translation.get_language()}'
+        document: Optional[SchemaDocument] = self.documents.get(key)
+        if document is None:
+            response: Any = super()._get_schema_response(request)
+            content: bytes = renderer.render(response.data, renderer.media_type, self.get_renderer_context())
+            content_type: str = f'{renderer.media_type}; charset={renderer.charset}' \
+                if renderer.charset else renderer.media_type
+            document = SchemaDocument(content, content_type, {'Content-Disposition': response['Content-Disposition']})
+            self.documents.set(key, document)
+        return document.get_response(request)
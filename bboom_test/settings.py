@@ -50,6 +50,7 @@ LOCAL_APPS = [
     'users',
     'posts',
     'ui',
+    'tasks',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + DRF_APPS + LOCAL_APPS
@@ -58,15 +59,29 @@ INSTALLED_APPS = DJANGO_APPS + DRF_APPS + LOCAL_APPS
 # ----------------------------------------------------------------
 # Middleware settings
 MIDDLEWARE = [
+    'bboom_test.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'bboom_test.middleware.PrefixMiddlewareDispatcher',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# middleware chains of bboom_test.middleware.PrefixMiddlewareDispatcher, first chain with matching path prefix is used:
+# JWT-only API requests skip session, CSRF, authentication and messages middlewares, UI and admin use all of them
+MIDDLEWARE_CHAINS = [
+    ('/api/', []),
+    ('', [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    ]),
+]
+
+# admin checks look for session, authentication and messages middlewares in MIDDLEWARE only,
+# they are applied to admin by MIDDLEWARE_CHAINS
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
 
 # ----------------------------------------------------------------
 # root urlconf settings
@@ -100,9 +115,127 @@ WSGI_APPLICATION = 'bboom_test.wsgi.application'
 # ----------------------------------------------------------------
 # Database settings
 DATABASES = {
-    'default': env.db()
+    'default': env.db(),
+    # read replica of default database (DATABASE_REPLICA_URL), without it the alias stands in for replica
+    # pointing to default database, e.g. to test routing locally. Tests use default test database for it
+    'replica': {
+        **env.db('DATABASE_REPLICA_URL', default=env.str('DATABASE_URL')),
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+# DATABASE_POOL: connections to PostgreSQL are borrowed from per process pool and returned to it at the end of request
+# instead of being opened for every request (bboom_test.db.backends.postgresql_pool), pool stats are exposed by /metrics
+if env.bool('DATABASE_POOL', default=False):
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.postgresql':
+            database['ENGINE'] = 'bboom_test.db.backends.postgresql_pool'
+            database['POOL'] = {
+                'MIN_SIZE': env.int('DATABASE_POOL_MIN_SIZE', default=1),
+                'MAX_SIZE': env.int('DATABASE_POOL_MAX_SIZE', default=10),
+                'TIMEOUT': env.float('DATABASE_POOL_TIMEOUT', default=10.0),
+                'MAX_IDLE': env.float('DATABASE_POOL_MAX_IDLE', default=300.0),
+                'CHECK_AFTER': env.float('DATABASE_POOL_CHECK_AFTER', default=30.0),
+            }
+
+# reads of list views are sent to REPLICA_DATABASES (bboom_test.routers), only if DATABASE_REPLICA_URL is set.
+# Reads of data written within REPLICA_LAG_WINDOW seconds go to default database, window must exceed replication lag
+DATABASE_ROUTERS = ['bboom_test.routers.ReplicaRouter']
+REPLICA_DATABASES = ['replica'] if env('DATABASE_REPLICA_URL', default=None) else []
+REPLICA_LAG_WINDOW = env.float('REPLICA_LAG_WINDOW', default=5.0)
+
+
+# ----------------------------------------------------------------
+# Cache settings
+# CACHE_URL: redis://host:port/db, cache shared by all processes (api, ui, workers, management commands), so writes
+# made by one process invalidate cached data of others. Without it cache is process local
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+
+# ----------------------------------------------------------------
+# Versioned cache settings (posts and users lists, versions of authenticated users)
+# BACKEND: 'bboom_test.cache.DjangoCacheBackend' (CACHES, shared by processes, default with CACHE_URL) or
+# 'bboom_test.cache.LocMemLRUBackend' (process local, default without CACHE_URL: only for deployments with one process,
+# writes made by other processes are seen after TIMEOUT). Database cache is refused, a hit must not query database
+VERSIONED_CACHE = {
+    'BACKEND': env(
+        'VERSIONED_CACHE_BACKEND',
+        default='bboom_test.cache.DjangoCacheBackend' if env('CACHE_URL', default=None)
+        else 'bboom_test.cache.LocMemLRUBackend',
+    ),
+    'OPTIONS': {
+        'MAX_ENTRIES': env.int('VERSIONED_CACHE_MAX_ENTRIES', default=10000),
+        'ALIAS': 'default',
+    },
+    'TIMEOUT': env.int('VERSIONED_CACHE_TIMEOUT', default=300),
+    # seconds values and ETags of namespace are kept at most: users lists show post_count of users,
+    # which is changed by every post write without bump of users lists (posts.counters)
+    'MAX_AGE': {
+        'users': env.int('USERS_POST_COUNT_MAX_AGE', default=60),
+    },
+}
+
+
+# ----------------------------------------------------------------
+# Posts settings
+POSTS_BULK_CREATE_BATCH_SIZE = env.int('POSTS_BULK_CREATE_BATCH_SIZE', default=500)
+POSTS_BULK_MAX_ITEMS = env.int('POSTS_BULK_MAX_ITEMS', default=5000)
+POSTS_EXPORT_CHUNK_SIZE = env.int('POSTS_EXPORT_CHUNK_SIZE', default=2000)
+# deleted posts are kept as tombstones hidden from all reads until they are purged
+POSTS_SOFT_DELETE = env.bool('POSTS_SOFT_DELETE', default=True)
+# tombstones deleted more than OLDER_THAN seconds ago are purged by recurring task posts.purge.purge_deleted_posts
+# (TASKS['RECURRING']) every INTERVAL seconds by batches of BATCH_SIZE posts SLEEP seconds apart
+POSTS_PURGE = {
+    'INTERVAL': env.float('POSTS_PURGE_INTERVAL', default=600.0),
+    'OLDER_THAN': env.float('POSTS_PURGE_OLDER_THAN', default=3600.0),
+    'BATCH_SIZE': env.int('POSTS_PURGE_BATCH_SIZE', default=500),
+    'SLEEP': env.float('POSTS_PURGE_SLEEP', default=0.5),
+}
+
+
+# ----------------------------------------------------------------
+# Users settings
+# number of rows deleted per transaction when user is deleted with posts (users.deletion)
+USERS_DELETE_BATCH_SIZE = env.int('USERS_DELETE_BATCH_SIZE', default=1000)
+
+
+# ----------------------------------------------------------------
+# Feed settings (posts.feed)
+# new posts are written to feeds of followers, except posts of authors with at least FEED_PULL_MIN_POSTS posts:
+# they are read from posts table when feed is read. FEED_BACKFILL_POSTS latest posts are added to feed on follow
+FEED_PULL_MIN_POSTS = env.int('FEED_PULL_MIN_POSTS', default=10000)
+FEED_BACKFILL_POSTS = env.int('FEED_BACKFILL_POSTS', default=100)
+
+
+# ----------------------------------------------------------------
+# Background tasks settings (tasks.queue), tasks are run by `manage.py run_workers`
+# LEASE: seconds after which task claimed by crashed worker is claimed again, must exceed run time of any task.
+# Failed task is retried after BACKOFF_BASE * 2 ** (attempt - 1) seconds up to BACKOFF_MAX, MAX_ATTEMPTS times
+TASKS = {
+    'LEASE': env.float('TASKS_LEASE', default=300.0),
+    'MAX_ATTEMPTS': env.int('TASKS_MAX_ATTEMPTS', default=5),
+    'BACKOFF_BASE': env.float('TASKS_BACKOFF_BASE', default=1.0),
+    'BACKOFF_MAX': env.float('TASKS_BACKOFF_MAX', default=300.0),
+    'POLL_INTERVAL': env.float('TASKS_POLL_INTERVAL', default=1.0),
+    # tasks queued by run_workers on start unless already queued, they queue themselves again
+    'RECURRING': ['posts.purge.purge_deleted_posts'],
+}
+
+
+# ----------------------------------------------------------------
+# UI settings
+UI_PAGE_SIZE = env.int('UI_PAGE_SIZE', default=50)
+
+
+# ----------------------------------------------------------------
+# Metrics settings
+# METRICS_MULTIPROCESS_DIR: directory shared by worker processes, metrics of all processes are exposed by /metrics.
+# If not set, every process exposes only its own metrics
+METRICS_MULTIPROCESS_DIR = env('METRICS_MULTIPROCESS_DIR', default=None)
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=5.0)
+
 
 # ----------------------------------------------------------------
 # Password validation settings
@@ -152,9 +285,32 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # rest framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication'
+        'bboom_test.authentication.CachedJWTAuthentication'
+    ],
+    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson based JSON renderer and parser, DRF JSONRenderer and JSONParser are used if orjson is not installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'bboom_test.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'
+    'DEFAULT_PARSER_CLASSES': [
+        'bboom_test.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+
+# ----------------------------------------------------------------
+# JWT authentication settings
+# users of API requests are cached in process, cached user is used while his version in versioned cache
+# (VERSIONED_CACHE) is not bumped by change of user. TIMEOUT: seconds cached user is kept at most, without CACHE_URL
+# versions are process local and it bounds time changes made by other processes are not seen.
+# STATELESS builds user from token claims
+JWT_USER_CACHE = {
+    'MAX_ENTRIES': env.int('JWT_USER_CACHE_MAX_ENTRIES', default=10000),
+    'TIMEOUT': env.int('JWT_USER_CACHE_TIMEOUT', default=60),
+    'STATELESS': env.bool('JWT_STATELESS', default=False),
 }
 
 
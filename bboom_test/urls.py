@@ -1,7 +1,10 @@
 """URL configuration for bboom_test project."""
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView
+from drf_spectacular.views import SpectacularRedocView
+
+from bboom_test.metrics import metrics_view
+from bboom_test.schema import CachedSpectacularAPIView
 
 
 # ----------------------------------------------------------------
@@ -9,7 +12,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('users.urls')),
     path('api/posts/', include('posts.urls')),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', CachedSpectacularAPIView.as_view(), name='schema'),
     path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     path('ui/', include('ui.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
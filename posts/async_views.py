@@ -0,0 +1,75 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from bboom_test.async_api import async_api_view, parse_json
+from bboom_test.pagination import IdCursorPagination
+from posts.cache import post_list_cache
+from posts.counters import create_post, delete_posts
+from posts.models import Post
+from posts.serializers import PostCreateSerializer, PostFastSerializer
+
+
+# ----------------------------------------------------------------
+# native async variants of posts API views, same payloads as PostListView, PostCreateView and PostDeleteView.
+# Writes run in a thread: async ORM has no transactions, post and author's post_count (posts.counters) and feed task
+# must be committed together
+@async_api_view(['GET'])
+async def post_list(request: HttpRequest) -> JsonResponse:
+    """
+    Async view to get page of posts of current user
+
+    Params:
+        - request: defines current request
+
+    Returns:
+        - JsonResponse with next and previous cursors and posts
+    """
+    paginator: IdCursorPagination = IdCursorPagination()
+    rows = PostFastSerializer.get_rows(Post.objects.filter(user=request.user), username=request.user.username)
+    page: list[dict] = await paginator.apaginate_queryset(rows, Request(request))
+    return JsonResponse(paginator.get_paginated_data(PostFastSerializer(page, many=True).data))
+
+
+# ----------------------------------------------------------------
+@async_api_view(['POST'])
+async def post_create(request: HttpRequest) -> JsonResponse:
+    """
+    Async view to create post of current user, post is created in a thread (see posts.counters.create_post)
+
+    Params:
+        - request: defines current request
+
+    Returns:
+        - JsonResponse with created post
+    """
+    serializer: PostCreateSerializer = PostCreateSerializer(data=parse_json(request), context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    post: Post = await sync_to_async(create_post)(**serializer.validated_data)
+    await post_list_cache.abump(request.user.pk)
+    return JsonResponse(PostCreateSerializer(post).data, status=status.HTTP_201_CREATED)
+
+
+# ----------------------------------------------------------------
+@async_api_view(['DELETE'])
+async def post_delete(request: HttpRequest, pk: int) -> HttpResponse:
+    """
+    Async view to delete post of current user with one statement (see posts.counters.delete_posts)
+
+    Params:
+        - request: defines current request
+        - pk: integer defines post primary key
+
+    Returns:
+        - empty response with 204 status code
+
+    Raises:
+        - NotFound (in case of post does not exist or belongs to another user)
+    """
+    deleted: int = await sync_to_async(delete_posts)(Post.objects.filter(pk=pk, user=request.user), request.user.pk)
+    if not deleted:
+        raise NotFound
+    await post_list_cache.abump(request.user.pk)
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,6 @@
+from bboom_test.cache import VersionedCache
+
+
+# ----------------------------------------------------------------
+# cache of posts lists, scope is author's pk. Must be bumped by every create/delete path of posts
+post_list_cache = VersionedCache(namespace='posts')
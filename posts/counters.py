@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, QuerySet, Value, When
+from django.utils import timezone
+
+from posts.feed import fan_out
+from posts.models import FeedEntry, Post
+from tasks.queue import enqueue
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# maintenance of denormalized User.post_count, every create and delete path of posts must use these functions
+def change_post_count(user_id: int, delta: int) -> None:
+    """
+    Function to change number of user's posts by atomic UPDATE. The same UPDATE sets feed_pull flag once user has
+    FEED_PULL_MIN_POSTS posts. Must be called in transaction of the write. Users lists showing post_count are not
+    bumped by every post write, they are renewed every MAX_AGE seconds (VERSIONED_CACHE setting)
+
+    Params:
+        - user_id: primary key of author
+        - delta: number of created posts, negative for deleted posts
+    """
+    if not delta:
+        return
+    User.objects.filter(pk=user_id).update(
+        post_count=F('post_count') + delta,
+        feed_pull=Case(
+            When(post_count__gte=settings.FEED_PULL_MIN_POSTS - delta, then=Value(True)), default=F('feed_pull')
+        ),
+    )
+
+
+def delete_posts(queryset: QuerySet[Post], user_id: int) -> int:
+    """
+    Function to delete posts of one user and decrease user's post_count in one transaction.
+    With POSTS_SOFT_DELETE posts are marked deleted by one UPDATE, tombstones and their feed entries are removed
+    later by purge task of background workers (posts.purge). Otherwise posts are deleted with their feed entries
+
+    Params:
+        - queryset: posts of user to delete
+        - user_id: primary key of author
+
+    Returns:
+        - number of deleted posts
+    """
+    with transaction.atomic():
+        if settings.POSTS_SOFT_DELETE:
+            deleted: int = queryset.update(is_deleted=True, deleted_at=timezone.now())
+        else:
+            FeedEntry.objects.filter(post__in=queryset).delete()
+            _, deleted_by_model = queryset.delete()
+            deleted = deleted_by_model.get(Post._meta.label, 0)
+        change_post_count(user_id, -deleted)
+    return deleted
+
+
+def create_post(**fields: object) -> Post:
+    """
+    Function to create post, increase author's post_count and queue adding post to feeds of followers
+    in one transaction
+
+    Params:
+        - fields: fields of post, including user
+
+    Returns:
+        - created post
+    """
+    with transaction.atomic():
+        post: Post = Post.objects.create(**fields)
+        change_post_count(post.user_id, 1)
+        enqueue(fan_out, post.user_id, [post.pk])
+    return post
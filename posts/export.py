@@ -0,0 +1,55 @@
+import json
+from itertools import islice
+from typing import Iterable, Iterator
+
+
+# ----------------------------------------------------------------
+def _batches(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """
+    Function to split iterable into lists of fixed size without materializing it
+
+    Params:
+        - items: iterable of items
+        - size: number of items in one list
+
+    Returns:
+        - iterator of lists
+    """
+    iterator: Iterator[dict] = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# ----------------------------------------------------------------
+def stream_ndjson(items: Iterable[dict], chunk_size: int) -> Iterator[bytes]:
+    """
+    Function to encode items as newline delimited JSON, one chunk of output per batch of items
+
+    Params:
+        - items: iterable of serialized items
+        - chunk_size: number of items in one chunk of output
+
+    Returns:
+        - iterator of bytes
+    """
+    for batch in _batches(items, chunk_size):
+        yield ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in batch).encode()
+
+
+# ----------------------------------------------------------------
+def stream_json_array(items: Iterable[dict], chunk_size: int) -> Iterator[bytes]:
+    """
+    Function to encode items as one JSON array, one chunk of output per batch of items
+
+    Params:
+        - items: iterable of serialized items
+        - chunk_size: number of items in one chunk of output
+
+    Returns:
+        - iterator of bytes
+    """
+    separator: str = '['
+    for batch in _batches(items, chunk_size):
+        yield (separator + ','.join(json.dumps(item, ensure_ascii=False) for item in batch)).encode()
+        separator = ','
+    yield b'[]' if separator == '[' else b']'
@@ -0,0 +1,89 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models.constants import OnConflict
+
+from posts.models import FeedEntry, Post
+from users.models import Follow, User
+
+
+# ----------------------------------------------------------------
+# fan-out on write of posts into feeds of followers (FeedEntry). Posts of authors with feed_pull flag (set by
+# posts.counters once author has FEED_PULL_MIN_POSTS posts) are not copied, feed reads them from posts table
+def fan_out(author_id: int, post_ids: Iterable[int]) -> None:
+    """
+    Function to add new posts of author to feeds of all followers with one INSERT ... SELECT.
+    Queued as background task (tasks.queue) in transaction of the write, after post_count of author is changed
+
+    Params:
+        - author_id: primary key of author
+        - post_ids: primary keys of created posts
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    placeholders: str = ', '.join(['%s'] * len(post_ids))
+    _insert_entries(
+        f'SELECT follow.follower_id, post.id FROM {_table(Follow)} follow '
+        f'JOIN {_table(Post)} post ON post.user_id = follow.author_id '
+        f'JOIN {_table(User)} author ON author.id = follow.author_id '
+        f'WHERE follow.author_id = %s AND NOT author.feed_pull AND NOT post.is_deleted AND post.id IN ({placeholders})',
+        [author_id, *post_ids]
+    )
+
+
+def backfill(follower_id: int, author_id: int) -> None:
+    """
+    Function to add latest FEED_BACKFILL_POSTS posts of author to feed of new follower
+
+    Params:
+        - follower_id: primary key of follower
+        - author_id: primary key of followed author
+    """
+    _insert_entries(
+        f'SELECT %s, post.id FROM {_table(Post)} post '
+        f'JOIN {_table(User)} author ON author.id = post.user_id '
+        f'WHERE post.user_id = %s AND NOT author.feed_pull AND NOT post.is_deleted ORDER BY post.id DESC LIMIT %s',
+        [follower_id, author_id, settings.FEED_BACKFILL_POSTS]
+    )
+
+
+def remove_author(follower_id: int, author_id: int) -> None:
+    """
+    Function to remove posts of unfollowed author from feed of follower
+
+    Params:
+        - follower_id: primary key of follower
+        - author_id: primary key of unfollowed author
+    """
+    FeedEntry.objects.filter(owner_id=follower_id, post__user_id=author_id).delete()
+
+
+def get_pull_authors(user_id: int) -> list[int]:
+    """
+    Function to get followed authors whose posts are read from posts table
+
+    Params:
+        - user_id: primary key of feed owner
+
+    Returns:
+        - list of authors primary keys
+    """
+    return list(Follow.objects.filter(follower_id=user_id, author__feed_pull=True).values_list('author_id', flat=True))
+
+
+def _insert_entries(select_sql: str, params: list) -> None:
+    """Function to insert rows (owner_id, post_id) selected by query into feed table, existing rows are skipped"""
+    connection = connections[router.db_for_write(FeedEntry)]
+    ops = connection.ops
+    sql: str = (
+        f'{ops.insert_statement(on_conflict=OnConflict.IGNORE)} {_table(FeedEntry)} (owner_id, post_id) '
+        f'{select_sql} {ops.on_conflict_suffix_sql([], OnConflict.IGNORE, [], [])}'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _table(model: type) -> str:
+    return connections[router.db_for_write(model)].ops.quote_name(model._meta.db_table)
@@ -0,0 +1,204 @@
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bboom_test.authentication import user_cache
+from bboom_test.cache import LocMemLRUBackend
+from posts.cache import post_list_cache
+from posts.models import Post
+from users.cache import user_list_cache
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# tables which must never be read by sequential scan
+WATCHED_TABLES: tuple = ('posts_post', 'users_user')
+
+# statements worth explaining, transaction control and session writes are skipped
+EXPLAINED_STATEMENTS: tuple = ('SELECT', 'UPDATE', 'DELETE')
+
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+SQLITE_SEQ_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+# ----------------------------------------------------------------
+class Command(BaseCommand):
+    """
+    Command to replay requests of API and UI views as given user, run EXPLAIN on every ORM query they generate and
+    report sequential scans of posts and users tables.
+
+    Everything runs in one transaction which is rolled back, so replayed writes are not saved. Versioned caches
+    are replaced by empty process local ones during replay, so cached responses neither hide queries nor keep data
+    of rolled back transaction. On PostgreSQL sequential scans are disabled for the transaction, so a reported
+    Seq Scan means there is no usable index at all, not that planner preferred it for a small table
+    """
+    help: str = 'Replay queries of views, EXPLAIN them and report sequential scans of posts and users tables'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--user', help='username to replay requests as, defaults to user with the lowest id')
+        parser.add_argument(
+            '--fail-on-seq-scan', action='store_true', help='exit with error if any sequential scan is found'
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        user: User = self.get_user(options['user'])
+        post: Optional[Post] = Post.objects.filter(user=user).order_by('id').first()
+        if post is None:
+            raise CommandError(f'User {user.username} has no posts, nothing to replay')
+
+        seq_scans: int = 0
+        explained: int = 0
+        with self.isolated_caches(), transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for method, path, data, queries in self.replay(user, post):
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{method} {path}') + f' ({len(queries)} queries)')
+                for sql in queries:
+                    if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+                        continue
+                    explained += 1
+                    plan: list[str] = self.explain(sql)
+                    tables: list[str] = self.find_seq_scans(sql, plan)
+                    if tables:
+                        seq_scans += 1
+                        self.stdout.write(self.style.WARNING(f"  SEQ SCAN {', '.join(tables)}: {sql}"))
+                        self.stdout.write('\n'.join(f'    {line}' for line in plan))
+                    elif options['verbosity'] > 1:
+                        self.stdout.write(f'  OK {sql}')
+                        self.stdout.write('\n'.join(f'    {line}' for line in plan))
+            transaction.set_rollback(True)
+
+        summary: str = f'{explained} queries explained, {seq_scans} with sequential scans of ' \
+                       f'{", ".join(WATCHED_TABLES)}'
+        if seq_scans and options['fail_on_seq_scan']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.WARNING(summary) if seq_scans else self.style.SUCCESS(summary))
+
+    @staticmethod
+    def get_user(username: Optional[str]) -> User:
+        """
+        Method to get user to replay requests as
+
+        Params:
+            - username: username from command option
+
+        Returns:
+            - user
+
+        Raises:
+            - CommandError (in case of user not found)
+        """
+        queryset: Any = User.objects.order_by('id')
+        user: Optional[User] = queryset.filter(username=username).first() if username else queryset.first()
+        if user is None:
+            raise CommandError('User not found')
+        return user
+
+    @staticmethod
+    @contextmanager
+    def isolated_caches() -> Iterator[None]:
+        """
+        Context manager to replace backends of versioned caches and authenticated users cache by empty process local
+        ones, so bumps of rolled back writes do not reach caches of running processes
+        """
+        caches: tuple = (post_list_cache, user_list_cache, user_cache.versions, user_cache)
+        backends: list = [cache.backend for cache in caches]
+        for cache in caches:
+            cache.backend = LocMemLRUBackend({})
+        try:
+            yield
+        finally:
+            for cache, backend in zip(caches, backends):
+                cache.backend = backend
+
+    @staticmethod
+    def replay(user: User, post: Post) -> Iterator[tuple[str, str, dict, list[str]]]:
+        """
+        Generator to make requests to views and capture queries made by them
+
+        Params:
+            - user: user to make requests as
+            - post: one of posts of user, its title is used as search and filter criteria
+
+        Returns:
+            - tuples (method, path, data, list of SQL queries)
+        """
+        api_client: Client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        ui_client: Client = Client()
+        ui_client.force_login(user)
+        word: str = post.title.split()[0] if post.title.split() else post.title
+
+        # (client, method, path, data, follow link to next page)
+        requests: list[tuple[Client, str, str, dict, bool]] = [
+            (api_client, 'get', '/api/users/list/', {'page_size': 1}, True),
+            (api_client, 'get', '/api/posts/list/', {'page_size': 1}, True),
+            (api_client, 'get', '/api/posts/export/', {}, False),
+            (api_client, 'get', '/api/posts/feed/', {'page_size': 1}, True),
+            (api_client, 'get', '/api/posts/search/', {'q': word, 'scope': 'mine'}, False),
+            (api_client, 'get', '/api/posts/search/', {'q': word, 'scope': 'all'}, False),
+            (ui_client, 'get', '/ui/user_list/', {}, False),
+            (ui_client, 'get', f'/ui/posts/{user.pk}/', {}, False),
+            (api_client, 'post', '/api/posts/bulk/delete/', {'title': post.title}, False),
+        ]
+        for client, method, path, data, follow_next in requests:
+            with CaptureQueriesContext(connection) as context:
+                response: Any = getattr(client, method)(path, data)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                if follow_next and response.json().get('next'):
+                    client.get(response.json()['next'])
+            yield method.upper(), path, data, [query['sql'] for query in context.captured_queries]
+
+    @staticmethod
+    def explain(sql: str) -> list[str]:
+        """
+        Method to get query plan of query
+
+        Params:
+            - sql: query with interpolated params
+
+        Returns:
+            - lines of query plan
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+            return [str(row[-1]) for row in cursor.fetchall()]
+
+    @staticmethod
+    def find_seq_scans(sql: str, plan: list[str]) -> list[str]:
+        """
+        Method to find watched tables read by sequential scan in query plan.
+        SQLite tables are clustered by rowid, so a scan returning rows in requested order (no temp B-tree for
+        ORDER BY) and stopped by LIMIT reads only first rows of the table and is not reported
+
+        Params:
+            - sql: explained query, used to resolve table aliases
+            - plan: lines of query plan
+
+        Returns:
+            - list of table names
+        """
+        if connection.vendor == 'postgresql':
+            pattern: re.Pattern = POSTGRES_SEQ_SCAN
+        else:
+            pattern = SQLITE_SEQ_SCAN
+            if re.search(r'\bLIMIT \d+', sql) and not any('TEMP B-TREE FOR ORDER BY' in line for line in plan):
+                return []
+        tables: list[str] = []
+        for line in plan:
+            match: Optional[re.Match] = pattern.search(line.strip())
+            if match is None:
+                continue
+            name: str = match.group(1)
+            alias: Optional[re.Match] = re.search(rf'"(\w+)" {name}\b', sql)
+            table: str = alias.group(1) if alias else name
+            if table in WATCHED_TABLES and table not in tables:
+                tables.append(table)
+        return tables
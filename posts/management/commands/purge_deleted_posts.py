@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from posts.purge import purge_batch
+
+
+# ----------------------------------------------------------------
+class Command(BaseCommand):
+    """
+    Command to remove soft deleted posts (tombstones) at once, they are also removed periodically by recurring task
+    posts.purge.purge_deleted_posts run by run_workers.
+
+    Tombstones deleted more than --older-than seconds ago are removed oldest first, found by post_deleted_at_idx
+    partial index. Every batch of --batch-size posts is one short transaction removing posts with their feed entries,
+    command sleeps --sleep seconds between batches to limit load of database and replication
+    """
+    help: str = 'Remove soft deleted posts by small batches'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.POSTS_PURGE['BATCH_SIZE'],
+            help='number of posts removed per transaction'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=settings.POSTS_PURGE['SLEEP'], help='seconds to sleep between batches'
+        )
+        parser.add_argument(
+            '--older-than', type=float, default=settings.POSTS_PURGE['OLDER_THAN'],
+            help='remove posts deleted more than given seconds ago'
+        )
+        parser.add_argument('--max-batches', type=int, default=None, help='stop after given number of batches')
+
+    def handle(self, *args: tuple, **options: Any) -> None:
+        batch_size: int = options['batch_size']
+        max_batches: Optional[int] = options['max_batches']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        deleted_before: Any = timezone.now() - timedelta(seconds=options['older_than'])
+
+        purged: int = 0
+        batches: int = 0
+        while max_batches is None or batches < max_batches:
+            batch: int = purge_batch(deleted_before, batch_size)
+            purged += batch
+            batches += 1
+            if batch < batch_size:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} deleted posts'))
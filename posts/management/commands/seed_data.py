@@ -0,0 +1,196 @@
+import io
+import multiprocessing
+import time
+from typing import Any, Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from posts.models import Post
+from users.cache import user_list_cache, USERS_SCOPE
+from users.models import User
+
+
+# ----------------------------------------------------------------
+POST_BODY: str = 'Seeded post body. ' * 10
+
+
+# ----------------------------------------------------------------
+class Command(BaseCommand):
+    """
+    Command to seed users and posts for load tests.
+
+    Users and posts are inserted by batched bulk_create, or by COPY on PostgreSQL. All users share one password hash
+    computed once. Users are split into tasks of about --batch-size posts, tasks run in parallel worker processes,
+    every task is one transaction. SQLite allows only one writer, so there tasks run in one process.
+    Users are inserted with their final post_count and feed_pull flag. Signals are not sent,
+    cached users list is invalidated at the end
+    """
+    help: str = 'Seed users and posts for load tests'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--users', type=int, required=True, help='number of users to create')
+        parser.add_argument('--posts-per-user', type=int, default=10, help='number of posts of every user')
+        parser.add_argument(
+            '--workers', type=int, default=multiprocessing.cpu_count(), help='number of worker processes'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help='number of rows per insert')
+        parser.add_argument('--prefix', default='seed_', help='prefix of usernames, must not be used yet')
+        parser.add_argument('--password', default='password', help='password of all users')
+        parser.add_argument(
+            '--method', choices=['auto', 'bulk', 'copy'], default='auto',
+            help='insert method, auto is copy on PostgreSQL and bulk otherwise'
+        )
+
+    def handle(self, *args: tuple, **options: Any) -> None:
+        users: int = options['users']
+        posts_per_user: int = options['posts_per_user']
+        batch_size: int = options['batch_size']
+        prefix: str = options['prefix']
+        method: str = options['method']
+        if users < 1 or posts_per_user < 0 or batch_size < 1:
+            raise CommandError('--users and --batch-size must be positive, --posts-per-user must not be negative')
+        if method == 'auto':
+            method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+        if method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY is supported only on PostgreSQL')
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Users with prefix {prefix!r} already exist, use another --prefix')
+
+        workers: int = options['workers']
+        if connection.vendor == 'sqlite' or 'fork' not in multiprocessing.get_all_start_methods():
+            workers = 1
+
+        users_per_task: int = max(1, min(batch_size, batch_size // max(posts_per_user, 1)))
+        password: str = make_password(options['password'])
+        tasks: list[tuple] = [
+            (start, min(start + users_per_task, users), posts_per_user, batch_size, prefix, password, method)
+            for start in range(0, users, users_per_task)
+        ]
+
+        started: float = time.monotonic()
+        created_users: int = 0
+        created_posts: int = 0
+        for task_users, task_posts in self.run_tasks(tasks, workers):
+            created_users += task_users
+            created_posts += task_posts
+            self.stdout.write(f'{created_users}/{users} users, {created_posts} posts')
+        user_list_cache.bump(USERS_SCOPE)
+
+        elapsed: float = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created_users} users and {created_posts} posts in {elapsed:.1f} s '
+            f'({created_posts / elapsed:.0f} posts/s, {workers} workers, {method})'
+        ))
+
+    @staticmethod
+    def run_tasks(tasks: list[tuple], workers: int) -> Iterator[tuple[int, int]]:
+        """
+        Generator to run tasks in current process or in pool of forked worker processes
+
+        Params:
+            - tasks: arguments of seed_users
+            - workers: number of worker processes
+
+        Returns:
+            - tuples (created users, created posts) in order of completion
+        """
+        if workers == 1:
+            for task in tasks:
+                yield seed_users(task)
+            return
+        # forked workers must not share connections of parent
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            yield from pool.imap_unordered(seed_users, tasks)
+
+
+# ----------------------------------------------------------------
+def seed_users(task: tuple) -> tuple[int, int]:
+    """
+    Function to create users with numbers in [start, stop) and their posts in one transaction
+
+    Params:
+        - task: tuple (start, stop, posts per user, batch size, username prefix, password hash, method)
+
+    Returns:
+        - tuple (created users, created posts)
+    """
+    start, stop, posts_per_user, batch_size, prefix, password, method = task
+    now: Any = timezone.now()
+    usernames: list[str] = [f'{prefix}{number}' for number in range(start, stop)]
+    feed_pull: bool = posts_per_user >= settings.FEED_PULL_MIN_POSTS
+
+    with transaction.atomic():
+        if method == 'copy':
+            copy_rows(
+                'users_user', ('password', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff',
+                               'is_active', 'date_joined', 'post_count', 'feed_pull'),
+                ((password, False, username, '', '', '', False, True, now, posts_per_user, feed_pull)
+                 for username in usernames)
+            )
+            user_ids: list[int] = list(
+                User.objects.filter(username__in=usernames).order_by('id').values_list('id', flat=True)
+            )
+        else:
+            user_ids = [user.pk for user in User.objects.bulk_create(
+                User(username=username, password=password, date_joined=now, post_count=posts_per_user,
+                     feed_pull=feed_pull)
+                for username in usernames
+            )]
+
+        posts: Iterable[tuple] = (
+            (user_id, f'Post {number} of user {user_id}', POST_BODY, now, now)
+            for user_id in user_ids for number in range(posts_per_user)
+        )
+        if method == 'copy':
+            copy_rows(
+                'posts_post', ('user_id', 'title', 'body', 'created_at', 'updated_at', 'is_deleted'),
+                (row + (False,) for row in posts)
+            )
+        else:
+            Post.objects.bulk_create(
+                (Post(user_id=user_id, title=title, body=body, created_at=created_at, updated_at=updated_at)
+                 for user_id, title, body, created_at, updated_at in posts),
+                batch_size=batch_size
+            )
+    return len(user_ids), len(user_ids) * posts_per_user
+
+
+def copy_rows(table: str, columns: tuple, rows: Iterable[tuple]) -> None:
+    """
+    Function to insert rows by PostgreSQL COPY in text format
+
+    Params:
+        - table: table name
+        - columns: column names
+        - rows: tuples of values in order of columns
+    """
+    buffer: io.StringIO = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(copy_value(value) for value in row) + '\n')
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def copy_value(value: Any) -> str:
+    """
+    Function to format value for COPY text format
+
+    Params:
+        - value: python value
+
+    Returns:
+        - escaped text
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:58
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# search_vector is computed by trigger on every insert/update of title or body, 'simple' text search configuration
+# must match posts.search.SEARCH_CONFIG. SQLite uses FTS5 table installed by posts.search.install_search instead
+POSTGRES_FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION posts_post_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.body, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER posts_post_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, body ON posts_post
+    FOR EACH ROW EXECUTE PROCEDURE posts_post_search_vector_update()
+    """,
+    """
+    UPDATE posts_post SET search_vector =
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    """,
+    'CREATE INDEX post_search_vector_idx ON posts_post USING gin (search_vector)',
+]
+
+POSTGRES_REVERSE_SQL = [
+    'DROP INDEX IF EXISTS post_search_vector_idx',
+    'DROP TRIGGER IF EXISTS posts_post_search_vector_trigger ON posts_post',
+    'DROP FUNCTION IF EXISTS posts_post_search_vector_update()',
+]
+
+
+def install_postgres_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_FORWARD_SQL:
+            schema_editor.execute(sql)
+
+
+def uninstall_postgres_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_REVERSE_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_user_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunPython(install_postgres_search, uninstall_postgres_search),
+    ]
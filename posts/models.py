@@ -1,8 +1,26 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
+# ----------------------------------------------------------------
+class PostManager(models.Manager):
+    """
+    Default manager of posts hiding soft deleted posts. Indexes of posts are partial and cover live posts only
+    """
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(is_deleted=False)
+
+
 # ----------------------------------------------------------------
 class Post(models.Model):
+    """
+    Model representing post. Deleted posts are kept as tombstones (is_deleted) until
+    they are purged (posts.purge), they are hidden by default manager
+
+    Attrs:
+        - objects: default manager of live posts
+        - all_objects: manager of all posts including tombstones
+    """
     user = models.ForeignKey(
         'users.User',
         on_delete=models.CASCADE,
@@ -16,6 +34,32 @@ class Post(models.Model):
         max_length=1000,
         verbose_name='Содержание'
     )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='Поисковый вектор'
+    )
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Удален'
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        editable=False,
+        verbose_name='Дата удаления'
+    )
+
+    objects = PostManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.title
@@ -23,3 +67,39 @@ class Post(models.Model):
     class Meta:
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+        indexes = [
+            models.Index(fields=['user', 'id'], name='post_user_id_idx', condition=models.Q(is_deleted=False)),
+            models.Index(fields=['title'], name='post_title_idx', condition=models.Q(is_deleted=False)),
+            models.Index(fields=['deleted_at'], name='post_deleted_at_idx', condition=models.Q(is_deleted=True)),
+        ]
+
+
+# ----------------------------------------------------------------
+class FeedEntry(models.Model):
+    """
+    Model representing post in feed of user following its author, rows are inserted when post is created
+    (posts.feed). Feed of user is read by one range scan of (owner, post) index.
+    Entries are removed with their posts by posts.counters.delete_posts, there is no foreign key constraint on post,
+    so posts are still deleted with one query. Feed skips entries of posts deleted otherwise, e.g. with author
+    """
+    owner = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+        verbose_name='Владелец ленты'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='feed_entries',
+        verbose_name='Пост'
+    )
+
+    class Meta:
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='feed_entry_owner_post_uniq'),
+        ]
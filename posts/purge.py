@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from posts.models import FeedEntry, Post
+from tasks.queue import enqueue_at
+
+
+# ----------------------------------------------------------------
+# removal of soft deleted posts (tombstones). Tombstones are removed oldest first, found by post_deleted_at_idx
+# partial index, every batch is one short transaction removing posts with their feed entries
+def purge_batch(deleted_before: datetime, batch_size: int) -> int:
+    """
+    Function to remove batch of tombstones
+
+    Params:
+        - deleted_before: only posts deleted before this time are removed
+        - batch_size: number of removed posts
+
+    Returns:
+        - number of removed posts, less than batch_size if there are no more tombstones to remove
+    """
+    with transaction.atomic():
+        post_ids: list[int] = list(
+            Post.all_objects.filter(is_deleted=True, deleted_at__lt=deleted_before)
+            .order_by('deleted_at').values_list('pk', flat=True)[:batch_size]
+        )
+        FeedEntry.objects.filter(post_id__in=post_ids).delete()
+        Post.all_objects.filter(pk__in=post_ids).delete()
+    return len(post_ids)
+
+
+def purge_deleted_posts() -> None:
+    """
+    Recurring task (tasks.queue, TASKS['RECURRING'] setting) to remove tombstones deleted more than
+    POSTS_PURGE['OLDER_THAN'] seconds ago. Every run removes one batch and queues the next run: in POSTS_PURGE['SLEEP']
+    seconds while there are more tombstones, otherwise in POSTS_PURGE['INTERVAL'] seconds
+    """
+    options: dict = settings.POSTS_PURGE
+    purged: int = purge_batch(timezone.now() - timedelta(seconds=options['OLDER_THAN']), options['BATCH_SIZE'])
+    delay: float = options['SLEEP'] if purged == options['BATCH_SIZE'] else options['INTERVAL']
+    enqueue_at(timezone.now() + timedelta(seconds=delay), purge_deleted_posts)
@@ -0,0 +1,143 @@
+from typing import Any
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, QuerySet, Value, FloatField, Q
+
+
+# ----------------------------------------------------------------
+# text search configuration, must match configuration used by trigger in migration 0004_post_search_vector
+SEARCH_CONFIG: str = 'simple'
+
+# weights of title and body columns in SQLite bm25 ranking, PostgreSQL uses setweight A/B in trigger
+SQLITE_FTS_WEIGHTS: tuple = (10.0, 1.0)
+
+
+# ----------------------------------------------------------------
+class PostgresSearchBackend:
+    """
+    Search backend using Post.search_vector column with GIN index. The column is filled by database trigger
+    on every insert and update of title or body, so all write paths (including bulk_create) keep it up to date
+    """
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Method to filter posts by query and annotate them with rank, higher rank means better match
+
+        Params:
+            - queryset: posts queryset
+            - query: search query in websearch syntax
+
+        Returns:
+            - QuerySet ordered by rank
+        """
+        search_query: SearchQuery = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+        return queryset.filter(search_vector=search_query).annotate(
+            rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-rank', '-id')
+
+    @staticmethod
+    def install(connection: Any) -> None:
+        """Trigger and GIN index are created by migration"""
+
+
+# ----------------------------------------------------------------
+class SQLiteSearchBackend:
+    """
+    Search backend using external content FTS5 table posts_post_fts kept in sync with posts_post by triggers.
+    SQLite drops triggers when migrations rebuild posts_post table, so they are (re)installed after every migrate
+    """
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Method to filter posts by query and annotate them with rank, higher rank means better match
+
+        Params:
+            - queryset: posts queryset
+            - query: search query, every word must be present
+
+        Returns:
+            - QuerySet ordered by rank
+        """
+        match: str = ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+        weights: str = ', '.join(str(weight) for weight in SQLITE_FTS_WEIGHTS)
+        return queryset.extra(
+            select={'rank': f'-bm25(posts_post_fts, {weights})'},
+            tables=['posts_post_fts'],
+            where=['posts_post_fts.rowid = posts_post.id', 'posts_post_fts MATCH %s'],
+            params=[match],
+        ).order_by('-rank', '-id')
+
+    @staticmethod
+    def install(connection: Any) -> None:
+        """
+        Method to create FTS5 table and sync triggers if not exist and rebuild full text index
+
+        Params:
+            - connection: database connection
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS posts_post_fts "
+                "USING fts5(title, body, content='posts_post', content_rowid='id')"
+            )
+            cursor.execute(
+                "CREATE TRIGGER IF NOT EXISTS posts_post_fts_insert AFTER INSERT ON posts_post BEGIN "
+                "INSERT INTO posts_post_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+            )
+            cursor.execute(
+                "CREATE TRIGGER IF NOT EXISTS posts_post_fts_delete AFTER DELETE ON posts_post BEGIN "
+                "INSERT INTO posts_post_fts(posts_post_fts, rowid, title, body) "
+                "VALUES ('delete', old.id, old.title, old.body); END"
+            )
+            cursor.execute(
+                "CREATE TRIGGER IF NOT EXISTS posts_post_fts_update AFTER UPDATE OF title, body ON posts_post BEGIN "
+                "INSERT INTO posts_post_fts(posts_post_fts, rowid, title, body) "
+                "VALUES ('delete', old.id, old.title, old.body); "
+                "INSERT INTO posts_post_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+            )
+            cursor.execute("INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')")
+
+
+# ----------------------------------------------------------------
+class ContainsSearchBackend:
+    """Fallback search backend for other databases, makes sequential scan"""
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        return queryset.filter(Q(title__icontains=query) | Q(body__icontains=query)).annotate(
+            rank=Value(0.0, output_field=FloatField())
+        ).order_by('-id')
+
+    @staticmethod
+    def install(connection: Any) -> None:
+        """Nothing to install"""
+
+
+# ----------------------------------------------------------------
+SEARCH_BACKENDS: dict[str, Any] = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(using: str = 'default') -> Any:
+    """
+    Function to get search backend for database vendor
+
+    Params:
+        - using: database alias
+
+    Returns:
+        - search backend instance
+    """
+    return SEARCH_BACKENDS.get(connections[using].vendor, ContainsSearchBackend)()
+
+
+def install_search(using: str = 'default', **kwargs: dict) -> None:
+    """
+    post_migrate receiver to install database objects of search backend
+
+    Params:
+        - using: database alias
+    """
+    connection: Any = connections[using]
+    if 'posts_post' not in connection.introspection.table_names():
+        return
+    SEARCH_BACKENDS.get(connection.vendor, ContainsSearchBackend).install(connection)
@@ -1,8 +1,15 @@
-from typing import Type
+from collections import defaultdict
+from typing import Any, Optional, Type
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, QuerySet, Value
 from rest_framework import serializers
 
+from posts.counters import change_post_count
+from posts.feed import fan_out
 from posts.models import Post
+from tasks.queue import enqueue
 
 
 # ----------------------------------------------------------------
@@ -20,6 +27,51 @@ class PostBaseSerializer(serializers.ModelSerializer):
         fields: tuple = ('id', 'user', 'title', 'body')
 
 
+# ----------------------------------------------------------------
+class PostBulkCreateSerializer(serializers.ListSerializer):
+    """
+    List serializer used by PostCreateSerializer(many=True) to insert posts with batched bulk_create
+    """
+    def validate(self, attrs: list) -> list:
+        """
+        Redefined method to limit number of posts in one request
+
+        Params:
+            - attrs: list of validated posts
+
+        Returns:
+            - attrs: list of validated posts
+
+        Raises:
+            - ValidationError (in case of too many posts)
+        """
+        if len(attrs) > settings.POSTS_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(f'Ensure this list has no more than {settings.POSTS_BULK_MAX_ITEMS} posts')
+        return attrs
+
+    def create(self, validated_data: list) -> list[Post]:
+        """
+        Redefined create method to insert all posts by batches, increase post counts of their authors
+        and queue adding posts to feeds of followers in one transaction
+
+        Params:
+            - validated_data: list of dicts with validated data of Post instances
+
+        Returns:
+            - list of created posts with ids
+        """
+        posts: list[Post] = [Post(**item) for item in validated_data]
+        with transaction.atomic():
+            posts = Post.objects.bulk_create(posts, batch_size=settings.POSTS_BULK_CREATE_BATCH_SIZE)
+            posts_by_user: dict[int, list[int]] = defaultdict(list)
+            for post in posts:
+                posts_by_user[post.user_id].append(post.pk)
+            for user_id, post_ids in posts_by_user.items():
+                change_post_count(user_id, len(post_ids))
+                enqueue(fan_out, user_id, post_ids)
+        return posts
+
+
 # ----------------------------------------------------------------
 class PostCreateSerializer(PostBaseSerializer):
     """
@@ -30,3 +82,97 @@ class PostCreateSerializer(PostBaseSerializer):
     """
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
+    class Meta(PostBaseSerializer.Meta):
+        list_serializer_class: Type[serializers.ListSerializer] = PostBulkCreateSerializer
+
+
+# ----------------------------------------------------------------
+class PostBulkDeleteSerializer(serializers.Serializer):
+    """
+    Serializer of criteria to delete posts of current user. At least one criterion is required,
+    all given criteria are combined with AND
+
+    Attrs:
+        - ids: list of posts ids
+        - title: exact title of posts
+        - title_contains: substring of title of posts
+        - body_contains: substring of body of posts
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    title = serializers.CharField(required=False)
+    title_contains = serializers.CharField(required=False)
+    body_contains = serializers.CharField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Redefined method to forbid deletion without criteria
+
+        Params:
+            - attrs: dictionary with validated criteria
+
+        Returns:
+            - attrs: dictionary with validated criteria
+
+        Raises:
+            - ValidationError (in case of no criteria or too many ids)
+        """
+        if not attrs:
+            raise serializers.ValidationError('At least one of ids, title, title_contains, body_contains is required')
+        if len(attrs.get('ids', [])) > settings.POSTS_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(f'Ensure ids has no more than {settings.POSTS_BULK_MAX_ITEMS} items')
+        return attrs
+
+    def filter_queryset(self, queryset: QuerySet[Post]) -> QuerySet[Post]:
+        """
+        Method to apply validated criteria to posts queryset
+
+        Params:
+            - queryset: posts queryset
+
+        Returns:
+            - filtered queryset
+        """
+        lookups: dict[str, str] = {
+            'ids': 'id__in',
+            'title': 'title',
+            'title_contains': 'title__contains',
+            'body_contains': 'body__contains',
+        }
+        return queryset.filter(**{lookups[name]: value for name, value in self.validated_data.items()})
+
+
+# ----------------------------------------------------------------
+class PostFastSerializer(serializers.BaseSerializer):
+    """
+    Read-only post serializer working on rows from QuerySet.values() instead of model instances.
+    Produces the same payload as PostBaseSerializer without per-field ModelSerializer overhead
+    and without lazy loading of post author
+
+    Attrs:
+        - values_fields: defines post columns selected for every row
+    """
+    values_fields: tuple = ('id', 'title', 'body')
+
+    @classmethod
+    def get_rows(cls, queryset: QuerySet, username: Optional[str] = None, extra_fields: tuple = ()) -> QuerySet:
+        """
+        Method to turn posts queryset into rows to serialize in one query
+
+        Params:
+            - queryset: posts queryset
+            - username: username of posts author if all posts belong to one user, no join is made in this case
+            - extra_fields: additional columns or annotations to keep in rows
+
+        Returns:
+            - QuerySet of dicts
+        """
+        author: Any = Value(username) if username is not None else F('user__username')
+        return queryset.values(*cls.values_fields, *extra_fields, username=author)
+
+    def to_representation(self, instance: dict) -> dict:
+        return {
+            'id': instance['id'],
+            'user': instance['username'],
+            'title': instance['title'],
+            'body': instance['body'],
+        }
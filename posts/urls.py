@@ -1,11 +1,23 @@
 from django.urls import path
 
-from posts.views import PostCreateView, PostListView, PostDeleteView
+from posts import async_views
+from posts.views import (
+    PostCreateView, PostListView, PostDeleteView, PostBulkCreateView, PostBulkDeleteView, PostExportView,
+    PostSearchView, PostFeedView
+)
 
 # ----------------------------------------------------------------
 # urlpatterns
 urlpatterns = [
     path('create/', PostCreateView.as_view()),
+    path('bulk/', PostBulkCreateView.as_view()),
+    path('bulk/delete/', PostBulkDeleteView.as_view()),
     path('list/', PostListView.as_view()),
+    path('export/', PostExportView.as_view()),
+    path('search/', PostSearchView.as_view()),
+    path('feed/', PostFeedView.as_view()),
     path('<int:pk>/', PostDeleteView.as_view()),
+    path('async/create/', async_views.post_create),
+    path('async/list/', async_views.post_list),
+    path('async/<int:pk>/', async_views.post_delete),
 ]
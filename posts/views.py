@@ -1,12 +1,31 @@
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
 from django.db.models import QuerySet
-from drf_spectacular.utils import extend_schema
-from rest_framework.generics import CreateAPIView, ListAPIView, DestroyAPIView
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, inline_serializer, OpenApiParameter
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import CreateAPIView, ListAPIView, DestroyAPIView, GenericAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from bboom_test.cache import versioned_condition
+from bboom_test.pagination import IdCursorPagination, NewestFirstCursorPagination, RankedPagination
+from bboom_test.routers import read_from_replica
+from posts.cache import post_list_cache
+from posts.counters import change_post_count, delete_posts
+from posts.export import stream_ndjson, stream_json_array
+from posts.feed import fan_out, get_pull_authors
 from posts.models import Post
-from posts.serializers import PostCreateSerializer, PostBaseSerializer
+from posts.search import get_search_backend
+from posts.serializers import PostCreateSerializer, PostBaseSerializer, PostFastSerializer, PostBulkDeleteSerializer
+from tasks.queue import enqueue
 
 
 # ----------------------------------------------------------------
@@ -22,6 +41,20 @@ class PostCreateView(CreateAPIView):
     permission_classes: list = [IsAuthenticated]
     serializer_class = PostCreateSerializer
 
+    def perform_create(self, serializer: PostCreateSerializer) -> None:
+        """
+        Redefined method to save post, increase post count of its author, queue adding post to feeds of followers
+        and invalidate cached posts lists of author
+
+        Params:
+            - serializer: validated serializer
+        """
+        with transaction.atomic():
+            super().perform_create(serializer)
+            change_post_count(self.request.user.pk, 1)
+            enqueue(fan_out, self.request.user.pk, [serializer.instance.pk])
+        post_list_cache.bump(self.request.user.pk)
+
     @extend_schema(
         description="Create new post instance",
         summary="Create post",
@@ -30,6 +63,48 @@ class PostCreateView(CreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
+# ----------------------------------------------------------------
+@extend_schema(tags=['Post'])
+class PostBulkCreateView(CreateAPIView):
+    """
+    View to handle POST request to create list of posts in one transaction
+
+    Attrs:
+        - permission_classes: defines permissions for this APIView
+        - serializer_class: defines serializer class for this APIView, used with many=True
+    """
+    permission_classes: list = [IsAuthenticated]
+    serializer_class = PostCreateSerializer
+
+    def get_serializer(self, *args: tuple, **kwargs: dict) -> PostCreateSerializer:
+        """
+        Redefined method to validate list of posts
+
+        Returns:
+            - list serializer of posts
+        """
+        return super().get_serializer(*args, many=True, allow_empty=False, **kwargs)
+
+    def perform_create(self, serializer: PostCreateSerializer) -> None:
+        """
+        Redefined method to save posts and invalidate cached posts lists of their author
+
+        Params:
+            - serializer: validated list serializer
+        """
+        super().perform_create(serializer)
+        post_list_cache.bump(self.request.user.pk)
+
+    @extend_schema(
+        description="Create list of posts in one request, response contains created posts with ids in request order",
+        summary="Bulk create posts",
+        request=PostCreateSerializer(many=True),
+        responses=PostCreateSerializer(many=True),
+    )
+    def post(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        return super().post(request, *args, **kwargs)
+
+
 # ----------------------------------------------------------------
 @extend_schema(tags=['Post'])
 class PostListView(ListAPIView):
@@ -39,22 +114,171 @@ class PostListView(ListAPIView):
     Attrs:
         - permission_classes: defines permissions for this APIView
         - serializer_class: defines serializer class for this APIView
+        - pagination_class: defines keyset pagination class for this APIView
     """
     permission_classes: list = [IsAuthenticated]
-    serializer_class = PostBaseSerializer
+    serializer_class = PostFastSerializer
+    pagination_class = IdCursorPagination
 
-    def get_queryset(self) -> QuerySet[Post]:
+    def get_queryset(self) -> QuerySet[dict]:
         """
-        Method to define queryset to get posts by some filters
+        Method to define queryset to get posts by some filters. All posts belong to current user,
+        so author's username is taken from request user and posts are fetched in one query without join
 
         Returns:
             - QuerySet
         """
-        return Post.objects.filter(user=self.request.user)
+        return PostFastSerializer.get_rows(
+            Post.objects.filter(user=self.request.user),
+            username=self.request.user.username
+        )
+
+    def list(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        Redefined method to serve posts page from per user versioned cache, database is queried only on cache miss
+
+        Params:
+            - request: defines current request
+
+        Returns:
+            - Response with page of posts
+        """
+        data: dict = post_list_cache.get_or_set(
+            request.user.pk,
+            request.build_absolute_uri(),
+            lambda: super(PostListView, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
 
     @extend_schema(
-        description="Get list of posts",
+        description="Get list of posts. Supports conditional requests with If-None-Match / If-Modified-Since",
         summary="Posts list",
+        responses=PostBaseSerializer,
+    )
+    @method_decorator(versioned_condition(
+        post_list_cache,
+        lambda request, *args, **kwargs: request.user.pk,
+        lambda request, *args, **kwargs: [request.build_absolute_uri()],
+    ))
+    @method_decorator(read_from_replica(post_list_cache, lambda request, *args, **kwargs: request.user.pk))
+    def get(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        return super().get(request, *args, **kwargs)
+
+
+# ----------------------------------------------------------------
+@extend_schema(tags=['Post'])
+class PostFeedView(ListAPIView):
+    """
+    View to handle GET request to get feed of posts of followed authors, newest first.
+    Feed is read by one range scan of feed entries of current user (posts.feed). Posts of followed authors with
+    feed_pull flag are not in feed entries, they are read from posts table with the same cursor and merged
+
+    Attrs:
+        - permission_classes: defines permissions for this APIView
+        - serializer_class: defines serializer class for this APIView
+        - pagination_class: defines keyset pagination class for this APIView
+    """
+    permission_classes: list = [IsAuthenticated]
+    serializer_class = PostFastSerializer
+    pagination_class = NewestFirstCursorPagination
+
+    def get_queryset(self) -> QuerySet[dict]:
+        """
+        Method to define queryset of posts in feed entries of current user
+
+        Returns:
+            - QuerySet
+        """
+        return PostFastSerializer.get_rows(Post.objects.filter(feed_entries__owner=self.request.user))
+
+    def paginate_queryset(self, queryset: QuerySet[dict]) -> Optional[list]:
+        """
+        Redefined method to merge page of feed entries with page of posts of followed pull authors
+
+        Params:
+            - queryset: posts in feed entries of current user
+
+        Returns:
+            - list of posts of current page
+        """
+        paginator: NewestFirstCursorPagination = self.paginator
+        page_queryset: Optional[QuerySet[dict]] = paginator.get_page_queryset(queryset, self.request, self)
+        if page_queryset is None:
+            return None
+        rows: list[dict] = list(page_queryset)
+
+        pull_authors: list[int] = get_pull_authors(self.request.user.pk)
+        if pull_authors:
+            pulled: QuerySet[dict] = paginator.get_page_queryset(
+                PostFastSerializer.get_rows(Post.objects.filter(user_id__in=pull_authors)), self.request, self
+            )
+            # posts written before author got feed_pull flag may be in both
+            unique_rows: dict[int, dict] = {row['id']: row for row in (*rows, *pulled)}
+            rows = sorted(unique_rows.values(), key=lambda row: row['id'], reverse=not paginator.reverse)
+            rows = rows[:paginator.page_size + 1]
+        return paginator.set_page(rows)
+
+    @extend_schema(
+        description="Get feed of posts of followed authors, newest first",
+        summary="Posts feed",
+        responses=PostBaseSerializer,
+    )
+    def get(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        return super().get(request, *args, **kwargs)
+
+
+# ----------------------------------------------------------------
+@extend_schema(tags=['Post'])
+class PostSearchView(ListAPIView):
+    """
+    View to handle GET request to search posts by title and body with full text index.
+    Results are ordered by relevance
+
+    Attrs:
+        - permission_classes: defines permissions for this APIView
+        - serializer_class: defines serializer class for this APIView
+        - pagination_class: defines page number pagination class for this APIView
+    """
+    permission_classes: list = [IsAuthenticated]
+    serializer_class = PostFastSerializer
+    pagination_class = RankedPagination
+
+    def get_queryset(self) -> QuerySet[dict]:
+        """
+        Method to define queryset to search posts of current user (scope=mine) or of all users (scope=all)
+
+        Returns:
+            - QuerySet
+
+        Raises:
+            - ValidationError (in case of empty query or unknown scope)
+        """
+        query: str = self.request.query_params.get('q', '').strip()
+        scope: str = self.request.query_params.get('scope', 'mine')
+        if not query:
+            raise ValidationError({'q': 'This query param is required'})
+        if scope not in ('mine', 'all'):
+            raise ValidationError({'scope': 'Must be one of: mine, all'})
+
+        if scope == 'mine':
+            posts: QuerySet[Post] = Post.objects.filter(user=self.request.user)
+            username: Optional[str] = self.request.user.username
+        else:
+            posts, username = Post.objects.all(), None
+        return PostFastSerializer.get_rows(
+            get_search_backend(posts.db).search(posts, query),
+            username=username,
+            extra_fields=('rank',)
+        )
+
+    @extend_schema(
+        description="Full text search of posts by title and body, results are ordered by relevance",
+        summary="Search posts",
+        parameters=[
+            OpenApiParameter('q', OpenApiTypes.STR, required=True),
+            OpenApiParameter('scope', OpenApiTypes.STR, enum=['mine', 'all']),
+        ],
+        responses=PostBaseSerializer,
     )
     def get(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
         return super().get(request, *args, **kwargs)
@@ -80,9 +304,108 @@ class PostDeleteView(DestroyAPIView):
         """
         return Post.objects.filter(user=self.request.user)
 
+    def destroy(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        Redefined method to delete post with one statement without fetching it first,
+        decrease post count of its author and invalidate cached posts lists of author
+
+        Params:
+            - request: defines current request
+
+        Returns:
+            - Response with 204 status code
+
+        Raises:
+            - NotFound (in case of post does not exist or belongs to another user)
+        """
+        deleted: int = delete_posts(self.get_queryset().filter(pk=kwargs.get('pk')), request.user.pk)
+        if not deleted:
+            raise NotFound
+        post_list_cache.bump(request.user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @extend_schema(
         description="Get list of posts",
         summary="Posts list",
     )
     def delete(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
         return super().delete(request, *args, **kwargs)
+
+
+# ----------------------------------------------------------------
+@extend_schema(tags=['Post'])
+class PostBulkDeleteView(GenericAPIView):
+    """
+    View to handle POST request to delete posts of current user by list of ids or by filter
+
+    Attrs:
+        - permission_classes: defines permissions for this APIView
+        - serializer_class: defines serializer class of deletion criteria for this APIView
+    """
+    permission_classes: list = [IsAuthenticated]
+    serializer_class = PostBulkDeleteSerializer
+
+    def get_queryset(self) -> QuerySet[Post]:
+        """
+        Method to define queryset to get posts by some filters
+
+        Returns:
+            - QuerySet
+        """
+        return Post.objects.filter(user=self.request.user)
+
+    @extend_schema(
+        description="Delete posts of current user matching all given criteria with one statement",
+        summary="Bulk delete posts",
+        responses=inline_serializer(name='PostBulkDeleteResult', fields={'deleted': serializers.IntegerField()}),
+    )
+    def post(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        serializer: PostBulkDeleteSerializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted: int = delete_posts(serializer.filter_queryset(self.get_queryset()), request.user.pk)
+        if deleted:
+            post_list_cache.bump(request.user.pk)
+        return Response({'deleted': deleted})
+
+
+# ----------------------------------------------------------------
+@extend_schema(tags=['Post'])
+class PostExportView(APIView):
+    """
+    View to handle GET request to export all posts of current user as a stream.
+    Posts are read from database by chunks (server side cursor on PostgreSQL), so memory usage does not depend
+    on number of posts and first bytes are sent before all posts are read
+
+    Attrs:
+        - permission_classes: defines permissions for this APIView
+        - outputs: defines supported output formats with their stream encoders and content types
+    """
+    permission_classes: list = [IsAuthenticated]
+    outputs: dict = {
+        'ndjson': (stream_ndjson, 'application/x-ndjson'),
+        'json': (stream_json_array, 'application/json'),
+    }
+
+    @extend_schema(
+        description="Export all posts of current user as newline delimited JSON (default) or as JSON array",
+        summary="Export posts",
+        parameters=[OpenApiParameter('output', OpenApiTypes.STR, enum=['ndjson', 'json'])],
+        responses={200: PostBaseSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: tuple, **kwargs: dict) -> StreamingHttpResponse:
+        output: str = request.query_params.get('output', 'ndjson')
+        if output not in self.outputs:
+            raise ValidationError({'output': f'Must be one of: {", ".join(self.outputs)}'})
+        encoder, content_type = self.outputs[output]
+
+        chunk_size: int = settings.POSTS_EXPORT_CHUNK_SIZE
+        rows: QuerySet[dict] = PostFastSerializer.get_rows(
+            Post.objects.filter(user=request.user).order_by('id'),
+            username=request.user.username
+        )
+        serializer: PostFastSerializer = PostFastSerializer()
+        posts = (serializer.to_representation(row) for row in rows.iterator(chunk_size=chunk_size))
+
+        response: StreamingHttpResponse = StreamingHttpResponse(encoder(posts, chunk_size), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="posts.{output}"'
+        return response
@@ -0,0 +1,51 @@
+import signal
+import threading
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from tasks.queue import ensure_queued
+from tasks.worker import Worker
+
+
+# ----------------------------------------------------------------
+class Command(BaseCommand):
+    """
+    Command to run queued tasks (tasks.queue) in pool of worker threads until SIGTERM or SIGINT.
+    Several commands may run at once, e.g. on several hosts, every task is claimed by one of them.
+    Recurring tasks (TASKS['RECURRING'] setting) are queued on start unless they are queued already.
+    With --once due tasks are run in current thread and command exits when there are none, e.g. to run by cron
+    """
+    help: str = 'Run queued background tasks'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--threads', type=int, default=4, help='number of worker threads')
+        parser.add_argument('--poll-interval', type=float, default=None, help='seconds between polls of queue')
+        parser.add_argument('--once', action='store_true', help='run due tasks and exit')
+
+    def handle(self, *args: tuple, **options: Any) -> None:
+        threads: int = options['threads']
+        if threads < 1:
+            raise CommandError('--threads must be positive')
+        worker: Worker = Worker(threads, options['poll_interval'])
+        for func in settings.TASKS['RECURRING']:
+            ensure_queued(func)
+
+        if options['once']:
+            succeeded, failed = worker.run_pending()
+            self.stdout.write(self.style.SUCCESS(f'Ran {succeeded + failed} tasks, {failed} failed'))
+            return
+
+        stopped: threading.Event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+        worker.start()
+        self.stdout.write(f'Started {threads} worker threads')
+        try:
+            while not stopped.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('Stopping, waiting for running tasks')
+        worker.stop()
+        self.stdout.write(self.style.SUCCESS('Stopped'))
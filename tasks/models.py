@@ -0,0 +1,57 @@
+from django.db import models
+from django.utils import timezone
+
+
+# ----------------------------------------------------------------
+class Task(models.Model):
+    """
+    Model representing queued call of function (tasks.queue). Row is deleted when call succeeds.
+    run_at is time when task may be claimed by worker: claimed task gets run_at in future (lease),
+    so task of crashed worker is claimed again when lease expires. Failed call is retried with backoff,
+    after max_attempts task is marked failed and kept for inspection
+    """
+    name = models.CharField(
+        max_length=255,
+        verbose_name='Функция'
+    )
+    args = models.JSONField(
+        default=list,
+        verbose_name='Позиционные аргументы'
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        verbose_name='Именованные аргументы'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Время запуска'
+    )
+    attempts = models.IntegerField(
+        default=0,
+        verbose_name='Количество попыток'
+    )
+    max_attempts = models.IntegerField(
+        verbose_name='Максимальное количество попыток'
+    )
+    failed = models.BooleanField(
+        default=False,
+        verbose_name='Завершена с ошибкой'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        indexes = [
+            models.Index(fields=['run_at'], name='task_run_at_idx', condition=models.Q(failed=False)),
+        ]
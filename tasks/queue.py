@@ -0,0 +1,152 @@
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Union
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tasks.models import Task
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# set when task is committed, wakes workers of current process waiting for tasks (tasks.worker)
+task_committed: threading.Event = threading.Event()
+
+
+# ----------------------------------------------------------------
+# database backed queue of function calls. Task is inserted in transaction of the write causing it, so it exists
+# if and only if the write is committed. Workers claim tasks with SELECT ... FOR UPDATE SKIP LOCKED
+def enqueue(func: Union[Callable, str], *args: Any, **kwargs: Any) -> Task:
+    """
+    Function to queue call of function in current transaction, workers of current process are woken on commit
+
+    Params:
+        - func: module level function or its dotted path, called by worker with args and kwargs
+        - args: positional arguments of call, must be JSON serializable
+        - kwargs: keyword arguments of call, must be JSON serializable
+
+    Returns:
+        - created task
+    """
+    return enqueue_at(timezone.now(), func, *args, **kwargs)
+
+
+def enqueue_at(run_at: datetime, func: Union[Callable, str], *args: Any, **kwargs: Any) -> Task:
+    """
+    Function to queue call of function in current transaction to be run not earlier than given time
+
+    Params:
+        - run_at: time when task may be run
+        - func: module level function or its dotted path, called by worker with args and kwargs
+        - args: positional arguments of call, must be JSON serializable
+        - kwargs: keyword arguments of call, must be JSON serializable
+
+    Returns:
+        - created task
+    """
+    task: Task = Task.objects.create(
+        name=get_name(func), args=list(args), kwargs=kwargs, run_at=run_at, max_attempts=settings.TASKS['MAX_ATTEMPTS']
+    )
+    transaction.on_commit(task_committed.set)
+    return task
+
+
+def ensure_queued(func: Union[Callable, str]) -> Optional[Task]:
+    """
+    Function to queue call of function without arguments unless it is queued already, used to start recurring tasks
+    (TASKS['RECURRING'] setting) which queue themselves again
+
+    Params:
+        - func: module level function or its dotted path
+
+    Returns:
+        - created task or None if function is queued already
+    """
+    if Task.objects.filter(name=get_name(func), failed=False).exists():
+        return None
+    return enqueue(func)
+
+
+def get_name(func: Union[Callable, str]) -> str:
+    """
+    Function to get dotted path of function, which is stored in task and imported by worker
+
+    Params:
+        - func: module level function or its dotted path
+
+    Returns:
+        - dotted path
+    """
+    return func if isinstance(func, str) else f'{func.__module__}.{func.__qualname__}'
+
+
+def claim_task() -> Optional[Task]:
+    """
+    Function to claim the earliest due task. Claimed task gets run_at in TASKS['LEASE'] seconds,
+    other workers skip it until lease expires
+
+    Returns:
+        - claimed task or None if there is no due task
+    """
+    while True:
+        now: Any = timezone.now()
+        with transaction.atomic():
+            task: Optional[Task] = (
+                Task.objects.select_for_update(skip_locked=True).filter(failed=False, run_at__lte=now)
+                .order_by('run_at').first()
+            )
+            if task is None:
+                return None
+            # run_at in condition guards against concurrent claim on databases without row locks (SQLite)
+            claimed: int = Task.objects.filter(pk=task.pk, run_at=task.run_at).update(
+                run_at=now + timedelta(seconds=settings.TASKS['LEASE']), attempts=F('attempts') + 1
+            )
+        if claimed:
+            task.attempts += 1
+            return task
+
+
+def run_task(task: Task) -> bool:
+    """
+    Function to call function of claimed task. Task is deleted in transaction of the call, so writes of the call
+    and removal of task are committed together. Failed task is retried after backoff or marked failed
+
+    Params:
+        - task: claimed task
+
+    Returns:
+        - True if call succeeded
+    """
+    try:
+        with transaction.atomic():
+            import_string(task.name)(*task.args, **task.kwargs)
+            Task.objects.filter(pk=task.pk).delete()
+    except Exception:
+        failed: bool = task.attempts >= task.max_attempts
+        logger.exception('Task %s %s failed, attempt %s of %s', task.pk, task.name, task.attempts, task.max_attempts)
+        Task.objects.filter(pk=task.pk).update(
+            run_at=timezone.now() + timedelta(seconds=get_backoff(task.attempts)),
+            failed=failed,
+            last_error=traceback.format_exc(),
+        )
+        return False
+    return True
+
+
+def get_backoff(attempts: int) -> float:
+    """
+    Function to get delay before next attempt, doubles with every attempt up to TASKS['BACKOFF_MAX']
+
+    Params:
+        - attempts: number of made attempts
+
+    Returns:
+        - delay in seconds
+    """
+    return min(settings.TASKS['BACKOFF_MAX'], settings.TASKS['BACKOFF_BASE'] * 2 ** (attempts - 1))
@@ -0,0 +1,87 @@
+import logging
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections, DatabaseError
+
+from tasks.models import Task
+from tasks.queue import claim_task, run_task, task_committed
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------
+class Worker:
+    """
+    Pool of threads running queued tasks (tasks.queue). Idle thread waits until task is committed
+    in current process or for poll_interval seconds, tasks committed by other processes are found by polling
+
+    Attrs:
+        - threads: defines number of threads
+        - poll_interval: defines seconds between polls of queue by idle thread
+    """
+    def __init__(self, threads: int = 4, poll_interval: Optional[float] = None) -> None:
+        self.threads: int = threads
+        self.poll_interval: float = poll_interval if poll_interval is not None else settings.TASKS['POLL_INTERVAL']
+        self._stopped = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Method to start threads"""
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f'task-worker-{number}', daemon=True)
+            for number in range(self.threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method to stop threads after their current tasks
+
+        Params:
+            - timeout: seconds to wait for every thread
+        """
+        self._stopped.set()
+        task_committed.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_pending(self) -> tuple[int, int]:
+        """
+        Method to run due tasks in current thread until there are none
+
+        Returns:
+            - tuple (succeeded tasks, failed tasks)
+        """
+        succeeded: int = 0
+        failed: int = 0
+        while not self._stopped.is_set():
+            task: Optional[Task] = claim_task()
+            if task is None:
+                break
+            if run_task(task):
+                succeeded += 1
+            else:
+                failed += 1
+        return succeeded, failed
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                try:
+                    succeeded, failed = self.run_pending()
+                except DatabaseError:
+                    # e.g. lost connection, queue is polled again after poll_interval
+                    logger.exception('Failed to run tasks')
+                    succeeded, failed = 0, 0
+                if not succeeded and not failed:
+                    task_committed.wait(self.poll_interval)
+                    task_committed.clear()
+                # connections of long running thread are closed like at the end of request
+                close_old_connections()
+        finally:
+            connections.close_all()
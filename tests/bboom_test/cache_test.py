@@ -0,0 +1,186 @@
+import itertools
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from bboom_test.cache import DjangoCacheBackend, LocMemLRUBackend, VersionedCache, versioned_condition
+from bboom_test.routers import read_from_replica
+
+
+# ----------------------------------------------------------------
+# versioned cache tests
+class TestVersionedCache:
+    def test_lru_backend_eviction(self) -> None:
+        """
+        LRU backend size bound test
+
+        Checks:
+            - Number of entries never exceeds MAX_ENTRIES
+            - Least recently used entry is evicted first
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        backend: LocMemLRUBackend = LocMemLRUBackend({'MAX_ENTRIES': 2})
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+
+        assert len(backend) == 2, 'Size bound exceeded'
+        assert backend.get('b') is None, 'Wrong entry evicted'
+        assert backend.get('a') == 1 and backend.get('c') == 3, 'Recently used entry evicted'
+
+    def test_lru_backend_timeout(self) -> None:
+        """
+        LRU backend expiration test
+
+        Checks:
+            - Entry is returned before timeout and is not returned after timeout
+            - incr of expired entry raises ValueError
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        backend: LocMemLRUBackend = LocMemLRUBackend({})
+        with mock.patch('bboom_test.cache.time.monotonic', return_value=100.0):
+            backend.set('key', 1, timeout=10)
+            assert backend.get('key') == 1, 'Entry expired too early'
+        with mock.patch('bboom_test.cache.time.monotonic', return_value=111.0):
+            assert backend.get('key') is None, 'Entry not expired'
+            with pytest.raises(ValueError):
+                backend.incr('key')
+
+    @pytest.mark.parametrize('backend', ['bboom_test.cache.LocMemLRUBackend', 'bboom_test.cache.DjangoCacheBackend'])
+    def test_bump_invalidates_scope(self, backend: str) -> None:
+        """
+        Version bump test for every backend
+
+        Params:
+            - backend: import path of backend
+
+        Checks:
+            - Value is computed once while version is not changed
+            - Bump of one scope recomputes value only in this scope
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        loader: mock.Mock = mock.Mock(side_effect=itertools.count(1).__next__)
+        with override_settings(VERSIONED_CACHE={'BACKEND': backend, 'OPTIONS': {}, 'TIMEOUT': 60}):
+            cache: VersionedCache = VersionedCache(namespace='test')
+            cache.clear()
+
+            assert cache.get_or_set(1, 'page', loader) == 1, 'Wrong value'
+            assert cache.get_or_set(2, 'page', loader) == 2, 'Wrong value'
+            assert cache.get_or_set(1, 'page', loader) == 1, 'Value recomputed'
+            cache.bump(1)
+            assert cache.get_or_set(1, 'page', loader) == 3, 'Value not invalidated'
+            assert cache.get_or_set(2, 'page', loader) == 2, 'Foreign scope invalidated'
+            assert loader.call_count == 3, 'Wrong number of cache misses'
+            cache.clear()
+
+    def test_bump_is_shared_by_processes(self, settings: Any) -> None:
+        """
+        Invalidation between processes test, every process has own VersionedCache and backend instances
+
+        Params:
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Bump made by one process invalidates value cached by another one with shared django cache
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        # process local django cache stands in for Redis shared by processes
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        settings.VERSIONED_CACHE = {'BACKEND': 'bboom_test.cache.DjangoCacheBackend', 'OPTIONS': {}, 'TIMEOUT': 60}
+        api_process: VersionedCache = VersionedCache(namespace='test')
+        ui_process: VersionedCache = VersionedCache(namespace='test')
+        loader: mock.Mock = mock.Mock(side_effect=itertools.count(1).__next__)
+
+        assert api_process.get_or_set(1, 'page', loader) == 1, 'Wrong value'
+        ui_process.bump(1)
+        assert api_process.get_or_set(1, 'page', loader) == 2, 'Bump of another process is not seen'
+        assert api_process.get_modified(1) == ui_process.get_modified(1), 'Modification time is not shared'
+
+    def test_database_cache_refused(self, settings: Any) -> None:
+        """
+        Shared backend configuration test
+
+        Params:
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Versioned cache over database cache is not created
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.CACHES = {
+            'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'bboom_cache'},
+        }
+        settings.VERSIONED_CACHE = {'BACKEND': 'bboom_test.cache.DjangoCacheBackend', 'OPTIONS': {}, 'TIMEOUT': 60}
+
+        with pytest.raises(ImproperlyConfigured):
+            VersionedCache(namespace='test').backend
+
+    @pytest.mark.parametrize('backend', ['bboom_test.cache.LocMemLRUBackend', 'bboom_test.cache.DjangoCacheBackend'])
+    def test_condition_reads_backend_once(self, settings: Any, backend: str) -> None:
+        """
+        Number of backend reads of cached view test
+
+        Params:
+            - settings: A fixture to override django settings
+            - backend: import path of backend
+
+        Checks:
+            - Cache hit of view with ETag, Last-Modified, replica routing and cached value reads backend
+              by one get_many and does not write it
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        settings.VERSIONED_CACHE = {'BACKEND': backend, 'OPTIONS': {}, 'TIMEOUT': 60}
+        settings.REPLICA_DATABASES = ['replica']
+        cache: VersionedCache = VersionedCache(namespace='test')
+        cache.clear()
+        view: Any = versioned_condition(cache, lambda request: 1, lambda request: ['page'])(
+            read_from_replica(cache, lambda request: 1)(
+                lambda request: HttpResponse(cache.get_or_set(1, 'page', lambda: 'value'))
+            )
+        )
+        request: Any = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        view(request)
+        cache.backend = mock.Mock(wraps=cache.backend)
+
+        response: Any = view(request)
+
+        assert response.content == b'value' and response.has_header('ETag'), 'Wrong response'
+        assert [call[0] for call in cache.backend.method_calls] == ['get_many'], 'Backend is read more than once'
@@ -0,0 +1,129 @@
+import threading
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+
+from bboom_test.metrics import MetricsRegistry, registry
+
+
+# ----------------------------------------------------------------
+# metrics tests
+class TestMetrics:
+    @pytest.mark.django_db
+    def test_metrics_endpoint(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Metrics middleware and endpoint test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Response status code is 200 and content type is text exposition format
+            - Request counter, latency histogram and query count are recorded per view
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        registry.clear()
+        client.get('/api/posts/list/', HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token'))
+        client.get('/api/posts/list/')
+
+        response: Any = client.get('/metrics')
+        text: str = response.content.decode()
+        view: str = 'view="posts.views.PostListView"'
+
+        assert response.status_code == 200, 'Status code error'
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4'), 'Wrong content type'
+        assert f'http_requests_total{{{view},method="GET",status="200"}} 1' in text, 'Request is not counted'
+        assert f'http_requests_total{{{view},method="GET",status="401"}} 1' in text, 'Status is not counted'
+        assert f'http_request_duration_seconds_bucket{{{view},le="+Inf"}} 2' in text, 'Latency is not observed'
+        assert f'db_queries_per_request_count{{{view}}} 2' in text, 'Queries are not observed'
+
+    @pytest.mark.django_db
+    def test_async_request_metrics(self, async_client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Metrics middleware in async chain test
+
+        Params:
+            - async_client: A Django async test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Request of async view is counted
+            - Queries made in threads of sync_to_async are counted
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        async def request() -> Any:
+            return await async_client.get(
+                '/api/posts/async/list/', headers={'Authorization': 'Bearer ' + user_auth.get('token')}
+            )
+
+        registry.clear()
+        response: Any = async_to_sync(request)()
+        collected: dict = registry.collect()
+        view: tuple = (('view', 'posts.async_views.post_list'),)
+
+        assert response.status_code == 200, 'Status code error'
+        assert collected[('http_requests_total', view + (('method', 'GET'), ('status', '200')))] == [1]
+        assert collected[('db_queries_per_request', view)][-2] > 0, 'Queries are not observed'
+
+    def test_finished_threads_are_folded(self) -> None:
+        """
+        Shards of finished threads test
+
+        Checks:
+            - Values recorded by finished thread are kept
+            - Shard of finished thread is dropped
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        metrics: MetricsRegistry = MetricsRegistry()
+        thread: threading.Thread = threading.Thread(target=metrics.inc, args=('http_requests_total', (), 3))
+        thread.start()
+        thread.join()
+        metrics.inc('http_requests_total', (), 1)
+
+        assert metrics.collect_local() == {('http_requests_total', ()): [4]}, 'Values of finished thread are lost'
+        assert [shard_thread for shard_thread, _ in metrics._shards] == [threading.current_thread()], 'Shard leaked'
+
+    def test_multiprocess_mode(self, tmp_path: Any) -> None:
+        """
+        File backed aggregation of several processes test
+
+        Params:
+            - tmp_path: temporary directory
+
+        Checks:
+            - Scrape of one process returns merged values of all processes
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        with override_settings(METRICS_MULTIPROCESS_DIR=str(tmp_path)):
+            first: MetricsRegistry = MetricsRegistry()
+            second: MetricsRegistry = MetricsRegistry()
+            first.record('view', 'GET', 200, 0.01, 100, 2, 0.001)
+            second.record('view', 'GET', 200, 0.02, 300, 3, 0.002)
+            collected: dict = first.collect()
+
+        assert len(list(tmp_path.glob('metrics-*.json'))) == 2, 'Process files are not written'
+        assert collected[('http_requests_total', (('view', 'view'), ('method', 'GET'), ('status', '200')))] == [2]
+        assert collected[('db_queries_per_request', (('view', 'view'),))][-2:] == [5, 2], 'Histograms not merged'
@@ -0,0 +1,99 @@
+from typing import Any
+
+import pytest
+from asgiref.sync import iscoroutinefunction, SyncToAsync
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory
+
+from bboom_test.middleware import PrefixMiddlewareDispatcher
+
+
+# ----------------------------------------------------------------
+# middleware dispatcher tests
+class TestMiddlewareDispatcher:
+    def test_chain_by_prefix(self, settings: Any) -> None:
+        """
+        Middleware chain choice test
+
+        Params:
+            - settings: A fixture to override django settings
+
+        Checks:
+            - API request skips session and authentication middlewares
+            - Other requests pass through them
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.MIDDLEWARE_CHAINS = [
+            ('/api/', []),
+            ('', [
+                'django.contrib.sessions.middleware.SessionMiddleware',
+                'django.contrib.auth.middleware.AuthenticationMiddleware',
+            ]),
+        ]
+        seen: list[HttpRequest] = []
+        dispatcher: PrefixMiddlewareDispatcher = PrefixMiddlewareDispatcher(
+            lambda request: seen.append(request) or HttpResponse()
+        )
+
+        dispatcher(RequestFactory().get('/api/posts/list/'))
+        dispatcher(RequestFactory().get('/ui/user_list/'))
+
+        assert not hasattr(seen[0], 'session') and not hasattr(seen[0], 'user'), 'API request passed session chain'
+        assert hasattr(seen[1], 'session') and hasattr(seen[1], 'user'), 'UI request skipped session chain'
+
+    @pytest.mark.django_db
+    def test_ui_and_admin_chain(self) -> None:
+        """
+        Full chain hooks test
+
+        Checks:
+            - CSRF check (process_view of chain) rejects UI POST without token
+            - API response sets no cookies
+            - Admin redirects anonymous user to login
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        client: Client = Client(enforce_csrf_checks=True)
+
+        ui_response: Any = client.post('/ui/login/', {'username': 'user', 'password': 'password'})
+        api_response: Any = client.post('/api/users/auth/', {'username': 'user', 'password': 'password'})
+        admin_response: Any = client.get('/admin/')
+
+        assert ui_response.status_code == 403, 'CSRF check skipped'
+        assert api_response.status_code == 401 and not api_response.cookies, 'API response has cookies'
+        assert admin_response.status_code == 302 and '/admin/login/' in admin_response['Location'], 'Admin broken'
+
+    def test_async_chain(self) -> None:
+        """
+        ASGI middleware chain mode test
+
+        Checks:
+            - Middleware chain of ASGI handler is a coroutine function not wrapped in SyncToAsync
+            - Dispatcher chains and process_view hook are built in async mode
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        handler: ASGIHandler = ASGIHandler()
+        dispatcher: PrefixMiddlewareDispatcher = handler._view_middleware[0].__self__
+        chain_handlers: list = [chain.handler for _, chain in dispatcher.chains] + [dispatcher.passthrough.handler]
+
+        assert iscoroutinefunction(handler._middleware_chain), 'Middleware chain is sync'
+        assert not isinstance(handler._middleware_chain, SyncToAsync), 'Middleware chain is run in thread'
+        assert isinstance(dispatcher, PrefixMiddlewareDispatcher) and iscoroutinefunction(dispatcher), 'Sync dispatcher'
+        assert all(iscoroutinefunction(chain_handler) for chain_handler in chain_handlers), 'Sync chain'
+        assert not any(isinstance(chain_handler, SyncToAsync) for chain_handler in chain_handlers), 'Chain in thread'
+        assert not isinstance(handler._view_middleware[0], SyncToAsync), 'process_view is run in thread'
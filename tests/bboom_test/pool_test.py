@@ -0,0 +1,155 @@
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from bboom_test.db.pool import collect_pool_metrics, ConnectionPool, get_pool, pools, PoolTimeout
+from bboom_test.metrics import registry
+
+
+# ----------------------------------------------------------------
+class FakeConnection:
+    """Connection stub remembering if it was closed"""
+    def __init__(self) -> None:
+        self.closed: bool = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_pool(**kwargs: Any) -> ConnectionPool:
+    return ConnectionPool(name='test', check=lambda connection, idle_for: not connection.closed, **kwargs)
+
+
+# ----------------------------------------------------------------
+# connection pool tests
+class TestConnectionPool:
+    def test_pool_reuses_connections(self) -> None:
+        """
+        Connection reuse test
+
+        Checks:
+            - Returned connection is borrowed again instead of opening new one
+            - Stats count connections in use and idle
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        pool: ConnectionPool = make_pool(max_size=2)
+        connection: FakeConnection = pool.acquire(FakeConnection)
+        assert pool.get_stats()['in_use'] == 1, 'Borrowed connection is not in use'
+        pool.release(connection)
+
+        assert pool.acquire(FakeConnection) is connection, 'Connection is not reused'
+        pool.release(connection)
+        stats: dict = pool.get_stats()
+        assert (stats['in_use'], stats['idle'], stats['created']) == (0, 1, 1), 'Wrong stats'
+
+    def test_pool_waits_for_free_connection(self) -> None:
+        """
+        Full pool test
+
+        Checks:
+            - Borrower of full pool waits until connection is returned
+            - Borrower times out if no connection is returned, waits and timeouts are counted
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        pool: ConnectionPool = make_pool(max_size=1, timeout=0.05)
+        connection: FakeConnection = pool.acquire(FakeConnection)
+        with pytest.raises(PoolTimeout):
+            pool.acquire(FakeConnection)
+
+        pool.timeout = 5.0
+        timer: threading.Timer = threading.Timer(0.05, pool.release, (connection,))
+        timer.start()
+        assert pool.acquire(FakeConnection) is connection, 'Waiter did not get returned connection'
+        timer.join()
+
+        stats: dict = pool.get_stats()
+        assert (stats['waits'], stats['timeouts']) == (2, 1), 'Waits are not counted'
+        assert stats['wait_seconds'] >= 0.05, 'Wait time is not counted'
+
+    def test_pool_replaces_broken_connections(self) -> None:
+        """
+        Health check and broken connections test
+
+        Checks:
+            - Connection failing health check is closed and replaced by new one
+            - Connection returned as not reusable is closed and frees place in pool
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        pool: ConnectionPool = make_pool(max_size=1)
+        connection: FakeConnection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        connection.closed = True
+
+        replacement: FakeConnection = pool.acquire(FakeConnection)
+        assert replacement is not connection, 'Broken connection is borrowed'
+        pool.release(replacement, reusable=False)
+        assert replacement.closed, 'Not reusable connection is not closed'
+        assert pool.acquire(FakeConnection) not in (connection, replacement), 'Place is not freed'
+        assert pool.get_stats()['failed_checks'] == 1, 'Failed check is not counted'
+
+    def test_pool_evicts_idle_connections(self) -> None:
+        """
+        Idle eviction test
+
+        Checks:
+            - Connections idle for more than max_idle are closed down to min_size
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        pool: ConnectionPool = make_pool(min_size=1, max_size=3, max_idle=0.05)
+        connections: list[FakeConnection] = [pool.acquire(FakeConnection) for _ in range(3)]
+        for connection in connections:
+            pool.release(connection)
+        time.sleep(0.06)
+
+        borrowed: FakeConnection = pool.acquire(FakeConnection)
+        assert borrowed is connections[-1], 'Most recently used connection is not borrowed'
+        assert [connection.closed for connection in connections] == [True, True, False], 'Idle are not evicted'
+        assert pool.get_stats()['closed'] == 2, 'Evicted connections are not counted'
+
+    def test_pool_metrics(self) -> None:
+        """
+        Pool metrics test
+
+        Checks:
+            - Pool stats are exposed by metrics registry per alias
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        pool: ConnectionPool = get_pool('pool_test', make_pool)
+        try:
+            pool.acquire(FakeConnection)
+            metrics: dict = collect_pool_metrics()
+            text: str = registry.render()
+        finally:
+            pools.pop('pool_test')
+
+        assert metrics[('db_pool_connections', (('alias', 'test'), ('state', 'in_use')))] == [1], 'Wrong in use'
+        assert '# TYPE db_pool_connections gauge' in text, 'Gauge is not rendered'
+        assert 'db_pool_connections{alias="test",state="in_use"} 1' in text, 'Pool is not exposed'
+        assert 'db_pool_waits_total{alias="test"} 0' in text, 'Waits are not exposed'
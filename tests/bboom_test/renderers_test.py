@@ -0,0 +1,84 @@
+import io
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from bboom_test.parsers import FastJSONParser
+from bboom_test.renderers import FastJSONRenderer
+
+
+# ----------------------------------------------------------------
+# JSON renderer and parser tests
+class TestFastJSON:
+    def test_renderer_output(self) -> None:
+        """
+        Fast JSON renderer test
+
+        Checks:
+            - Output is the same as of DRF JSONRenderer for types emitted by serializers
+            - Integers out of orjson range and indented output fall back to DRF JSONRenderer
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        data: dict = {
+            'id': 1, 'title': 'Заголовок', 'price': Decimal('1.50'), 'detail': gettext_lazy('Not found.'),
+            'items': [None, True, 1.5], 'nested': {1: 'non string key'}, 'big': 2 ** 70,
+        }
+        for item in (data, {key: value for key, value in data.items() if key != 'big'}):
+            assert FastJSONRenderer().render(item) == JSONRenderer().render(item), 'Output differs from DRF'
+        assert FastJSONRenderer().render(data, 'application/json; indent=4') == \
+            JSONRenderer().render(data, 'application/json; indent=4'), 'Indented output differs from DRF'
+        assert FastJSONRenderer().render(None) == b'', 'Empty response is not empty'
+
+    def test_parser(self) -> None:
+        """
+        Fast JSON parser test
+
+        Checks:
+            - Body is parsed
+            - Malformed body raises ParseError
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        parser: FastJSONParser = FastJSONParser()
+        assert parser.parse(io.BytesIO('{"title": "Заголовок"}'.encode())) == {'title': 'Заголовок'}, 'Parse error'
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"title": '))
+
+    @pytest.mark.django_db
+    def test_api_uses_fast_json(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        API JSON test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - API parses JSON body and renders compact JSON
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        response: Any = client.post(
+            '/api/posts/create/', {'title': 'Заголовок', 'body': 'body'}, content_type='application/json',
+            HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+        )
+        assert response.status_code == 201, 'Status code error'
+        assert response.content.startswith(b'{"id":'), 'Response is not compact JSON'
+        assert 'Заголовок'.encode() in response.content, 'Response is not UTF-8'
@@ -0,0 +1,129 @@
+import time
+from typing import Any, Callable
+from unittest import mock
+
+import pytest
+from django.db import connections
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from bboom_test.cache import VersionedCache
+from bboom_test.routers import read_db, read_from_replica
+from posts.cache import post_list_cache
+
+
+# ----------------------------------------------------------------
+# replica routing tests, 'replica' alias stands in for replica and mirrors default test database
+class TestReplicaRouting:
+    @pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+    def test_post_list_reads_from_replica(self, client: Any, user_auth: dict[str, Any], settings: Any) -> None:
+        """
+        Replica routing of posts list test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - settings: pytest-django fixture to override settings
+
+        Checks:
+            - Posts list right after post creation is read from primary
+            - Posts list is read from replica after lag window
+            - Writes go to primary
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.REPLICA_DATABASES = ['replica']
+        settings.REPLICA_LAG_WINDOW = 60
+        headers: dict = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            created: Any = client.post('/api/posts/create/', {'title': 'title', 'body': 'body'}, **headers)
+            response: Any = client.get('/api/posts/list/', **headers)
+        assert created.status_code == 201, 'Status code error'
+        assert [post['id'] for post in response.data['results']] == [created.data['id']], 'Own post is not read'
+        assert len(replica_queries) == 0, 'Replica is used right after write'
+
+        settings.REPLICA_LAG_WINDOW = 0
+        post_list_cache.bump(user_auth.get('user').pk)
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            with CaptureQueriesContext(connections['default']) as default_queries:
+                response = client.get('/api/posts/list/', **headers)
+        assert response.status_code == 200, 'Status code error'
+        assert len(response.data['results']) == 1, 'Posts are not read from replica'
+        assert len(replica_queries) == 1 and len(default_queries) == 0, 'Posts list is not read from replica'
+
+    @pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+    def test_ui_reads_from_replica(self, client: Any, user: Any, settings: Any) -> None:
+        """
+        Replica routing of UI pages test
+
+        Params:
+            - client: A Django test client instance.
+            - user: A fixture of user instance
+            - settings: pytest-django fixture to override settings
+
+        Checks:
+            - Session and user are read from primary, posts and users pages from replica
+            - Posts page right after add_post is read from primary
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.REPLICA_DATABASES = ['replica']
+        settings.REPLICA_LAG_WINDOW = 0
+        client.force_login(user)
+
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            with CaptureQueriesContext(connections['default']) as default_queries:
+                assert client.get(f'/ui/posts/{user.pk}/').status_code == 200, 'Status code error'
+                assert client.get('/ui/user_list/').status_code == 200, 'Status code error'
+        assert replica_queries and all('posts_post' in query['sql'] or 'users_user' in query['sql']
+                                       for query in replica_queries), 'Pages are not read from replica'
+        assert any('django_session' in query['sql'] for query in default_queries), 'Session is read from replica'
+
+        settings.REPLICA_LAG_WINDOW = 60
+        client.post('/ui/posts/add/', {'title': 'title', 'body': 'body'})
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response: Any = client.get(f'/ui/posts/{user.pk}/')
+        assert 'title' in response.content.decode(), 'Own post is not read'
+        assert len(replica_queries) == 0, 'Replica is used right after write'
+
+    @pytest.mark.django_db
+    def test_write_of_another_process(self, settings: Any) -> None:
+        """
+        Replica routing after write made by another process test, every process has own VersionedCache instance
+
+        Params:
+            - settings: pytest-django fixture to override settings
+
+        Checks:
+            - Scope not written within lag window is read from replica
+            - Scope written by another process within lag window is read from primary
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        # process local django cache stands in for Redis shared by processes
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        settings.VERSIONED_CACHE = {'BACKEND': 'bboom_test.cache.DjangoCacheBackend', 'OPTIONS': {}, 'TIMEOUT': 60}
+        settings.REPLICA_DATABASES = ['replica']
+        settings.REPLICA_LAG_WINDOW = 60
+        api_process: VersionedCache = VersionedCache(namespace='test')
+        ui_process: VersionedCache = VersionedCache(namespace='test')
+        view: Callable = read_from_replica(api_process, lambda request: 1)(lambda request: read_db.get())
+        with mock.patch('bboom_test.cache.time.time', return_value=time.time() - 120):
+            ui_process.bump(1)
+
+        assert view(RequestFactory().get('/')) == 'replica', 'Old write is read from primary'
+        ui_process.bump(1)
+        assert view(RequestFactory().get('/')) is None, 'Write of another process is read from replica'
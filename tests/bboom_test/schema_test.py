@@ -0,0 +1,59 @@
+import gzip
+from typing import Any
+
+import pytest
+from drf_spectacular.generators import SchemaGenerator
+
+from bboom_test.schema import CachedSpectacularAPIView
+
+
+# ----------------------------------------------------------------
+# schema tests
+class TestSchema:
+    @pytest.mark.django_db
+    def test_schema_is_cached(self, client: Any, monkeypatch: Any) -> None:
+        """
+        Cached schema test
+
+        Params:
+            - client: A Django test client instance.
+            - monkeypatch: pytest fixture to patch schema generator
+
+        Checks:
+            - Schema is generated once per format, repeated requests return the same body
+            - Request with ETag of schema gets 304
+            - Client accepting gzip gets compressed schema with own ETag
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        CachedSpectacularAPIView.documents.clear()
+        calls: list[int] = []
+        get_schema: Any = SchemaGenerator.get_schema
+
+        def counting_get_schema(self: SchemaGenerator, *args: tuple, **kwargs: dict) -> dict:
+            calls.append(1)
+            return get_schema(self, *args, **kwargs)
+
+        monkeypatch.setattr(SchemaGenerator, 'get_schema', counting_get_schema)
+        response: Any = client.get('/api/schema/')
+        repeated: Any = client.get('/api/schema/')
+        json_response: Any = client.get('/api/schema/?format=json')
+
+        assert response.status_code == 200, 'Status code error'
+        assert repeated.content == response.content, 'Cached schema differs'
+        assert b'/api/posts/list/' in response.content, 'Schema has no paths'
+        assert json_response['Content-Type'].startswith('application/vnd.oai.openapi+json'), 'Wrong content type'
+        assert len(calls) == 2, 'Schema is generated more than once per format'
+
+        not_modified: Any = client.get('/api/schema/', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == 304, 'ETag is not validated'
+
+        compressed: Any = client.get('/api/schema/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert compressed['Content-Encoding'] == 'gzip', 'Schema is not compressed'
+        assert gzip.decompress(compressed.content) == response.content, 'Compressed schema differs'
+        assert compressed['ETag'] != response['ETag'], 'Compressed schema has the same ETag'
+        assert 'Accept-Encoding' in compressed['Vary'], 'Vary header error'
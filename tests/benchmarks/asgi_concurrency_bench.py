@@ -0,0 +1,166 @@
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tests.factories import PostFactory, UserFactory
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# ASGI vs WSGI concurrency benchmark with slow clients.
+# Every client needs SLOW_CLIENT_DELAY seconds to receive response (slow mobile network). Under WSGI a worker thread
+# is held while response is written, so WSGI_THREADS threads serve at most WSGI_THREADS clients at once.
+# Under ASGI waiting for slow client costs no thread, one event loop holds all clients.
+# Run: pytest tests/benchmarks/asgi_concurrency_bench.py -s
+CLIENTS: int = 50
+WSGI_THREADS: int = 4
+SLOW_CLIENT_DELAY: float = 0.05
+
+
+class ThreadCounter:
+    """Sampler of maximum number of alive threads"""
+    def __init__(self) -> None:
+        self.max_threads: int = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(0.005):
+            self.max_threads = max(self.max_threads, threading.active_count())
+
+    def __enter__(self) -> 'ThreadCounter':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+# ----------------------------------------------------------------
+async def _asgi_request(application: ASGIHandler, path: str, token: str) -> int:
+    """
+    Function to make GET request to ASGI application from slow client
+
+    Params:
+        - application: ASGI application
+        - path: request path
+        - token: JWT access token
+
+    Returns:
+        - response status code
+    """
+    scope: dict = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+    }
+    status: list[int] = []
+    request_sent: bool = False
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Future()
+
+    async def send(message: dict) -> None:
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif not message.get('more_body'):
+            await asyncio.sleep(SLOW_CLIENT_DELAY)
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+def _wsgi_request(application: WSGIHandler, path: str, token: str) -> int:
+    """
+    Function to make GET request to WSGI application from slow client in worker thread
+
+    Params:
+        - application: WSGI application
+        - path: request path
+        - token: JWT access token
+
+    Returns:
+        - response status code
+    """
+    status: list[str] = []
+    environ: dict = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'SCRIPT_NAME': '', 'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver', 'HTTP_AUTHORIZATION': f'Bearer {token}',
+        'wsgi.input': io.BytesIO(b''), 'wsgi.errors': io.StringIO(), 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    response: Any = application(environ, lambda response_status, headers: status.append(response_status))
+    try:
+        b''.join(response)
+        time.sleep(SLOW_CLIENT_DELAY)
+    finally:
+        response.close()
+        connections.close_all()
+    return int(status[0].split()[0])
+
+
+# ----------------------------------------------------------------
+class TestAsgiConcurrency:
+    @pytest.mark.django_db(transaction=True)
+    def test_slow_clients_concurrency(self) -> None:
+        """
+        Benchmark of CLIENTS concurrent slow clients of posts list: async view under ASGI vs DRF view under WSGI
+
+        Checks:
+            - All requests succeed on both paths
+            - Results are printed: wall time, requests per second, peak number of threads
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = UserFactory.create()
+        PostFactory.create_batch(20, user=user)
+        token: str = str(RefreshToken.for_user(user).access_token)
+
+        async def run_asgi() -> list[int]:
+            application: ASGIHandler = ASGIHandler()
+            return await asyncio.gather(*(
+                _asgi_request(application, '/api/posts/async/list/', token) for _ in range(CLIENTS)
+            ))
+
+        with ThreadCounter() as asgi_threads:
+            started: float = time.perf_counter()
+            asgi_statuses: list[int] = asyncio.run(run_asgi())
+            asgi_time: float = time.perf_counter() - started
+
+        with ThreadCounter() as wsgi_threads, ThreadPoolExecutor(max_workers=WSGI_THREADS) as executor:
+            application: WSGIHandler = WSGIHandler()
+            started = time.perf_counter()
+            wsgi_statuses: list[int] = list(executor.map(
+                lambda _: _wsgi_request(application, '/api/posts/list/', token), range(CLIENTS)
+            ))
+            wsgi_time: float = time.perf_counter() - started
+
+        print(
+            f'\n{CLIENTS} slow clients ({SLOW_CLIENT_DELAY * 1000:.0f} ms each)\n'
+            f'ASGI async view: {asgi_time:.3f} s, {CLIENTS / asgi_time:.0f} req/s, '
+            f'peak threads {asgi_threads.max_threads}\n'
+            f'WSGI {WSGI_THREADS} threads:  {wsgi_time:.3f} s, {CLIENTS / wsgi_time:.0f} req/s, '
+            f'peak threads {wsgi_threads.max_threads}'
+        )
+        assert set(asgi_statuses) == {200}, 'ASGI requests failed'
+        assert set(wsgi_statuses) == {200}, 'WSGI requests failed'
@@ -0,0 +1,122 @@
+import itertools
+from typing import Any, Iterator
+
+import pytest
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from posts.cache import post_list_cache
+from posts.counters import create_post
+from posts.models import Post
+from tests.factories import PostFactory, UserFactory
+from users.cache import user_list_cache, USERS_SCOPE
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# Endpoints benchmarks on seeded dataset of --bench-sizes posts (one user per POSTS_PER_USER posts).
+# Run: pytest tests/benchmarks/endpoints_bench.py --bench-sizes=100,1000,10000 --bench-json=results.json
+# Compare with previous run and fail on regressions: --bench-compare=previous.json --bench-max-regression=0.25
+# Caches are configured by settings as the application is (CACHE_URL), so results measure the shipped configuration
+POSTS_PER_USER: int = 50
+PASSWORD: str = 'bench-password-123'
+usernames: Iterator[str] = (f'bench_new_user_{number}' for number in itertools.count())
+
+
+# ----------------------------------------------------------------
+@pytest.fixture
+def dataset(db: Any, bench_size: int) -> dict[str, Any]:
+    """
+    A fixture to seed users with post counts and posts, posts are spread over users evenly
+
+    Params:
+        - db: database access fixture
+        - bench_size: number of posts
+
+    Returns:
+        dict with benchmarked user (has password PASSWORD), his JWT access token and authenticated clients
+    """
+    users_count: int = max(1, bench_size // POSTS_PER_USER)
+    users: list[User] = User.objects.bulk_create(
+        UserFactory.build(
+            username=f'bench_user_{number}',
+            post_count=bench_size // users_count + (number < bench_size % users_count),
+        )
+        for number in range(users_count)
+    )
+    user: User = users[0]
+    user.set_password(PASSWORD)
+    user.save(update_fields=['password'])
+    Post.objects.bulk_create(
+        (PostFactory.build(user=users[number % users_count]) for number in range(bench_size)), batch_size=1000
+    )
+
+    ui_client: Client = Client()
+    ui_client.force_login(user)
+    return {
+        'user': user,
+        'api_client': Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}'),
+        'ui_client': ui_client,
+    }
+
+
+# ----------------------------------------------------------------
+class TestEndpointsBenchmarks:
+    def test_registration(self, bench: Any, client: Any, dataset: dict[str, Any]) -> None:
+        response: Any = bench(
+            lambda username: client.post(
+                '/api/users/reg/', {'username': username, 'password': PASSWORD, 'password_repeat': PASSWORD}
+            ),
+            setup=lambda: next(usernames),
+        )
+        assert response.status_code == 201, 'Status code error'
+
+    def test_auth(self, bench: Any, client: Any, dataset: dict[str, Any]) -> None:
+        username: str = dataset['user'].username
+        response: Any = bench(lambda: client.post('/api/users/auth/', {'username': username, 'password': PASSWORD}))
+        assert response.status_code == 200, 'Status code error'
+
+    def test_post_create(self, bench: Any, dataset: dict[str, Any]) -> None:
+        api_client: Client = dataset['api_client']
+        response: Any = bench(
+            lambda: api_client.post('/api/posts/create/', {'title': 'title', 'body': 'body'})
+        )
+        assert response.status_code == 201, 'Status code error'
+
+    def test_post_list(self, bench: Any, dataset: dict[str, Any]) -> None:
+        user: User = dataset['user']
+        api_client: Client = dataset['api_client']
+        response: Any = bench(
+            lambda _: api_client.get('/api/posts/list/'), setup=lambda: post_list_cache.bump(user.pk)
+        )
+        assert response.status_code == 200, 'Status code error'
+
+    def test_post_list_cached(self, bench: Any, dataset: dict[str, Any]) -> None:
+        api_client: Client = dataset['api_client']
+        response: Any = bench(lambda: api_client.get('/api/posts/list/'))
+        assert response.status_code == 200, 'Status code error'
+
+    def test_post_delete(self, bench: Any, dataset: dict[str, Any]) -> None:
+        user: User = dataset['user']
+        api_client: Client = dataset['api_client']
+        response: Any = bench(
+            lambda pk: api_client.delete(f'/api/posts/{pk}/'),
+            setup=lambda: create_post(user=user, title='title', body='body').pk,
+        )
+        assert response.status_code == 204, 'Status code error'
+        assert User.objects.get(pk=user.pk).post_count == user.post_count, 'Post count drifted'
+
+    def test_ui_user_list(self, bench: Any, dataset: dict[str, Any]) -> None:
+        ui_client: Client = dataset['ui_client']
+        response: Any = bench(
+            lambda _: ui_client.get('/ui/user_list/'), setup=lambda: user_list_cache.bump(USERS_SCOPE)
+        )
+        assert response.status_code == 200, 'Status code error'
+
+    def test_ui_user_posts(self, bench: Any, dataset: dict[str, Any]) -> None:
+        user: User = dataset['user']
+        ui_client: Client = dataset['ui_client']
+        response: Any = bench(
+            lambda _: ui_client.get(f'/ui/posts/{user.pk}/'), setup=lambda: post_list_cache.bump(user.pk)
+        )
+        assert response.status_code == 200, 'Status code error'
@@ -0,0 +1,77 @@
+import io
+from typing import Any, Optional
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tests.factories import PostFactory, UserFactory
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# Per request overhead of middleware stack: one flat MIDDLEWARE list (as before split) vs chains by path prefix.
+# Requests are passed to WSGI handler directly. API request is a cached posts list (no queries),
+# so timing is dominated by request handling.
+# Run: pytest tests/benchmarks/middleware_bench.py --bench-rounds=2000
+FLAT_MIDDLEWARE: list[str] = [
+    'bboom_test.metrics.MetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+# ----------------------------------------------------------------
+def _get(handler: WSGIHandler, path: str, token: Optional[str] = None) -> int:
+    """
+    Function to pass GET request to WSGI handler
+
+    Params:
+        - handler: WSGI handler
+        - path: request path
+        - token: JWT access token
+
+    Returns:
+        - response status code
+    """
+    status: list[str] = []
+    environ: dict = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'SCRIPT_NAME': '', 'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'testserver',
+        'wsgi.input': io.BytesIO(b''), 'wsgi.errors': io.StringIO(), 'wsgi.url_scheme': 'http',
+    }
+    if token:
+        environ['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    response: Any = handler(environ, lambda response_status, headers: status.append(response_status))
+    b''.join(response)
+    response.close()
+    return int(status[0].split()[0])
+
+
+# ----------------------------------------------------------------
+class TestMiddlewareBenchmarks:
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('stack', ['flat', 'split'])
+    def test_api_request(self, bench: Any, settings: Any, stack: str) -> None:
+        if stack == 'flat':
+            settings.MIDDLEWARE = FLAT_MIDDLEWARE
+        user: User = UserFactory.create()
+        PostFactory.create_batch(10, user=user)
+        token: str = str(RefreshToken.for_user(user).access_token)
+        handler: WSGIHandler = WSGIHandler()
+
+        assert bench(lambda: _get(handler, '/api/posts/list/', token)) == 200, 'Status code error'
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('stack', ['flat', 'split'])
+    def test_api_request_401(self, bench: Any, settings: Any, stack: str) -> None:
+        if stack == 'flat':
+            settings.MIDDLEWARE = FLAT_MIDDLEWARE
+        handler: WSGIHandler = WSGIHandler()
+
+        assert bench(lambda: _get(handler, '/api/posts/list/')) == 401, 'Status code error'
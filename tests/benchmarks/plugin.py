@@ -0,0 +1,151 @@
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pytest
+from django.db import connection
+
+
+# ----------------------------------------------------------------
+# pytest plugin for benchmarks: timing fixture, dataset sizes, JSON report and regression check
+def pytest_addoption(parser: Any) -> None:
+    group: Any = parser.getgroup('bench', 'endpoint benchmarks')
+    group.addoption(
+        '--bench-sizes', default='100,1000,10000', help='comma separated numbers of seeded posts (default: %(default)s)'
+    )
+    group.addoption('--bench-rounds', type=int, default=20, help='timed rounds per benchmark (default: %(default)s)')
+    group.addoption('--bench-json', default=None, help='path to save results as JSON')
+    group.addoption('--bench-compare', default=None, help='path to JSON results of previous run to compare with')
+    group.addoption(
+        '--bench-max-regression', type=float, default=0.25,
+        help='allowed relative growth of median compared to previous run (default: %(default)s)'
+    )
+
+
+def pytest_configure(config: Any) -> None:
+    config._bench_results = []
+    path: Optional[str] = config.getoption('bench_compare')
+    config._bench_baseline = {
+        result['name']: result for result in json.loads(Path(path).read_text())['benchmarks']
+    } if path else {}
+
+
+def pytest_generate_tests(metafunc: Any) -> None:
+    if 'bench_size' in metafunc.fixturenames:
+        sizes: list[int] = [int(size) for size in metafunc.config.getoption('bench_sizes').split(',')]
+        metafunc.parametrize('bench_size', sizes)
+
+
+def pytest_sessionfinish(session: Any) -> None:
+    path: Optional[str] = session.config.getoption('bench_json')
+    results: list[dict] = session.config._bench_results
+    if not path or not results:
+        return
+    report: dict = {
+        'datetime': datetime.now(timezone.utc).isoformat(),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+        'benchmarks': results,
+    }
+    Path(path).write_text(json.dumps(report, indent=2))
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: Any) -> None:
+    results: list[dict] = config._bench_results
+    if not results:
+        return
+    terminalreporter.section('benchmarks (ms)')
+    terminalreporter.write_line(f"{'name':<50}{'min':>10}{'median':>10}{'mean':>10}{'p95':>10}{'max':>10}")
+    for result in results:
+        stats: dict = result['stats']
+        terminalreporter.write_line(
+            f"{result['name']:<50}" + ''.join(
+                f'{stats[key] * 1000:>10.2f}' for key in ('min', 'median', 'mean', 'p95', 'max')
+            )
+        )
+
+
+# ----------------------------------------------------------------
+class Bench:
+    """
+    Timer of benchmarked callable, results are saved to report and compared with previous run
+
+    Attrs:
+        - name: benchmark name, name of test with parameters
+        - rounds: number of timed rounds
+    """
+    def __init__(self, request: Any) -> None:
+        self.config: Any = request.config
+        self.name: str = request.node.name
+        self.rounds: int = self.config.getoption('bench_rounds')
+
+    def __call__(self, func: Callable[[], Any], setup: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Method to time callable. Setup is called before every round and is not timed, first call is a warmup
+
+        Params:
+            - func: benchmarked callable, takes result of setup if setup is given
+            - setup: callable preparing every round, e.g. object to delete
+
+        Returns:
+            - result of last call of func
+        """
+        def run() -> tuple[float, Any]:
+            args: tuple = (setup(),) if setup is not None else ()
+            started: float = time.perf_counter()
+            result: Any = func(*args)
+            return time.perf_counter() - started, result
+
+        result: Any = run()[1]
+        timings: list[float] = []
+        for _ in range(self.rounds):
+            elapsed, result = run()
+            timings.append(elapsed)
+        self.save(timings)
+        return result
+
+    def save(self, timings: list[float]) -> None:
+        """
+        Method to save statistics of timings and fail test if median regressed compared to previous run
+
+        Params:
+            - timings: seconds of every round
+        """
+        ordered: list[float] = sorted(timings)
+        stats: dict = {
+            'min': ordered[0],
+            'max': ordered[-1],
+            'mean': statistics.mean(ordered),
+            'median': statistics.median(ordered),
+            'stddev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            'p95': ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+            'rounds': len(ordered),
+        }
+        self.config._bench_results.append({'name': self.name, 'database': connection.vendor, 'stats': stats})
+
+        baseline: Optional[dict] = self.config._bench_baseline.get(self.name)
+        if baseline is None:
+            return
+        limit: float = baseline['stats']['median'] * (1 + self.config.getoption('bench_max_regression'))
+        if stats['median'] > limit:
+            pytest.fail(
+                f"{self.name} regressed: median {stats['median'] * 1000:.2f} ms, "
+                f"previous {baseline['stats']['median'] * 1000:.2f} ms"
+            )
+
+
+@pytest.fixture
+def bench(request: Any) -> Bench:
+    """
+    A fixture to time callable
+
+    Params:
+        - request: pytest request of current test
+
+    Returns:
+        Bench instance
+    """
+    return Bench(request)
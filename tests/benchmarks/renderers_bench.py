@@ -0,0 +1,52 @@
+import io
+from typing import Any
+
+import pytest
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from bboom_test.parsers import FastJSONParser
+from bboom_test.renderers import FastJSONRenderer
+
+
+# ----------------------------------------------------------------
+# JSON renderers and parsers benchmarks on post lists of --bench-sizes posts, shaped as PostListView responses.
+# Run: pytest tests/benchmarks/renderers_bench.py --bench-sizes=100,1000,10000
+@pytest.fixture
+def post_list(bench_size: int) -> dict[str, Any]:
+    """
+    A fixture to build page of posts list as returned by PostListView
+
+    Params:
+        - bench_size: number of posts
+
+    Returns:
+        dict with next link and serialized posts
+    """
+    results: ReturnList = ReturnList([
+        {
+            'id': number,
+            'user': f'bench_user_{number % 50}',
+            'title': f'Заголовок поста {number}',
+            'body': 'Текст поста, достаточно длинный для реального ответа API. ' * 5,
+        }
+        for number in range(bench_size)
+    ], serializer=None)
+    return {'next': 'http://testserver/api/posts/list/?cursor=cD0xMDA%3D', 'previous': None, 'results': results}
+
+
+# ----------------------------------------------------------------
+class TestRenderersBenchmarks:
+    @pytest.mark.parametrize('renderer_class', [JSONRenderer, FastJSONRenderer])
+    def test_render(self, bench: Any, post_list: dict[str, Any], renderer_class: Any) -> None:
+        renderer: Any = renderer_class()
+        content: bytes = bench(lambda: renderer.render(post_list, 'application/json', {}))
+        assert content == JSONRenderer().render(post_list, 'application/json', {}), 'Output differs from DRF'
+
+    @pytest.mark.parametrize('parser_class', [JSONParser, FastJSONParser])
+    def test_parse(self, bench: Any, post_list: dict[str, Any], parser_class: Any) -> None:
+        content: bytes = JSONRenderer().render(post_list['results'])
+        parser: Any = parser_class()
+        data: Any = bench(lambda: parser.parse(io.BytesIO(content), 'application/json', {}))
+        assert data == post_list['results'], 'Parsed data differs'
@@ -5,7 +5,7 @@ from tests.factories import *
 
 # ----------------------------------------------------------------
 # fixtures
-pytest_plugins = 'tests.fixtures'
+pytest_plugins = ['tests.fixtures', 'tests.benchmarks.plugin']
 
 
 # ----------------------------------------------------------------
@@ -1,12 +1,27 @@
-from typing import Any
+from typing import Any, Callable
 
 import pytest
 
+from bboom_test.authentication import user_cache
+from posts.cache import post_list_cache
+from tasks.worker import Worker
 from tests.factories import UserFactory
+from users.cache import user_list_cache
 from users.models import User
 
 
 # ----------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def clear_versioned_caches() -> None:
+    """
+    A fixture to drop cached posts and users lists and authenticated users, database ids are reused between tests.
+    Caches are configured by settings as shipped, so numbers of queries pinned by tests are the numbers in production
+    """
+    post_list_cache.clear()
+    user_list_cache.clear()
+    user_cache.clear()
+
+
 @pytest.fixture
 def user_auth(client) -> dict[str, Any]:
     """
@@ -61,3 +76,14 @@ def user_not_auth(client: Any) -> User:
     )
     user_db: User = User.objects.get(username=user_factory.username)
     return user_db
+
+
+@pytest.fixture
+def run_tasks() -> Callable[[], tuple[int, int]]:
+    """
+    A fixture to run queued background tasks in test thread, test transaction is not committed
+
+    Returns:
+        function running due tasks and returning numbers of succeeded and failed tasks
+    """
+    return Worker().run_pending
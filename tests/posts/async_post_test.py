@@ -0,0 +1,124 @@
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from posts.models import Post
+from tests.factories import PostFactory
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# async post views tests
+class TestAsyncPost:
+    @pytest.mark.django_db
+    def test_async_create_list_delete(self, async_client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Async post create, list and delete test
+
+        Params:
+            - async_client: A Django async test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Post is created with 201 status code
+            - List contains created post and cursors, page size is respected
+            - Cursor of async list is accepted by sync list
+            - Post is deleted with 204 status code, deleting it again gives 404
+            - Post count of author follows create and delete
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'Authorization': 'Bearer ' + user_auth.get('token')}
+        PostFactory.create_batch(2, user=user_auth.get('user'))
+
+        created: Any = self.call(
+            async_client.post, '/api/posts/async/create/', {'title': 'async', 'body': 'body'},
+            content_type='application/json', headers=headers
+        )
+        first_page: Any = self.call(async_client.get, '/api/posts/async/list/', {'page_size': 2}, headers=headers)
+        next_page: Any = self.call(async_client.get, first_page.json()['next'], headers=headers)
+        post_id: int = created.json()['id']
+        count_after_create: int = User.objects.get(pk=user_auth.get('user').pk).post_count
+        deleted: Any = self.call(async_client.delete, f'/api/posts/async/{post_id}/', headers=headers)
+        deleted_again: Any = self.call(async_client.delete, f'/api/posts/async/{post_id}/', headers=headers)
+
+        assert created.status_code == 201, 'Post was not created successfully'
+        assert created.json()['title'] == 'async', 'Wrong title data'
+        assert len(first_page.json()['results']) == 2, 'Wrong page size'
+        assert [post['id'] for post in next_page.json()['results']] == [post_id], 'Wrong next page'
+        assert next_page.json()['previous'] is not None, 'No previous cursor'
+        assert deleted.status_code == 204, 'Post was not deleted successfully'
+        assert deleted_again.status_code == 404, 'Status code error'
+        assert Post.objects.count() == 2, 'Wrong number of posts'
+        assert count_after_create == 1, 'Created post is not counted'
+        assert User.objects.get(pk=user_auth.get('user').pk).post_count == 0, 'Deleted post is not counted'
+
+    @pytest.mark.django_db
+    def test_async_list_401(self, async_client: Any) -> None:
+        """
+        Async post list test without authorization
+
+        Params:
+            - async_client: A Django async test client instance.
+
+        Checks:
+            - Response status code is 401
+            - Response data == data from expected response
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        response: Any = self.call(async_client.get, '/api/posts/async/list/')
+
+        assert response.status_code == 401, 'Status code error'
+        assert response.json() == {'detail': 'Authentication credentials were not provided.'}, 'Wrong data'
+
+    @pytest.mark.django_db
+    def test_async_user_list(self, async_client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Async user list test
+
+        Params:
+            - async_client: A Django async test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Response status code is 200
+            - List contains current user
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        response: Any = self.call(
+            async_client.get, '/api/users/async/list/', headers={'Authorization': 'Bearer ' + user_auth.get('token')}
+        )
+
+        assert response.status_code == 200, 'Status code error'
+        assert [user['username'] for user in response.json()['results']] == [user_auth.get('user').username]
+
+    @staticmethod
+    def call(method: Any, *args: tuple, **kwargs: dict) -> Any:
+        """
+        Simple function to make request by async test client from sync test
+
+        Params:
+            - method: request method of async test client
+            - args, kwargs: request arguments
+
+        Returns:
+            Response
+        """
+        async def request() -> Any:
+            return await method(*args, **kwargs)
+        return async_to_sync(request)()
@@ -1,11 +1,27 @@
+import io
+import json
+import time
+from datetime import timedelta
 from typing import Any
+from unittest import mock
 
 import pytest
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
 from rest_framework.utils.serializer_helpers import ReturnDict
 
+from bboom_test.authentication import user_cache
+from posts.cache import post_list_cache
+from posts.counters import create_post
+from posts.models import FeedEntry, Post
 from posts.serializers import PostBaseSerializer
-from tests.factories import PostFactory
-from users.models import User
+from tasks.models import Task
+from tests.factories import PostFactory, UserFactory
+from users.cache import user_list_cache, USERS_SCOPE
+from users.models import Follow, User
 
 
 # ----------------------------------------------------------------
@@ -86,6 +102,78 @@ class TestPost:
         assert post_response.data is not None, 'HttpResponseError'
         assert post_response.data == expected_response
 
+    @pytest.mark.django_db
+    def test_bulk_create_posts(self, client: Any, user_auth: dict[str, Any], settings: Any) -> None:
+        """
+        Bulk post create test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Response status code is 201
+            - Response contains created posts with ids in request order
+            - Posts are inserted with one INSERT per batch
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.POSTS_BULK_CREATE_BATCH_SIZE = 2
+        data: list[dict[str, str]] = [{'title': f'title_{i}', 'body': f'body_{i}'} for i in range(5)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response: Any = client.post(
+                '/api/posts/bulk/',
+                data=data,
+                content_type='application/json',
+                HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+            )
+        inserts: list[dict] = [
+            query for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "posts_post"')
+        ]
+        posts_db: list[Post] = list(Post.objects.filter(user=user_auth.get('user')).order_by('id'))
+
+        assert response.status_code == 201, 'Posts were not created successfully'
+        assert [post['title'] for post in response.data] == [item['title'] for item in data], 'Wrong order'
+        assert [post['id'] for post in response.data] == [post.id for post in posts_db], 'Wrong ids'
+        assert len(inserts) == 3, 'Posts were not inserted by batches'
+
+    @pytest.mark.django_db
+    def test_bulk_create_posts_400(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Bulk post create test with invalid item
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Response status code is 400
+            - Errors are reported per item
+            - No posts are created
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        response: Any = client.post(
+            '/api/posts/bulk/',
+            data=[{'title': 'valid', 'body': 'body'}, {'title': 'x' * 51, 'body': 'body'}],
+            content_type='application/json',
+            HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+        )
+
+        assert response.status_code == 400, 'Status code error'
+        assert response.data[0] == {} and 'title' in response.data[1], 'Wrong errors'
+        assert Post.objects.exists() is False, 'Posts were created'
+
     @pytest.mark.django_db
     def test_post_list(self, client: Any, user_auth: dict[str, Any]) -> None:
         """
@@ -118,7 +206,200 @@ class TestPost:
 
         assert response.status_code == 200, 'Status code error'
         assert response.data is not None, 'HttpResponseError'
-        assert response.data == expected_response, 'Wrong data expected'
+        assert response.data['results'] == expected_response, 'Wrong data expected'
+
+    @pytest.mark.django_db
+    def test_post_list_cursor_pagination(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Post list keyset pagination test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - First page contains page_size posts ordered by id and has next cursor
+            - Next page contains the rest of posts and has previous cursor but no next cursor
+            - Previous cursor leads back to the first page
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        posts: Any = PostFactory.create_batch(5, user=user_auth.get('user'))
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+
+        first_page: Any = client.get('/api/posts/list/', {'page_size': 3}, **headers)
+        next_page: Any = client.get(first_page.data['next'], **headers)
+        previous_page: Any = client.get(next_page.data['previous'], **headers)
+
+        assert first_page.status_code == 200, 'Status code error'
+        assert [post['id'] for post in first_page.data['results']] == [post.id for post in posts[:3]], 'Wrong page'
+        assert first_page.data['next'] is not None, 'No next cursor'
+        assert [post['id'] for post in next_page.data['results']] == [post.id for post in posts[3:]], 'Wrong page'
+        assert next_page.data['next'] is None, 'Unexpected next cursor'
+        assert previous_page.data['results'] == first_page.data['results'], 'Wrong previous page'
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('posts_count', [1, 20])
+    def test_post_list_num_queries(
+            self, client: Any, user_auth: dict[str, Any], django_assert_num_queries: Any, posts_count: int
+    ) -> None:
+        """
+        Post list query count regression test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - django_assert_num_queries: A fixture to count executed queries
+            - posts_count: number of posts of user
+
+        Checks:
+            - List is served with 2 queries (authenticated user, posts page) whatever the number of posts
+            - Every post has author's username
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = user_auth.get('user')
+        PostFactory.create_batch(posts_count, user=user)
+
+        with django_assert_num_queries(2):
+            response: Any = client.get(
+                '/api/posts/list/',
+                HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+            )
+
+        assert response.status_code == 200, 'Status code error'
+        assert len(response.data['results']) == posts_count, 'Wrong number of posts'
+        assert {post['user'] for post in response.data['results']} == {user.username}, 'Wrong author'
+
+    @pytest.mark.django_db
+    def test_post_list_cache(self, client: Any, user_auth: dict[str, Any], django_assert_num_queries: Any) -> None:
+        """
+        Post list cache test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - django_assert_num_queries: A fixture to count executed queries
+
+        Checks:
+            - Repeated request does not query posts and authenticated user
+            - Created and deleted posts invalidate cached list
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        PostFactory.create(user=user_auth.get('user'))
+        client.get('/api/posts/list/', **headers)
+
+        with django_assert_num_queries(0):
+            cached_response: Any = client.get('/api/posts/list/', **headers)
+        create_response: Any = client.post(
+            '/api/posts/create/', data={'title': 'new', 'body': 'new'}, content_type='application/json', **headers
+        )
+        after_create: Any = client.get('/api/posts/list/', **headers)
+        client.delete(f"/api/posts/{create_response.data['id']}/", **headers)
+        after_delete: Any = client.get('/api/posts/list/', **headers)
+
+        assert len(cached_response.data['results']) == 1, 'Wrong cached list'
+        assert len(after_create.data['results']) == 2, 'Cache not invalidated after create'
+        assert len(after_delete.data['results']) == 1, 'Cache not invalidated after delete'
+
+    @pytest.mark.django_db
+    def test_post_list_conditional(
+            self, client: Any, user_auth: dict[str, Any], django_assert_num_queries: Any
+    ) -> None:
+        """
+        Post list conditional request test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - django_assert_num_queries: A fixture to count executed queries
+
+        Checks:
+            - Response has ETag and Last-Modified headers
+            - Request with If-None-Match is answered with 304 without queries
+            - Request with If-Modified-Since is answered with 304
+            - ETag changes after post is created
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        PostFactory.create(user=user_auth.get('user'))
+        client.get('/api/posts/list/', **headers)
+        # Last-Modified is sent after second of last write is over
+        with mock.patch('bboom_test.cache.time.time', return_value=time.time() + 1):
+            response: Any = client.get('/api/posts/list/', **headers)
+
+            with django_assert_num_queries(0):
+                not_modified: Any = client.get('/api/posts/list/', HTTP_IF_NONE_MATCH=response['ETag'], **headers)
+            not_modified_since: Any = client.get(
+                '/api/posts/list/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'], **headers
+            )
+        client.post('/api/posts/create/', data={'title': 't', 'body': 'b'}, content_type='application/json', **headers)
+        modified: Any = client.get('/api/posts/list/', HTTP_IF_NONE_MATCH=response['ETag'], **headers)
+
+        assert response.has_header('ETag') and response.has_header('Last-Modified'), 'No validators'
+        assert not_modified.status_code == 304, 'Status code error'
+        assert not_modified_since.status_code == 304, 'Status code error'
+        assert modified.status_code == 200 and len(modified.data['results']) == 2, 'Stale response'
+        assert modified['ETag'] != response['ETag'], 'ETag not changed'
+
+    @pytest.mark.django_db
+    def test_post_list_modified_in_same_second(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Post list conditional request test with writes in the same second
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Last-Modified is not sent until second of last write is over
+            - If-Modified-Since with the second of earlier write is answered with 200 after another write
+            - Last-Modified is rounded up and If-Modified-Since with it is answered with 304
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        second: int = int(time.time()) + 10
+        data: dict[str, str] = {'title': 't', 'body': 'b'}
+        with mock.patch('bboom_test.cache.time.time', return_value=second + 0.2):
+            client.post('/api/posts/create/', data=data, content_type='application/json', **headers)
+        with mock.patch('bboom_test.cache.time.time', return_value=second + 0.5):
+            same_second: Any = client.get('/api/posts/list/', **headers)
+        with mock.patch('bboom_test.cache.time.time', return_value=second + 0.7):
+            client.post('/api/posts/create/', data=data, content_type='application/json', **headers)
+        with mock.patch('bboom_test.cache.time.time', return_value=second + 1.5):
+            modified: Any = client.get('/api/posts/list/', HTTP_IF_MODIFIED_SINCE=http_date(second), **headers)
+            not_modified: Any = client.get(
+                '/api/posts/list/', HTTP_IF_MODIFIED_SINCE=modified['Last-Modified'], **headers
+            )
+
+        assert same_second.has_header('ETag') and not same_second.has_header('Last-Modified'), 'Wrong validators'
+        assert modified.status_code == 200 and len(modified.data['results']) == 2, 'Stale response'
+        assert modified['Last-Modified'] == http_date(second + 1), 'Last-Modified not rounded up'
+        assert not_modified.status_code == 304, 'Status code error'
 
     @pytest.mark.django_db
     def test_post_list_401(self, client: Any, user_not_auth: User) -> None:
@@ -206,4 +487,484 @@ class TestPost:
 
         assert delete_response.status_code == 401, 'Board was deleted successfully'
         assert delete_response.data is not None, 'HttpResponseError'
-        assert delete_response.data == expected_response, 'Wrong data'
\ No newline at end of file
+        assert delete_response.data == expected_response, 'Wrong data'
+
+    @pytest.mark.django_db
+    def test_bulk_delete_posts(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Bulk post delete by ids test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Response status code is 200
+            - Response contains number of deleted posts
+            - Posts are soft deleted with one UPDATE statement without SELECT of posts
+            - Posts of another user are not deleted
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        posts: Any = PostFactory.create_batch(3, user=user_auth.get('user'))
+        foreign_post: Post = PostFactory.create(user=UserFactory.create())
+
+        with CaptureQueriesContext(connection) as queries:
+            response: Any = client.post(
+                '/api/posts/bulk/delete/',
+                data={'ids': [posts[0].id, posts[1].id, foreign_post.id]},
+                content_type='application/json',
+                HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+            )
+        posts_queries: list[str] = [query['sql'] for query in queries.captured_queries if 'posts_post' in query['sql']]
+
+        assert response.status_code == 200, 'Status code error'
+        assert response.data == {'deleted': 2}, 'Wrong deleted count'
+        assert len(posts_queries) == 1 and posts_queries[0].startswith('UPDATE'), 'Posts were not deleted in one query'
+        assert list(Post.objects.values_list('id', flat=True).order_by('id')) == [posts[2].id, foreign_post.id]
+
+    @pytest.mark.django_db
+    def test_bulk_delete_posts_by_filter(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Bulk post delete by filter test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Only posts matching filter are deleted
+            - Request without criteria is rejected with 400 status code
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        PostFactory.create_batch(2, user=user_auth.get('user'), body='buy cheap pills')
+        post: Post = PostFactory.create(user=user_auth.get('user'))
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+
+        response: Any = client.post(
+            '/api/posts/bulk/delete/', data={'body_contains': 'pills'}, content_type='application/json', **headers
+        )
+        response_400: Any = client.post('/api/posts/bulk/delete/', data={}, content_type='application/json', **headers)
+
+        assert response.data == {'deleted': 2}, 'Wrong deleted count'
+        assert list(Post.objects.values_list('id', flat=True)) == [post.id], 'Wrong posts deleted'
+        assert response_400.status_code == 400, 'Status code error'
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('output', ['ndjson', 'json'])
+    def test_export_posts(self, client: Any, user_auth: dict[str, Any], settings: Any, output: str) -> None:
+        """
+        Posts streaming export test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - settings: A fixture to override django settings
+            - output: export format
+
+        Checks:
+            - Response status code is 200 and response is streamed by chunks
+            - Exported posts are equal to posts list data
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.POSTS_EXPORT_CHUNK_SIZE = 2
+        posts: Any = PostFactory.create_batch(5, user=user_auth.get('user'))
+        PostFactory.create(user=UserFactory.create())
+
+        response: Any = client.get(
+            '/api/posts/export/',
+            {'output': output},
+            HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+        )
+        chunks: list[bytes] = list(response.streaming_content)
+        content: str = b''.join(chunks).decode()
+        exported: list[dict] = (
+            [json.loads(line) for line in content.splitlines()] if output == 'ndjson' else json.loads(content)
+        )
+
+        assert response.status_code == 200, 'Status code error'
+        assert response.streaming and len(chunks) >= 3, 'Response was not streamed by chunks'
+        assert exported == [dict(PostBaseSerializer(post).data) for post in posts], 'Wrong data exported'
+
+    @pytest.mark.django_db
+    def test_search_posts(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Posts full text search test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Response status code is 200
+            - Only matching posts of current user are found, title match is ranked first
+            - scope=all finds posts of all users
+            - Updated and deleted posts are reindexed
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = user_auth.get('user')
+        body_match: Post = PostFactory.create(user=user, title='misc', body='some words about python')
+        title_match: Post = PostFactory.create(user=user, title='python tips', body='short')
+        renamed: Post = PostFactory.create(user=user, title='java', body='jvm')
+        foreign_match: Post = PostFactory.create(user=UserFactory.create(), title='python', body='foreign')
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+
+        mine: Any = client.get('/api/posts/search/', {'q': 'python'}, **headers)
+        mine_ids: list[int] = [post['id'] for post in mine.data['results']]
+        expected_ids: list[int] = [title_match.id, body_match.id]
+        everyone: Any = client.get('/api/posts/search/', {'q': 'python', 'scope': 'all'}, **headers)
+        renamed.title = 'python'
+        renamed.save()
+        body_match.delete()
+        reindexed: Any = client.get('/api/posts/search/', {'q': 'python'}, **headers)
+
+        assert mine.status_code == 200, 'Status code error'
+        assert mine_ids == expected_ids, 'Wrong results'
+        assert foreign_match.id in {post['id'] for post in everyone.data['results']}, 'Global search failed'
+        assert {post['id'] for post in reindexed.data['results']} == {title_match.id, renamed.id}, 'Index not updated'
+
+    @pytest.mark.django_db
+    def test_index_advisor(self) -> None:
+        """
+        Index advisor command test
+
+        Checks:
+            - All replayed endpoints are reported
+            - Posts endpoints read posts table by index
+            - Replayed writes are rolled back
+            - Replayed writes do not bump versioned caches and do not change times of last writes
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = UserFactory.create()
+        PostFactory.create_batch(3, user=user)
+        PostFactory.create_batch(3, user=UserFactory.create())
+        output: io.StringIO = io.StringIO()
+        caches: tuple = (post_list_cache, user_list_cache, user_cache.versions)
+        scopes: tuple = (user.pk, USERS_SCOPE, user.pk)
+
+        def get_states() -> list[tuple]:
+            return [(cache.get_version(scope), cache.get_modified(scope)) for cache, scope in zip(caches, scopes)]
+
+        states: list[tuple] = get_states()
+        call_command('index_advisor', user=user.username, stdout=output, no_color=True)
+        report: str = output.getvalue()
+
+        assert 'GET /api/posts/list/' in report and 'POST /api/posts/bulk/delete/' in report, 'Endpoint not replayed'
+        assert 'SEQ SCAN posts_post' not in report, 'Posts table is read by sequential scan'
+        assert Post.objects.count() == 6, 'Replayed writes are not rolled back'
+        assert get_states() == states, 'Replayed writes reached versioned caches'
+
+    @pytest.mark.django_db
+    def test_seed_data(self) -> None:
+        """
+        Seed data command test
+
+        Checks:
+            - Requested numbers of users and posts are created, users have post counts
+            - Users share one password hash and can log in with given password
+            - Existing prefix is rejected
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        call_command(
+            'seed_data', users=5, posts_per_user=3, batch_size=4, workers=1, password='secret', stdout=io.StringIO()
+        )
+        users: list[User] = list(User.objects.filter(username__startswith='seed_'))
+
+        assert len(users) == 5, 'Wrong number of users'
+        assert Post.objects.filter(user__in=users).count() == 15, 'Wrong number of posts'
+        assert len({user.password for user in users}) == 1, 'Password is hashed more than once'
+        assert {user.post_count for user in users} == {3}, 'Wrong post counts'
+        assert users[0].check_password('secret'), 'Wrong password'
+        with pytest.raises(CommandError):
+            call_command('seed_data', users=1, workers=1, stdout=io.StringIO())
+
+    @pytest.mark.django_db
+    def test_post_count(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Post counter test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - post_count of author follows API create, bulk create, delete and bulk delete and UI add and delete
+            - Users list shows post counts
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = user_auth.get('user')
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+
+        def post_count() -> int:
+            return User.objects.get(pk=user.pk).post_count
+
+        created: Any = client.post('/api/posts/create/', {'title': 'title', 'body': 'body'}, **headers)
+        client.post(
+            '/api/posts/bulk/', [{'title': f'title {number}', 'body': 'body'} for number in range(3)],
+            content_type='application/json', **headers
+        )
+        assert post_count() == 4, 'Created posts are not counted'
+
+        client.delete(f"/api/posts/{created.data['id']}/", **headers)
+        client.delete(f"/api/posts/{created.data['id']}/", **headers)
+        client.post('/api/posts/bulk/delete/', {'title': 'title 0'}, content_type='application/json', **headers)
+        assert post_count() == 2, 'Deleted posts are not counted'
+
+        client.force_login(user)
+        client.post('/ui/posts/add/', {'title': 'title', 'body': 'body'})
+        assert post_count() == 3, 'UI post is not counted'
+        client.get(f'/ui/posts/{Post.objects.filter(user=user).latest("id").pk}/delete/')
+        assert post_count() == 2, 'UI deletion is not counted'
+
+        users: Any = client.get('/api/users/list/', **headers)
+        assert users.data['results'][0]['post_count'] == 2, 'Users list has no post count'
+        assert '(2)' in client.get('/ui/user_list/').content.decode(), 'UI users list has no post count'
+
+    @pytest.mark.django_db
+    def test_post_count_in_users_lists(
+            self, client: Any, user_auth: dict[str, Any], settings: Any, django_capture_on_commit_callbacks: Any
+    ) -> None:
+        """
+        Post counts in cached users lists test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - settings: A fixture to override django settings
+            - django_capture_on_commit_callbacks: A fixture to run callbacks of commit of test transaction
+
+        Checks:
+            - Post writes do not invalidate users lists: ETag is answered with 304 and cached page is served
+            - Changed post count is shown after MAX_AGE of users lists
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        client.force_login(user_auth.get('user'))
+        now: float = time.time()
+        with mock.patch('bboom_test.cache.time.time', return_value=now):
+            users: Any = client.get('/api/users/list/', **headers)
+            client.get('/ui/user_list/')
+            with django_capture_on_commit_callbacks(execute=True):
+                client.post('/api/posts/create/', {'title': 'title', 'body': 'body'}, **headers)
+            not_modified: Any = client.get('/api/users/list/', HTTP_IF_NONE_MATCH=users['ETag'], **headers)
+            cached_page: str = client.get('/ui/user_list/').content.decode()
+        with mock.patch('bboom_test.cache.time.time', return_value=now + settings.VERSIONED_CACHE['MAX_AGE']['users']):
+            modified: Any = client.get('/api/users/list/', HTTP_IF_NONE_MATCH=users['ETag'], **headers)
+            page: str = client.get('/ui/user_list/').content.decode()
+
+        assert not_modified.status_code == 304, 'Users list is invalidated by post write'
+        assert '(0)' in cached_page, 'Cached users page is invalidated by post write'
+        assert modified.status_code == 200 and modified.data['results'][0]['post_count'] == 1, 'Stale post count'
+        assert '(1)' in page, 'Stale post count in UI users list'
+
+    @pytest.mark.django_db
+    def test_reconcile_post_counts(self) -> None:
+        """
+        Post counters reconciliation command test
+
+        Checks:
+            - Wrong post counts are fixed in batches, correct ones are not written
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        users: list[User] = UserFactory.create_batch(3)
+        PostFactory.create_batch(2, user=users[0])
+        PostFactory.create_batch(1, user=users[2])
+        User.objects.filter(pk=users[2].pk).update(post_count=5)
+        output: io.StringIO = io.StringIO()
+
+        call_command('reconcile_post_counts', batch_size=2, stdout=output, no_color=True)
+
+        counts: list[int] = list(
+            User.objects.filter(pk__in=[user.pk for user in users]).order_by('pk').values_list('post_count', flat=True)
+        )
+        assert counts == [2, 0, 1], 'Post counts are not fixed'
+        assert 'Fixed post_count of 2 users' in output.getvalue(), 'Wrong number of fixed users'
+
+    @pytest.mark.django_db
+    def test_feed(self, client: Any, user_auth: dict[str, Any], settings: Any, run_tasks: Any) -> None:
+        """
+        Home feed test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - settings: A fixture to override django settings
+            - run_tasks: A fixture to run queued background tasks
+
+        Checks:
+            - Follow adds latest posts of author to feed, follow of self, unknown or followed user is handled
+            - New posts are added to feeds of followers, posts of prolific authors are read from posts table
+            - Feed is ordered newest first and paginated by cursor in both directions
+            - Unfollow removes posts of author from feed
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.FEED_PULL_MIN_POSTS = 3
+        settings.FEED_BACKFILL_POSTS = 2
+        user: User = user_auth.get('user')
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        author, prolific = UserFactory.create_batch(2)
+        old_posts: list[Post] = PostFactory.create_batch(3, user=author)
+        PostFactory.create(user=user)
+
+        assert client.post(f'/api/users/{author.pk}/follow/', **headers).status_code == 201, 'Follow failed'
+        assert client.post(f'/api/users/{author.pk}/follow/', **headers).status_code == 200, 'Second follow failed'
+        assert client.post(f'/api/users/{user.pk}/follow/', **headers).status_code == 400, 'Self follow allowed'
+        assert client.post('/api/users/0/follow/', **headers).status_code == 404, 'Unknown user followed'
+        client.post(f'/api/users/{prolific.pk}/follow/', **headers)
+
+        new_post: Post = create_post(user=author, title='title', body='body')
+        prolific_posts: list[Post] = []
+        for _ in range(4):
+            prolific_posts.append(create_post(user=prolific, title='title', body='body'))
+            run_tasks()
+        assert FeedEntry.objects.filter(owner=user, post__user=prolific).count() == 2, 'Prolific author fanned out'
+
+        def read_feed(url: str) -> tuple[list[int], Any]:
+            response: Any = client.get(url, **headers)
+            assert response.status_code == 200, 'Request failed'
+            return [post['id'] for post in response.data['results']], response
+
+        expected: list[int] = sorted(
+            [old_posts[1].pk, old_posts[2].pk, new_post.pk, *(post.pk for post in prolific_posts)], reverse=True
+        )
+        pages: list[list[int]] = []
+        url: str = '/api/posts/feed/?page_size=3'
+        while url:
+            ids, response = read_feed(url)
+            pages.append(ids)
+            url = response.data['next']
+        assert sum(pages, []) == expected, 'Wrong feed'
+        assert read_feed(response.data['previous'])[0] == pages[-2], 'Wrong previous page'
+
+        assert client.delete(f'/api/users/{prolific.pk}/follow/', **headers).status_code == 204, 'Unfollow failed'
+        assert read_feed('/api/posts/feed/')[0] == [new_post.pk, old_posts[2].pk, old_posts[1].pk], (
+            'Posts of unfollowed author are in feed'
+        )
+
+    @pytest.mark.django_db
+    def test_purge_deleted_posts(self, client: Any, user_auth: dict[str, Any], run_tasks: Any) -> None:
+        """
+        Soft delete and purge of deleted posts test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - run_tasks: A fixture to run queued background tasks
+
+        Checks:
+            - Deleted posts are kept as tombstones hidden from posts list and feed
+            - Purge removes only tombstones older than given age by batches, with their feed entries
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = user_auth.get('user')
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        follower: User = UserFactory.create()
+        Follow.objects.create(follower=follower, author=user)
+        posts: list[Post] = [create_post(user=user, title=f'title {number}', body='body') for number in range(4)]
+        run_tasks()
+
+        client.post(
+            '/api/posts/bulk/delete/', {'ids': [post.pk for post in posts[:3]]}, content_type='application/json',
+            **headers
+        )
+        listed: Any = client.get('/api/posts/list/', **headers)
+        assert [post['id'] for post in listed.data['results']] == [posts[3].pk], 'Deleted posts are listed'
+        assert Post.all_objects.filter(is_deleted=True, deleted_at__isnull=False).count() == 3, 'No tombstones'
+        assert list(Post.objects.filter(feed_entries__owner=follower)) == [posts[3]], 'Deleted posts are in feed'
+
+        call_command('purge_deleted_posts', older_than=3600, stdout=io.StringIO())
+        assert Post.all_objects.count() == 4, 'Recently deleted posts are purged'
+
+        output: io.StringIO = io.StringIO()
+        call_command('purge_deleted_posts', older_than=0, batch_size=2, sleep=0, stdout=output, no_color=True)
+        assert list(Post.all_objects.all()) == [posts[3]], 'Tombstones are not purged'
+        assert FeedEntry.objects.filter(owner=follower).count() == 1, 'Feed entries of purged posts are not removed'
+        assert 'Purged 3 deleted posts' in output.getvalue(), 'Wrong number of purged posts'
+
+    @pytest.mark.django_db
+    def test_purge_recurring_task(self, user: User, settings: Any) -> None:
+        """
+        Recurring purge of deleted posts by background workers test
+
+        Params:
+            - user: A fixture that create user instance
+            - settings: A fixture to override django settings
+
+        Checks:
+            - run_workers queues purge task, it removes old tombstones by batches and queues itself for next interval
+            - Purge task is not queued again while it is queued
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.POSTS_PURGE = {'INTERVAL': 600.0, 'OLDER_THAN': 3600.0, 'BATCH_SIZE': 2, 'SLEEP': 0.0}
+        posts: list[Post] = [create_post(user=user, title='title', body='body') for _ in range(4)]
+        Post.all_objects.filter(pk__in=[post.pk for post in posts[:3]]).update(
+            is_deleted=True, deleted_at=timezone.now() - timedelta(hours=2)
+        )
+        Post.all_objects.filter(pk=posts[3].pk).update(is_deleted=True, deleted_at=timezone.now())
+
+        call_command('run_workers', once=True, stdout=io.StringIO())
+        assert list(Post.all_objects.all()) == [posts[3]], 'Old tombstones are not purged'
+        queued: Task = Task.objects.get(name='posts.purge.purge_deleted_posts')
+        assert queued.run_at > timezone.now() + timedelta(seconds=500), 'Purge is not queued for next interval'
+
+        call_command('run_workers', once=True, stdout=io.StringIO())
+        assert list(Task.objects.values_list('pk', flat=True)) == [queued.pk], 'Purge is queued twice'
@@ -0,0 +1,114 @@
+import time
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.db import OperationalError, transaction
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import enqueue
+from tasks.worker import Worker
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# task functions, imported by workers by dotted path
+def rename_user(user_id: int, first_name: str) -> None:
+    User.objects.filter(pk=user_id).update(first_name=first_name)
+
+
+def fail_until_renamed(user_id: int) -> None:
+    if not User.objects.filter(pk=user_id, first_name='renamed').exists():
+        raise RuntimeError('User is not renamed')
+
+
+# ----------------------------------------------------------------
+# background tasks tests
+class TestTasks:
+    @pytest.mark.django_db
+    def test_retry(self, user: User, settings: Any, run_tasks: Any) -> None:
+        """
+        Queued task retries test
+
+        Params:
+            - user: A fixture that create user instance
+            - settings: A fixture to override django settings
+            - run_tasks: A fixture to run queued background tasks
+
+        Checks:
+            - Task queued in rolled back transaction is not run
+            - Failed task is retried after backoff, succeeded task is deleted
+            - Task is marked failed after max attempts
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.TASKS = {**settings.TASKS, 'MAX_ATTEMPTS': 2, 'BACKOFF_BASE': 10.0}
+        with pytest.raises(RuntimeError), transaction.atomic():
+            enqueue(rename_user, user.pk, 'rolled back')
+            raise RuntimeError
+        assert not Task.objects.exists(), 'Task of rolled back transaction is queued'
+
+        task: Task = enqueue(fail_until_renamed, user.pk)
+        assert run_tasks() == (0, 1), 'Task did not fail'
+        task.refresh_from_db()
+        assert task.attempts == 1 and not task.failed and 'User is not renamed' in task.last_error, 'Wrong state'
+        assert task.run_at > timezone.now() + timedelta(seconds=9), 'No backoff'
+        assert run_tasks() == (0, 0), 'Task is retried before backoff'
+
+        Task.objects.update(run_at=timezone.now())
+        assert run_tasks() == (0, 1), 'Task is not retried'
+        task.refresh_from_db()
+        assert task.failed and task.attempts == 2, 'Task is not failed after max attempts'
+
+        enqueue('tests.tasks.queue_test.rename_user', user.pk, 'renamed')
+        assert run_tasks() == (1, 0), 'Task did not succeed'
+        Task.objects.update(run_at=timezone.now(), failed=False, max_attempts=3)
+        assert run_tasks() == (1, 0), 'Retried task did not succeed'
+        assert not Task.objects.exists(), 'Succeeded tasks are not deleted'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_worker_threads(self, user: User, settings: Any) -> None:
+        """
+        Worker threads test
+
+        Params:
+            - user: A fixture that create user instance
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Committed tasks are run by worker threads
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        # in memory test database of SQLite raises "table is locked" instead of waiting for concurrent transaction:
+        # failed tasks are retried at once and tasks whose claim failed are claimed again soon
+        settings.TASKS = {**settings.TASKS, 'LEASE': 1.0, 'MAX_ATTEMPTS': 100, 'BACKOFF_BASE': 0.0}
+
+        def has_tasks() -> bool:
+            try:
+                return Task.objects.exists()
+            except OperationalError:
+                return True
+
+        with transaction.atomic():
+            for number in range(10):
+                enqueue(rename_user, user.pk, f'name {number}')
+        worker: Worker = Worker(threads=2, poll_interval=0.05)
+        worker.start()
+        try:
+            deadline: float = time.monotonic() + 10
+            while has_tasks() and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            worker.stop(timeout=10)
+        assert not Task.objects.exists(), 'Tasks are not run'
+        assert User.objects.get(pk=user.pk).first_name.startswith('name'), 'Task had no effect'
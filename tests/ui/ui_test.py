@@ -0,0 +1,256 @@
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from posts.cache import post_list_cache
+from posts.models import Post
+from tests.factories import PostFactory, UserFactory
+from users.cache import user_list_cache
+from users.models import User
+
+
+# ----------------------------------------------------------------
+# ui tests
+class TestUi:
+    @pytest.mark.django_db
+    def test_user_posts_cache(self, client: Any, django_assert_num_queries: Any) -> None:
+        """
+        User posts page cache test
+
+        Params:
+            - client: A Django test client instance.
+            - django_assert_num_queries: A fixture to count executed queries
+
+        Checks:
+            - Second page load does not query posts and user
+            - Page shows post added by add_post view
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = UserFactory.create()
+        PostFactory.create(user=user, title='first_post')
+        client.force_login(user)
+        client.get(f'/ui/posts/{user.pk}/')
+
+        with django_assert_num_queries(2):
+            cached_response: Any = client.get(f'/ui/posts/{user.pk}/')
+        client.post('/ui/posts/add/', {'title': 'second_post', 'body': 'body'})
+        response: Any = client.get(f'/ui/posts/{user.pk}/')
+
+        assert cached_response.status_code == 200, 'Wrong status code'
+        assert 'first_post' in cached_response.content.decode(), 'Post not found'
+        assert 'second_post' in response.content.decode(), 'Cache not invalidated'
+
+    @pytest.mark.django_db
+    def test_user_posts_conditional(self, client: Any) -> None:
+        """
+        User posts page conditional request test
+
+        Params:
+            - client: A Django test client instance.
+
+        Checks:
+            - Request with If-None-Match is answered with 304
+            - Another user gets another ETag (page differs for owner)
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = UserFactory.create()
+        PostFactory.create(user=user)
+        client.force_login(user)
+        response: Any = client.get(f'/ui/posts/{user.pk}/')
+
+        not_modified: Any = client.get(f'/ui/posts/{user.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        client.force_login(UserFactory.create())
+        other_user: Any = client.get(f'/ui/posts/{user.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert not_modified.status_code == 304, 'Wrong status code'
+        assert other_user.status_code == 200, 'Wrong status code'
+
+    @pytest.mark.django_db
+    def test_user_posts_404(self, client: Any) -> None:
+        """
+        User posts page test for not existing user
+
+        Params:
+            - client: A Django test client instance.
+
+        Checks:
+            - Response status code is 404
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        response: Any = client.get('/ui/posts/100500/')
+
+        assert response.status_code == 404, 'Wrong status code'
+
+    @pytest.mark.django_db
+    def test_delete_foreign_post(self, client: Any) -> None:
+        """
+        Delete post test for post of another user
+
+        Params:
+            - client: A Django test client instance.
+
+        Checks:
+            - Response status code is 404
+            - Post is not deleted
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        post: Post = PostFactory.create(user=UserFactory.create())
+        client.force_login(UserFactory.create())
+
+        response: Any = client.get(f'/ui/posts/{post.pk}/delete/')
+
+        assert response.status_code == 404, 'Wrong status code'
+        assert Post.objects.filter(pk=post.pk).exists(), 'Post was deleted'
+
+    @pytest.mark.django_db
+    def test_user_posts_pagination(self, client: Any, settings: Any) -> None:
+        """
+        User posts page pagination test
+
+        Params:
+            - client: A Django test client instance.
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Page contains only posts of requested page
+            - Page number out of range gives last page
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.UI_PAGE_SIZE = 2
+        user: User = UserFactory.create()
+        posts: list[Post] = PostFactory.create_batch(5, user=user)
+        client.force_login(user)
+
+        second_page: str = client.get(f'/ui/posts/{user.pk}/', {'page': 2}).content.decode()
+        last_page: str = client.get(f'/ui/posts/{user.pk}/', {'page': 100}).content.decode()
+
+        assert posts[2].title in second_page and posts[3].title in second_page, 'Posts of page not found'
+        assert posts[0].title not in second_page and posts[4].title not in second_page, 'Posts of another page'
+        assert 'Страница 2 из 3' in second_page, 'Wrong page navigation'
+        assert posts[4].title in last_page, 'Last page expected'
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('page_size', [2, 50])
+    def test_user_posts_num_queries(
+            self, client: Any, settings: Any, django_assert_num_queries: Any, page_size: int
+    ) -> None:
+        """
+        User posts page number of queries test
+
+        Params:
+            - client: A Django test client instance.
+            - settings: A fixture to override django settings
+            - django_assert_num_queries: A fixture to count executed queries
+            - page_size: number of posts per page
+
+        Checks:
+            - Not cached page takes 5 queries whatever the page size: session, current user, user, count, page
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.UI_PAGE_SIZE = page_size
+        user: User = UserFactory.create()
+        PostFactory.create_batch(60, user=user)
+        client.force_login(user)
+
+        with django_assert_num_queries(5):
+            response: Any = client.get(f'/ui/posts/{user.pk}/', {'page': 2})
+
+        assert response.status_code == 200, 'Wrong status code'
+
+    @pytest.mark.django_db
+    def test_user_list_pagination(self, client: Any, settings: Any) -> None:
+        """
+        User list page pagination test
+
+        Params:
+            - client: A Django test client instance.
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Page contains only users of requested page
+            - Cached page is invalidated when user is added
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.UI_PAGE_SIZE = 1
+        users: list[User] = UserFactory.create_batch(2)
+        client.force_login(users[0])
+
+        second_page: str = client.get('/ui/user_list/', {'page': 2}).content.decode()
+        new_user: User = UserFactory.create()
+        third_page: str = client.get('/ui/user_list/', {'page': 3}).content.decode()
+
+        assert users[1].username in second_page and f'/ui/posts/{users[0].pk}/' not in second_page, 'Wrong page'
+        assert new_user.username in third_page, 'Cache not invalidated'
+
+    @pytest.mark.django_db
+    def test_cached_pages_read_cache_once(self, client: Any, django_assert_num_queries: Any) -> None:
+        """
+        Cached users and user posts pages test with default cache settings
+
+        Params:
+            - client: A Django test client instance.
+            - django_assert_num_queries: A fixture to count executed queries
+
+        Checks:
+            - Cached pages take 2 queries: session and current user
+            - Version and all cached values of page are read by one get_many
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = UserFactory.create()
+        PostFactory.create(user=user, title='first_post')
+        client.force_login(user)
+        client.get('/ui/user_list/')
+        client.get(f'/ui/posts/{user.pk}/')
+
+        with mock.patch.object(user_list_cache, 'backend', mock.Mock(wraps=user_list_cache.backend)) as users_backend:
+            with django_assert_num_queries(2):
+                users_page: Any = client.get('/ui/user_list/')
+        with mock.patch.object(post_list_cache, 'backend', mock.Mock(wraps=post_list_cache.backend)) as posts_backend:
+            with django_assert_num_queries(2):
+                posts_page: Any = client.get(f'/ui/posts/{user.pk}/')
+
+        assert user.username in users_page.content.decode(), 'User not found'
+        assert 'first_post' in posts_page.content.decode(), 'Post not found'
+        assert [call[0] for call in users_backend.method_calls] == ['get_many'], 'Users cache is read more than once'
+        assert [call[0] for call in posts_backend.method_calls] == ['get_many'], 'Posts cache is read more than once'
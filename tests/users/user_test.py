@@ -1,10 +1,22 @@
-from typing import Any
+import io
+from typing import Any, Optional
+from unittest import mock
 
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import ErrorDetail
+from rest_framework_simplejwt.tokens import AccessToken
 
+from bboom_test.authentication import UserCache
+
+from posts.counters import create_post, delete_posts
+from posts.models import FeedEntry, Post
+from tasks.models import Task
 from tests.factories import UserFactory
-from users.models import User
+from users.deletion import delete_user
+from users.models import Follow, User
 
 
 # ----------------------------------------------------------------
@@ -149,6 +161,102 @@ class TestUser:
         assert response_auth_2.data is not None, 'Wrong response'
         assert response_auth_2.data == expected_response, 'Wrong data expected'
 
+    @pytest.mark.django_db
+    def test_user_list_cursor_pagination(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        User list keyset pagination test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Response status code is 200
+            - Pages are ordered by id and do not overlap
+            - Last page has no next cursor
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        UserFactory.create_batch(3)
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        expected_ids: list[int] = list(User.objects.order_by('id').values_list('id', flat=True))
+
+        first_page: Any = client.get('/api/users/list/', {'page_size': 2}, **headers)
+        next_page: Any = client.get(first_page.data['next'], **headers)
+
+        assert first_page.status_code == 200, 'Wrong status code'
+        assert [user['id'] for user in first_page.data['results']] == expected_ids[:2], 'Wrong page'
+        assert [user['id'] for user in next_page.data['results']] == expected_ids[2:], 'Wrong page'
+        assert next_page.data['next'] is None, 'Unexpected next cursor'
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('users_count', [1, 20])
+    def test_user_list_num_queries(
+            self, client: Any, user_auth: dict[str, Any], django_assert_num_queries: Any, users_count: int
+    ) -> None:
+        """
+        User list query count regression test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - django_assert_num_queries: A fixture to count executed queries
+            - users_count: number of additional users
+
+        Checks:
+            - List is served with 2 queries (authenticated user, users page) whatever the number of users
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        UserFactory.create_batch(users_count)
+
+        with django_assert_num_queries(2):
+            response: Any = client.get(
+                '/api/users/list/',
+                HTTP_AUTHORIZATION='Bearer ' + user_auth.get('token')
+            )
+
+        assert response.status_code == 200, 'Wrong status code'
+        assert len(response.data['results']) == users_count + 1, 'Wrong number of users'
+
+    @pytest.mark.django_db
+    def test_user_list_conditional(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        User list conditional request test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - Request with If-None-Match is answered with 304
+            - Registration of new user changes ETag
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        response: Any = client.get('/api/users/list/', **headers)
+
+        not_modified: Any = client.get('/api/users/list/', HTTP_IF_NONE_MATCH=response['ETag'], **headers)
+        self.build_and_reg(client)
+        modified: Any = client.get('/api/users/list/', HTTP_IF_NONE_MATCH=response['ETag'], **headers)
+
+        assert not_modified.status_code == 304, 'Wrong status code'
+        assert modified.status_code == 200, 'Wrong status code'
+        assert len(modified.data['results']) == 2, 'Stale response'
+
     @staticmethod
     @pytest.mark.django_db
     def build_and_reg(client) -> tuple[Any, Any]:
@@ -194,3 +302,298 @@ class TestUser:
             format='json'
         )
         return response_auth
+
+    @pytest.mark.django_db
+    def test_auth_user_cache(self, client: Any, user_auth: dict[str, Any], django_assert_num_queries: Any) -> None:
+        """
+        Authenticated user cache test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - django_assert_num_queries: A fixture to count executed queries
+
+        Checks:
+            - Repeated API request does not query authenticated user
+            - Deactivated and deleted users are not authenticated by cached copy
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        user: User = user_auth.get('user')
+        client.get('/api/posts/list/', **headers)
+
+        with django_assert_num_queries(0):
+            cached_response: Any = client.get('/api/posts/list/', **headers)
+        user.is_active = False
+        user.save()
+        inactive_response: Any = client.get('/api/posts/list/', **headers)
+        user.is_active = True
+        user.save()
+        client.get('/api/posts/list/', **headers)
+        user.delete()
+        deleted_response: Any = client.get('/api/posts/list/', **headers)
+
+        assert cached_response.status_code == 200, 'Status code error'
+        assert inactive_response.status_code == 401, 'Inactive user is authenticated'
+        assert deleted_response.status_code == 401, 'Deleted user is authenticated'
+
+    @pytest.mark.django_db
+    def test_auth_user_cache_shared_by_processes(self, settings: Any, user: User) -> None:
+        """
+        Authenticated user cache invalidation between processes test, every process has own UserCache instance
+
+        Params:
+            - settings: A fixture to override django settings
+            - user: A fixture that create user instance
+
+        Checks:
+            - User cached by one process is not returned after another process dropped it
+            - User cached with version read before change is not returned
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        # process local django cache stands in for Redis shared by processes
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        settings.VERSIONED_CACHE = {'BACKEND': 'bboom_test.cache.DjangoCacheBackend', 'OPTIONS': {}, 'TIMEOUT': 60}
+        api_process: UserCache = UserCache()
+        ui_process: UserCache = UserCache()
+
+        api_process.set(user.pk, user, api_process.get_version(user.pk))
+        assert api_process.get(user.pk) == user, 'User is not cached'
+        ui_process.delete(user.pk)
+        assert api_process.get(user.pk) is None, 'User dropped by another process is returned'
+
+        version: int = api_process.get_version(user.pk)
+        ui_process.delete(user.pk)
+        api_process.set(user.pk, user, version)
+        assert api_process.get(user.pk) is None, 'User loaded before change is returned'
+
+    @pytest.mark.django_db
+    def test_auth_user_cache_process_local(
+            self, settings: Any, user: User, django_assert_num_queries: Any
+    ) -> None:
+        """
+        Authenticated user cache test with default settings without CACHE_URL, every process has own UserCache
+        instance and process local versions
+
+        Params:
+            - settings: A fixture to override django settings
+            - user: A fixture that create user instance
+            - django_assert_num_queries: A fixture to count executed queries
+
+        Checks:
+            - Cached user and his version are got without queries
+            - User dropped by another process is returned until TIMEOUT and is not returned after it
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        settings.VERSIONED_CACHE = {'BACKEND': 'bboom_test.cache.LocMemLRUBackend', 'OPTIONS': {}, 'TIMEOUT': 60}
+        api_process: UserCache = UserCache()
+        ui_process: UserCache = UserCache()
+        with mock.patch('bboom_test.cache.time.monotonic', return_value=100.0):
+            api_process.set(user.pk, user, api_process.get_version(user.pk))
+            ui_process.delete(user.pk)
+
+            with django_assert_num_queries(0):
+                cached_user: Optional[User] = api_process.get(user.pk)
+        with mock.patch('bboom_test.cache.time.monotonic', return_value=100.0 + settings.JWT_USER_CACHE['TIMEOUT']):
+            expired_user: Optional[User] = api_process.get(user.pk)
+
+        assert cached_user == user, 'User is not cached'
+        assert expired_user is None, 'User is returned after timeout'
+
+    @pytest.mark.django_db
+    def test_auth_stateless(self, client: Any, user_auth: dict[str, Any], settings: Any) -> None:
+        """
+        Stateless authentication test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Token has username claim
+            - Posts are created and listed without querying authenticated user
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.JWT_USER_CACHE = {**settings.JWT_USER_CACHE, 'STATELESS': True}
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        user: User = user_auth.get('user')
+
+        with CaptureQueriesContext(connection) as context:
+            created: Any = client.post(
+                '/api/posts/create/', {'title': 'title', 'body': 'body'}, content_type='application/json', **headers
+            )
+            listed: Any = client.get('/api/posts/list/', **headers)
+
+        assert AccessToken(user_auth.get('token'))['username'] == user.username, 'No username claim'
+        assert created.status_code == 201 and listed.data['results'][0]['user'] == user.username, 'Wrong data'
+        assert not [
+            query for query in context.captured_queries
+            if 'users_user' in query['sql'] and query['sql'].startswith('SELECT')
+        ], 'User queried'
+
+    @pytest.mark.django_db
+    def test_delete_users(self, client: Any, user_auth: dict[str, Any], run_tasks: Any) -> None:
+        """
+        Batched deletion of users with posts test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+            - run_tasks: A fixture to run queued background tasks
+
+        Checks:
+            - Command deletes user with posts, feed entries and follows by batches and reports progress
+            - Posts are not loaded, deleted user is not authenticated by cached copy
+            - Admin delete action deactivates users and queues their deletion with posts
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = user_auth.get('user')
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        follower: User = UserFactory.create()
+        Follow.objects.create(follower=follower, author=user)
+        Follow.objects.create(follower=user, author=follower)
+        posts: list[Post] = [create_post(user=user, title='title', body='body') for _ in range(5)]
+        create_post(user=follower, title='title', body='body')
+        call_command('run_workers', once=True, stdout=io.StringIO())
+        assert FeedEntry.objects.filter(owner=follower).count() == 5, 'Posts are not added to feed'
+        delete_posts(Post.objects.filter(pk=posts[0].pk), user.pk)
+        assert client.get('/api/posts/list/', **headers).status_code == 200, 'User is not authenticated'
+        output: io.StringIO = io.StringIO()
+
+        with CaptureQueriesContext(connection) as context:
+            call_command('delete_users', user.username, batch_size=2, stdout=output, no_color=True)
+
+        assert not User.objects.filter(pk=user.pk).exists(), 'User is not deleted'
+        assert not Post.all_objects.filter(user_id=user.pk).exists(), 'Posts are not deleted'
+        assert not FeedEntry.objects.filter(post_id__in=[post.pk for post in posts]).exists(), 'Feed is not cleaned'
+        assert not FeedEntry.objects.filter(owner_id=user.pk).exists(), 'Feed of user is not deleted'
+        assert not Follow.objects.exists(), 'Follows are not deleted'
+        assert output.getvalue().splitlines()[:3] == [f'{user.username}: {deleted}/4 posts' for deleted in (2, 4, 5)], (
+            'Progress is not reported'
+        )
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and '"posts_post"."title"' in query['sql']
+        ], 'Posts are loaded'
+        assert client.get('/api/posts/list/', **headers).status_code == 401, 'Deleted user is authenticated'
+
+        admin: User = User.objects.create_superuser('admin', password='password')
+        client.force_login(admin)
+        confirmation: Any = client.post(
+            '/admin/users/user/', {'action': 'delete_selected', '_selected_action': [follower.pk]}
+        )
+        assert dict(confirmation.context['model_count'])[Post._meta.verbose_name_plural] == 1, 'Wrong confirmation'
+        response: Any = client.post(
+            '/admin/users/user/', {'action': 'delete_selected', '_selected_action': [follower.pk], 'post': 'yes'}
+        )
+        assert response.status_code == 302, 'Admin action failed'
+        assert not User.objects.get(pk=follower.pk).is_active, 'User is not deactivated by admin'
+        assert run_tasks()[1] == 0, 'Deletion failed'
+        assert not User.objects.filter(pk=follower.pk).exists(), 'User is not deleted by admin'
+        assert not Post.all_objects.exists(), 'Posts are not deleted by admin'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_delete_user_deactivates_first(self, client: Any, user_auth: dict[str, Any]) -> None:
+        """
+        Deactivation of user deleted by batches test
+
+        Params:
+            - client: A Django test client instance.
+            - user_auth: A fixture that create user instance and login
+
+        Checks:
+            - User is deactivated and is not authenticated by cached copy before the first batch is deleted
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        user: User = user_auth.get('user')
+        headers: dict[str, str] = {'HTTP_AUTHORIZATION': 'Bearer ' + user_auth.get('token')}
+        for _ in range(3):
+            create_post(user=user, title='title', body='body')
+        client.get('/api/posts/list/', **headers)
+        states: list[tuple[bool, int]] = []
+
+        def progress(deleted: int) -> None:
+            if states:
+                return
+            is_active: bool = User.objects.filter(pk=user.pk, is_active=True).exists()
+            response: Any = client.post('/api/posts/create/', {'title': 'title', 'body': 'body'}, **headers)
+            states.append((is_active, response.status_code))
+
+        delete_user(user.pk, 2, progress)
+
+        assert states[0] == (False, 401), 'User is active while posts are deleted'
+
+    @pytest.mark.django_db
+    def test_admin_delete_view(self, client: Any, user: User, run_tasks: Any, settings: Any) -> None:
+        """
+        Deletion of user with posts by change form delete view of admin test
+
+        Params:
+            - client: A Django test client instance.
+            - user: A fixture that create user instance
+            - run_tasks: A fixture to run queued background tasks
+            - settings: A fixture to override django settings
+
+        Checks:
+            - Delete view deactivates user and deletes nothing in request
+            - Queued task deletes user with posts, feed entries and follows by batches, one batch per run
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError
+        """
+        settings.USERS_DELETE_BATCH_SIZE = 2
+        follower: User = UserFactory.create()
+        Follow.objects.create(follower=follower, author=user)
+        for _ in range(3):
+            create_post(user=user, title='title', body='body')
+        admin: User = User.objects.create_superuser('admin', password='password')
+        client.force_login(admin)
+
+        response: Any = client.post(f'/admin/users/user/{user.pk}/delete/', {'post': 'yes'})
+        assert response.status_code == 302, 'Admin delete view failed'
+        assert not User.objects.get(pk=user.pk).is_active, 'User is not deactivated'
+        assert Post.all_objects.filter(user=user).count() == 3, 'Posts are deleted in request'
+        assert Task.objects.filter(name='users.deletion.delete_user_task').count() == 1, 'Deletion is not queued'
+
+        succeeded, failed = run_tasks()
+        assert not User.objects.filter(pk=user.pk).exists(), 'User is not deleted'
+        assert not Post.all_objects.filter(user_id=user.pk).exists(), 'Posts are not deleted'
+        assert not FeedEntry.objects.filter(owner=follower).exists(), 'Feed is not cleaned'
+        assert not Follow.objects.exists(), 'Follows are not deleted'
+        # fan-out of three posts, then deletion: two batches of posts, a batch of follows and the user row
+        assert failed == 0 and succeeded == 7, 'Deletion is not done by batches'
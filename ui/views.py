@@ -1,9 +1,18 @@
+from django.conf import settings
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, redirect
-
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+
+from bboom_test.cache import versioned_condition
+from bboom_test.routers import read_from_replica
+from posts.cache import post_list_cache
+from posts.counters import create_post, delete_posts
 from posts.models import Post
 from ui.forms import UserLoginForm, PostForm
+from users.cache import user_list_cache, USERS_SCOPE
 from users.models import User
 
 
@@ -46,35 +55,119 @@ def logout_view(request):
 
 
 # ----------------------------------------------------------------
+@versioned_condition(
+    user_list_cache,
+    lambda request: USERS_SCOPE,
+    lambda request: _get_page_suffixes(request, 'ui:users'),
+)
+@read_from_replica(user_list_cache, lambda request: USERS_SCOPE)
 def get_list_users(request):
     """
-    View to get list of all users
+    View to get page of list of all users, page number is taken from 'page' query param
 
     Params:
         - request: defines current request
 
     Returns:
-        - redirect to page with list of all users
+        - redirect to page with list of users
     """
-    users = User.objects.all()
-    return render(request, 'users/users.html', {'users': users})
+    users = User.objects.order_by('id').values('id', 'username', 'post_count')
+    page, users_list = _render_page(request, users, user_list_cache, USERS_SCOPE, 'ui:users', 'users/users_list.html')
+    return render(request, 'users/users.html', {'page': page, 'users_list': users_list})
 
 
 # ----------------------------------------------------------------
+@versioned_condition(
+    post_list_cache,
+    lambda request, pk: pk,
+    lambda request, pk: ['ui:user', *_get_page_suffixes(request, 'ui:posts', pk == request.user.pk)],
+)
+@read_from_replica(post_list_cache, lambda request, pk: pk)
 def get_user_posts(request, pk):
     """
-    View to get all posts by user (filter by pk)
+    View to get page of posts by user (filter by pk), page number is taken from 'page' query param.
+    User, number of posts and rendered list of posts of page are cached in versioned cache scope of user's posts
+    and are read with its version by one get_many, so on cache hit posts are not queried at all
 
     Params:
         - request: defines current request
         - pk: integer defines primary key of user
 
     Returns:
-        - redirect to page with all posts of user
+        - redirect to page with posts of user
     """
-    user = User.objects.get(pk=pk)
-    posts = Post.objects.filter(user=user)
-    return render(request, 'posts/posts.html', {'posts': posts, 'user': user, 'req_user_pk': request.user.pk})
+    user = post_list_cache.get_or_set(pk, 'ui:user', lambda: _load_user(pk))
+    is_owner = user['pk'] == request.user.pk
+    posts = Post.objects.filter(user_id=pk).order_by('id').values('id', 'title', 'body')
+    page, posts_list = _render_page(
+        request, posts, post_list_cache, pk, 'ui:posts', 'posts/posts_list.html', is_owner=is_owner
+    )
+    return render(request, 'posts/posts.html', {
+        'user': user,
+        'page': page,
+        'posts_list': posts_list,
+        'is_owner': is_owner,
+    })
+
+
+def _load_user(pk):
+    """
+    Function to load user as plain dict to render and cache
+
+    Params:
+        - pk: integer defines primary key of user
+
+    Returns:
+        - dict with user's pk and username
+
+    Raises:
+        - Http404 (in case of user does not exist)
+    """
+    user = get_object_or_404(User.objects.only('pk', 'username'), pk=pk)
+    return {'pk': user.pk, 'username': user.username}
+
+
+def _get_page_suffixes(request, prefix, is_owner=False):
+    """
+    Function to get keys inside versioned cache scope of number of rows and rendered list of requested page
+
+    Params:
+        - request: defines current request
+        - prefix: prefix of keys
+        - is_owner: whether list is rendered for owner of rows
+
+    Returns:
+        - tuple of key of number of rows and key of rendered list
+    """
+    page_number = request.GET.get('page', '')
+    return f'{prefix}:count', f'{prefix}:list:{settings.UI_PAGE_SIZE}:{page_number}:{is_owner}'
+
+
+def _render_page(request, queryset, cache, scope, prefix, template_name, is_owner=False):
+    """
+    Function to get requested page of queryset and rendered list of its rows. Number of rows and rendered list
+    are cached in versioned cache scope, rows of page are queried only to render list on cache miss
+
+    Params:
+        - request: defines current request
+        - queryset: ordered queryset to paginate
+        - cache: versioned cache invalidated on every write to queryset
+        - scope: scope of versioned cache
+        - prefix: prefix of keys inside scope (see _get_page_suffixes)
+        - template_name: template of list of rows
+        - is_owner: whether list is rendered for owner of rows
+
+    Returns:
+        - tuple of Page (invalid page number gives first or last page) and rendered list
+    """
+    count_suffix, list_suffix = _get_page_suffixes(request, prefix, is_owner)
+    paginator = Paginator(queryset, settings.UI_PAGE_SIZE)
+    paginator.count = cache.get_or_set(scope, count_suffix, queryset.count)
+    page = paginator.get_page(request.GET.get('page'))
+    rendered = cache.get_or_set(
+        scope, list_suffix, lambda: render_to_string(template_name, {'page': page, 'is_owner': is_owner})
+    )
+    return page, rendered
 
 
 # ----------------------------------------------------------------
@@ -93,9 +186,8 @@ def add_post(request):
     if request.method == 'POST':
         form = PostForm(request.POST)
         if form.is_valid():
-            new_post = form.save(commit=False)
-            new_post.user = request.user
-            new_post.save()
+            create_post(user=request.user, **form.cleaned_data)
+            post_list_cache.bump(request.user.pk)
             return redirect('user_posts', pk=request.user.pk)
     else:
         form = PostForm()
@@ -106,7 +198,7 @@ def add_post(request):
 @login_required
 def delete_post(request, pk):
     """
-    View to delete chosen post
+    View to delete chosen post of current user with one statement (see posts.counters.delete_posts)
 
     Params:
         - request: defines current request
@@ -114,7 +206,12 @@ def delete_post(request, pk):
 
     Returns:
         - redirect to page with list of all users
+
+    Raises:
+        - Http404 (in case of post does not exist or belongs to another user)
     """
-    post = Post.objects.get(pk=pk)
-    post.delete()
+    deleted = delete_posts(Post.objects.filter(pk=pk, user=request.user), request.user.pk)
+    if not deleted:
+        raise Http404
+    post_list_cache.bump(request.user.pk)
     return redirect('user_posts', pk=request.user.pk)
@@ -1,3 +1,69 @@
-from django.contrib import admin
+from typing import Any
 
-# Register your models here.
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from posts.models import Post
+from tasks.queue import enqueue
+from users.deletion import deactivate_user, delete_user_task
+from users.models import User
+
+
+# ----------------------------------------------------------------
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    """
+    Admin of users. Delete view and delete action deactivate users and queue their deletion with posts by batches
+    (users.deletion.delete_user_task) to background workers instead of collecting all related objects of users
+    in memory and deleting them in transaction of request
+
+    Attrs:
+        - list_display: defines columns of users list
+    """
+    list_display: tuple = ('username', 'email', 'is_staff', 'post_count')
+
+    def get_deleted_objects(self, objs: Any, request: HttpRequest) -> tuple[list, dict, set, list]:
+        """
+        Redefined method to summarize deleted objects on confirmation page by post counts of users
+        instead of collecting them
+
+        Params:
+            - objs: users to delete
+            - request: current request
+
+        Returns:
+            - tuple (deleted users, numbers of deleted objects by model, missing permissions, protected objects)
+        """
+        users: list[User] = list(objs)
+        posts: int = sum(user.post_count for user in users)
+        model_count: dict[str, int] = {
+            User._meta.verbose_name_plural: len(users),
+            Post._meta.verbose_name_plural: posts,
+        }
+        perms_needed: set[str] = set() if self.has_delete_permission(request) else {User._meta.verbose_name}
+        return [str(user) for user in users], model_count, perms_needed, []
+
+    def delete_model(self, request: HttpRequest, obj: User) -> None:
+        self.queue_deletion(obj)
+        self.message_user(request, f'Posts of {obj} are deleted by background workers', messages.INFO)
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[User]) -> None:
+        users: list[User] = list(queryset)
+        for user in users:
+            self.queue_deletion(user)
+        self.message_user(request, f'Posts of {len(users)} users are deleted by background workers', messages.INFO)
+
+    @staticmethod
+    def queue_deletion(user: User) -> None:
+        """
+        Method to deactivate user, so he is not authenticated any more, and to queue his deletion.
+        Both are committed with transaction of request
+
+        Params:
+            - user: user to delete
+        """
+        deactivate_user(user.pk)
+        enqueue(delete_user_task, user.pk, settings.USERS_DELETE_BATCH_SIZE)
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self) -> None:
+        from users.signals import bump_user_list_version, invalidate_cached_user
+        post_save.connect(bump_user_list_version, sender='users.User')
+        post_delete.connect(bump_user_list_version, sender='users.User')
+        post_save.connect(invalidate_cached_user, sender='users.User')
+        post_delete.connect(invalidate_cached_user, sender='users.User')
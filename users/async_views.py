@@ -0,0 +1,26 @@
+from django.http import HttpRequest, JsonResponse
+from rest_framework.request import Request
+
+from bboom_test.async_api import async_api_view
+from bboom_test.pagination import IdCursorPagination
+from users.models import User
+from users.serializers import UserListSerializer
+
+
+# ----------------------------------------------------------------
+# native async variant of UserListView, same payload
+@async_api_view(['GET'])
+async def user_list(request: HttpRequest) -> JsonResponse:
+    """
+    Async view to get page of all users
+
+    Params:
+        - request: defines current request
+
+    Returns:
+        - JsonResponse with next and previous cursors and users
+    """
+    paginator: IdCursorPagination = IdCursorPagination()
+    rows = User.objects.values(*UserListSerializer.Meta.fields)
+    page: list[dict] = await paginator.apaginate_queryset(rows, Request(request))
+    return JsonResponse(paginator.get_paginated_data(page))
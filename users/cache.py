@@ -0,0 +1,8 @@
+from bboom_test.cache import VersionedCache
+
+
+# ----------------------------------------------------------------
+# cache of users lists, the only scope is 'all'. Bumped by every save/delete of user (see users.signals),
+# post counts of users are renewed every MAX_AGE seconds (VERSIONED_CACHE setting)
+user_list_cache = VersionedCache(namespace='users')
+USERS_SCOPE: str = 'all'
@@ -0,0 +1,108 @@
+from typing import Callable, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from bboom_test.authentication import user_cache
+from posts.cache import post_list_cache
+from posts.models import FeedEntry, Post
+from tasks.queue import enqueue
+from users.models import Follow, User
+
+
+# ----------------------------------------------------------------
+# deletion of users with many posts. Deleting user by ORM removes all posts, feed entries and follows of user
+# in one long transaction. Here user is deactivated first, then rows are removed by short transactions, each deleting
+# one batch of rows chosen by subquery, so rows are never loaded into Python, then the user row itself is deleted
+def deactivate_user(user_id: int) -> None:
+    """
+    Function to deactivate user before deletion by batches, so he is not authenticated and can not add posts
+    and follows between batches. Cached user is dropped in all processes after commit
+
+    Params:
+        - user_id: primary key of user
+    """
+    User.objects.filter(pk=user_id).update(is_active=False)
+    transaction.on_commit(lambda: user_cache.delete(user_id))
+
+
+def delete_user(user_id: int, batch_size: int, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Function to deactivate user and delete him with all posts, feed and follows by batches
+
+    Params:
+        - user_id: primary key of user
+        - batch_size: number of rows deleted per transaction
+        - progress: callable called with total number of deleted posts after every batch of posts
+
+    Returns:
+        - number of deleted posts
+    """
+    deactivate_user(user_id)
+    deleted_posts: int = 0
+    while True:
+        with transaction.atomic():
+            deleted: int = _delete_posts_batch(user_id, batch_size)
+        if not deleted:
+            break
+        deleted_posts += deleted
+        if progress is not None:
+            progress(deleted_posts)
+
+    for queryset in _get_related(user_id):
+        while True:
+            with transaction.atomic():
+                if not _delete_batch(queryset, batch_size):
+                    break
+
+    _delete_user_row(user_id)
+    return deleted_posts
+
+
+def delete_user_task(user_id: int, batch_size: int) -> None:
+    """
+    Task (tasks.queue) to delete user deactivated by deactivate_user with all posts, feed and follows by batches.
+    Task runs in one transaction, so every run deletes one batch of rows and queues the next run, the last run deletes
+    the user
+
+    Params:
+        - user_id: primary key of user
+        - batch_size: number of rows deleted per run
+    """
+    if _delete_posts_batch(user_id, batch_size) or any(
+            _delete_batch(queryset, batch_size) for queryset in _get_related(user_id)
+    ):
+        enqueue(delete_user_task, user_id, batch_size)
+        return
+    _delete_user_row(user_id)
+
+
+def _delete_posts_batch(user_id: int, batch_size: int) -> int:
+    """Function to delete batch of posts of user with their feed entries, returns number of deleted posts"""
+    batch: QuerySet = Post.all_objects.filter(user_id=user_id).order_by('pk').values('pk')[:batch_size]
+    FeedEntry.objects.filter(post_id__in=batch).delete()
+    deleted, _ = Post.all_objects.filter(pk__in=batch).delete()
+    return deleted
+
+
+def _get_related(user_id: int) -> tuple[QuerySet, ...]:
+    """Function to get querysets of rows referencing user, except posts"""
+    return (
+        FeedEntry.objects.filter(owner_id=user_id),
+        Follow.objects.filter(follower_id=user_id),
+        Follow.objects.filter(author_id=user_id),
+    )
+
+
+def _delete_batch(queryset: QuerySet, batch_size: int) -> int:
+    """Function to delete batch of batch_size rows of queryset, returns number of deleted rows"""
+    batch: QuerySet = queryset.order_by('pk').values('pk')[:batch_size]
+    deleted, _ = queryset.model._base_manager.filter(pk__in=batch).delete()
+    return deleted
+
+
+def _delete_user_row(user_id: int) -> None:
+    """Function to delete user without related rows"""
+    # remaining related rows are few, post_delete signals of user invalidate users lists and authentication cache
+    User.objects.filter(pk=user_id).delete()
+    post_list_cache.bump(user_id)
@@ -0,0 +1,42 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from users.deletion import delete_user
+from users.models import User
+
+
+# ----------------------------------------------------------------
+class Command(BaseCommand):
+    """
+    Command to delete users with many posts.
+
+    Every user is deactivated first (users.deletion.deactivate_user), so he can not write between batches. Posts, feed entries and follows of every user are deleted by batches of --batch-size rows, every batch is one
+    short transaction deleting rows chosen by subquery, so rows are not loaded into memory. Progress is reported
+    after every batch of posts, total is taken from post_count of user
+    """
+    help: str = 'Delete users with their posts by batches'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('usernames', nargs='+', help='usernames of users to delete')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.USERS_DELETE_BATCH_SIZE, help='number of rows per transaction'
+        )
+
+    def handle(self, *args: tuple, **options: Any) -> None:
+        batch_size: int = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+        users: list[User] = list(User.objects.filter(username__in=options['usernames']).only('username', 'post_count'))
+        missing: set[str] = set(options['usernames']) - {user.username for user in users}
+        if missing:
+            raise CommandError(f'Users not found: {", ".join(sorted(missing))}')
+
+        deleted_posts: int = 0
+        for user in users:
+            def report(deleted: int, user: User = user) -> None:
+                self.stdout.write(f'{user.username}: {deleted}/{user.post_count} posts')
+
+            deleted_posts += delete_user(user.pk, batch_size, report)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {len(users)} users and {deleted_posts} posts'))
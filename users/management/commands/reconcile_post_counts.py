@@ -0,0 +1,46 @@
+from typing import Any, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Post
+from users.cache import user_list_cache, USERS_SCOPE
+from users.models import User
+
+
+# ----------------------------------------------------------------
+class Command(BaseCommand):
+    """
+    Command to repair drift of denormalized User.post_count.
+
+    Users are processed by ranges of --batch-size ids, every range is one UPDATE which counts posts of users
+    by post_user_id_idx index and writes only rows with wrong count, so short transactions keep locks short.
+    Posts written concurrently with UPDATE of their author's range may be counted by neither, run command again
+    if it reports fixed rows while posts are written
+    """
+    help: str = 'Recount posts of users and fix wrong post_count values'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=1000, help='number of user ids per UPDATE')
+
+    def handle(self, *args: tuple, **options: Any) -> None:
+        batch_size: int = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        counts: Subquery = Subquery(
+            Post.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField()
+        )
+        actual: Coalesce = Coalesce(counts, 0)
+
+        fixed: int = 0
+        last_id: Optional[int] = User.objects.order_by('-pk').values_list('pk', flat=True).first()
+        for start in range(0, (last_id or 0) + 1, batch_size):
+            users = User.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            fixed += users.alias(actual=actual).exclude(post_count=actual).update(post_count=actual)
+        if fixed:
+            user_list_cache.bump(USERS_SCOPE)
+        self.stdout.write(self.style.SUCCESS(f'Fixed post_count of {fixed} users'))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:33
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_post_count(apps, schema_editor):
+    """Set post_count of existing users with one UPDATE"""
+    User = apps.get_model('users', 'User')
+    Post = apps.get_model('posts', 'Post')
+    counts = Post.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(count=Count('pk'))
+    User.objects.using(schema_editor.connection.alias).update(
+        post_count=Coalesce(Subquery(counts.values('count'), output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('posts', '0006_post_title_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='post_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Количество постов'),
+        ),
+        migrations.RunPython(fill_post_count, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,63 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 # ----------------------------------------------------------------
 class User(AbstractUser):
     """
     Model representing a user
+
+    Attrs:
+        - post_count: number of user's posts, changed by F() expressions on every create and delete of posts
+          (posts.counters), repaired by reconcile_post_counts command
+        - feed_pull: set once user has FEED_PULL_MIN_POSTS posts, new posts of such user are not copied to feeds
+          of followers but are read from posts table when feed is read (posts.feed)
     """
+    post_count = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество постов'
+    )
+    feed_pull = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Посты читаются в ленту при чтении'
+    )
+
     def __str__(self):
         return self.first_name
 
     class Meta:
         verbose_name: str = 'Пользователь'
         verbose_name_plural: str = 'Пользователи'
+
+
+# ----------------------------------------------------------------
+class Follow(models.Model):
+    """
+    Model representing subscription of follower to posts of author
+    """
+    follower = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        db_index=False,
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Автор'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата подписки'
+    )
+
+    class Meta:
+        verbose_name: str = 'Подписка'
+        verbose_name_plural: str = 'Подписки'
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'author'], name='follow_follower_author_uniq'),
+        ]
@@ -2,7 +2,10 @@ from typing import Any, Type
 
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.tokens import Token
 
+from bboom_test.authentication import USERNAME_CLAIM
 from users.models import User
 
 
@@ -65,4 +68,14 @@ class UserListSerializer(serializers.ModelSerializer):
     """Serializer for list of users"""
     class Meta:
         model: Type[User] = User
-        fields: tuple = ('id', 'username', 'email')
+        fields: tuple = ('id', 'username', 'email', 'post_count')
+
+
+# ----------------------------------------------------------------
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token obtain serializer adding username claim used by stateless JWT authentication"""
+    @classmethod
+    def get_token(cls, user: User) -> Token:
+        token: Token = super().get_token(user)
+        token[USERNAME_CLAIM] = user.username
+        return token
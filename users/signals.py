@@ -0,0 +1,28 @@
+from typing import Any
+
+from bboom_test.authentication import user_cache
+from users.cache import user_list_cache, USERS_SCOPE
+
+
+# ----------------------------------------------------------------
+def bump_user_list_version(sender: Any, **kwargs: dict) -> None:
+    """
+    post_save/post_delete receiver of User model to invalidate users lists
+
+    Params:
+        - sender: model class
+    """
+    user_list_cache.bump(USERS_SCOPE)
+
+
+# ----------------------------------------------------------------
+def invalidate_cached_user(sender: Any, instance: Any, **kwargs: dict) -> None:
+    """
+    post_save/post_delete receiver of User model to drop user from authentication cache of all processes,
+    so deactivated or deleted user is not authenticated by cached copy
+
+    Params:
+        - sender: model class
+        - instance: saved or deleted user
+    """
+    user_cache.delete(instance.pk)
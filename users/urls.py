@@ -1,6 +1,7 @@
 from django.urls import path
 
-from users.views import UserRegView, UserListView, UserAuthView
+from users import async_views
+from users.views import UserRegView, UserListView, UserAuthView, FollowView
 
 # ----------------------------------------------------------------
 # urlpatterns
@@ -8,4 +9,6 @@ urlpatterns = [
     path('reg/', UserRegView.as_view()),
     path('auth/', UserAuthView.as_view()),
     path('list/', UserListView.as_view()),
+    path('<int:pk>/follow/', FollowView.as_view()),
+    path('async/list/', async_views.user_list),
 ]
@@ -1,11 +1,23 @@
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from drf_spectacular.utils import extend_schema
-from requests import Request, Response
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from users.models import User
-from users.serializers import UserRegSerializer, UserListSerializer
+from bboom_test.cache import versioned_condition
+from bboom_test.pagination import IdCursorPagination
+from bboom_test.routers import read_from_replica
+from posts.feed import backfill, remove_author
+from users.cache import user_list_cache, USERS_SCOPE
+from users.models import Follow, User
+from users.serializers import UserRegSerializer, UserListSerializer, UserTokenObtainPairSerializer
 
 
 # ----------------------------------------------------------------
@@ -31,7 +43,14 @@ class UserRegView(CreateAPIView):
 # ----------------------------------------------------------------
 @extend_schema(tags=['User'])
 class UserAuthView(TokenObtainPairView):
-    """Custom TokenObtainPairView to handle user authentication and add description to openapi documentation"""
+    """
+    Custom TokenObtainPairView to handle user authentication and add description to openapi documentation
+
+    Attrs:
+        - serializer_class: defines serializer class adding username claim to tokens
+    """
+    serializer_class = UserTokenObtainPairSerializer
+
     @extend_schema(
         description="Get access and refresh JWT token",
         summary="Authenticate user",
@@ -50,14 +69,60 @@ class UserListView(ListAPIView):
         - queryset: defines queryset for this APIView
         - serializer_class: defines serializer class for this APIView
         - permission_classes: defines permissions for this APIView
+        - pagination_class: defines keyset pagination class for this APIView
     """
     queryset = User.objects.all()
     serializer_class = UserListSerializer
     permission_classes: list = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
     @extend_schema(
-        description="Get list of all users",
+        description="Get list of all users. Supports conditional requests with If-None-Match / If-Modified-Since",
         summary="Get users",
     )
+    @method_decorator(versioned_condition(user_list_cache, lambda request, *args, **kwargs: USERS_SCOPE))
+    @method_decorator(read_from_replica(user_list_cache, lambda request, *args, **kwargs: USERS_SCOPE))
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
+
+
+# ----------------------------------------------------------------
+@extend_schema(tags=['User'])
+class FollowView(APIView):
+    """
+    View to handle POST and DELETE requests to follow and unfollow user. Latest posts of followed user are added
+    to feed of current user, posts of unfollowed user are removed from it (posts.feed)
+
+    Attrs:
+        - permission_classes: defines permissions for this APIView
+    """
+    permission_classes: list = [IsAuthenticated]
+
+    @extend_schema(
+        description="Follow user, latest posts of user are added to feed",
+        summary="Follow user",
+        request=None,
+        responses={201: None, 200: None},
+    )
+    def post(self, request: Request, pk: int) -> Response:
+        if pk == request.user.pk:
+            raise ValidationError('Users can not follow themselves')
+        author: User = get_object_or_404(User, pk=pk)
+        try:
+            with transaction.atomic():
+                Follow.objects.create(follower=request.user, author=author)
+                backfill(request.user.pk, author.pk)
+        except IntegrityError:
+            return Response(status=status.HTTP_200_OK)
+        return Response(status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description="Unfollow user, posts of user are removed from feed",
+        summary="Unfollow user",
+        responses={204: None},
+    )
+    def delete(self, request: Request, pk: int) -> Response:
+        with transaction.atomic():
+            Follow.objects.filter(follower=request.user, author_id=pk).delete()
+            remove_author(request.user.pk, pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)